@@ -0,0 +1 @@
+# Package benchmarks/__init__.py
@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+from src.autotune import autotune, save_tuning
+from src.gpu_utils import get_headless_device
+from src.simulation import ClothSimulation
+
+from benchmarks.plots import write_plots
+from benchmarks.suites import bench_batch, bench_draw, bench_normals, bench_shading, bench_step
+
+"""
+Benchmarks de la simulation et du rendu (sans fenêtre) :
+
+    python -m benchmarks                               # config par défaut
+    python -m benchmarks --sizes 22 64 256 1024 --substeps 8 30 --workgroups 32 64 128
+    python -m benchmarks --compare bench_results/<ancien>.json
+    python -m benchmarks --suites shading --sizes 64 256 1024   # normales compute vs vertex shader
+    python -m benchmarks --suites normals --normals-modes grid area csr --workgroups 64 256
+    python -m benchmarks --suites draw --draw-geometry indexed procedural --sizes 256 1024
+    python -m benchmarks --suites batch --sizes 22 64 --instances 1 16 100 400
+    python -m benchmarks --autotune --sizes 22 128 512  # tailles de workgroup -> autotune/
+
+Écrit bench_results/<date>_<commit>.json (+ courbes PNG si matplotlib).
+"""
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+        return out.stdout.strip() or "nogit"
+    except OSError:
+        return "nogit"
+
+
+# Champs de configuration d'un résultat (en plus de suite / size)
+CONFIG_KEYS = ("substeps", "workgroup", "normals", "geometry", "instances")
+
+
+def _key(r: dict):
+    return (r["suite"], r["size"]) + tuple(r.get(k) for k in CONFIG_KEYS)
+
+
+def _print_result(r: dict):
+    extra = ""
+    if r["suite"] == "step":
+        extra = f"{r['steps_per_sec']:8.1f} steps/s  {r['particle_substeps_per_sec'] / 1e6:8.2f} M part·sub/s"
+    elif r["suite"] == "normals":
+        extra = f"{r['vertices_per_sec'] / 1e6:8.2f} M vert/s"
+    elif r["suite"] in ("draw", "shading", "batch"):
+        extra = f"{r['fps_p50']:8.1f} fps"
+    cfg = " ".join(f"{k}={r[k]}" for k in CONFIG_KEYS if k in r)
+    print(f"{r['suite']:8s} {r['size']:5d}² {cfg:24s} p50 {r['p50_ms']:8.3f} ms  "
+          f"p95 {r['p95_ms']:8.3f}  p99 {r['p99_ms']:8.3f}  {extra}")
+
+
+def _compare(results: list, baseline_path: str):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = {_key(r): r for r in json.load(f)["results"]}
+
+    print(f"\nComparaison avec {baseline_path} (ratio p50, > 1 = plus lent) :")
+    for r in results:
+        b = base.get(_key(r))
+        if b is None:
+            continue
+        ratio = r["p50_ms"] / b["p50_ms"]
+        flag = "  ⚠️" if ratio > 1.10 else ""
+        cfg = " ".join(f"{k}={r[k]}" for k in CONFIG_KEYS if k in r)
+        print(f"  {r['suite']:8s} {r['size']:5d}² {cfg:24s} x{ratio:5.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks simulation + rendu")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[22, 64, 128, 256, 512, 1024])
+    parser.add_argument("--substeps", type=int, nargs="+", default=[8, 30])
+    parser.add_argument("--workgroups", type=int, nargs="+", default=[64])
+    parser.add_argument("--suites", nargs="+", default=["step", "normals", "draw"],
+                        choices=["step", "normals", "draw", "shading", "batch"])
+    parser.add_argument("--normals-modes", nargs="+", default=["grid"],
+                        choices=["grid", "area", "csr"], help="variantes du kernel normales (suite normals, --autotune)")
+    parser.add_argument("--draw-geometry", nargs="+", default=["indexed"],
+                        choices=["indexed", "procedural"], help="tissu indexé / sans index buffers (suite draw)")
+    parser.add_argument("--instances", type=int, nargs="+", default=[1, 16, 100],
+                        help="nb de tissus du lot (suite batch)")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--gpu", action="store_true", help="adapter matériel au lieu de l'adapter logiciel")
+    parser.add_argument("--out", default="bench_results")
+    parser.add_argument("--compare", metavar="JSON", help="résultats de référence à comparer")
+    parser.add_argument("--autotune", action="store_true",
+                        help="cherche les meilleures tailles de workgroup par kernel (au lieu des suites)")
+    args = parser.parse_args()
+
+    device = get_headless_device(software=not args.gpu)
+    adapter = device.adapter.info.get("device", "")
+    print(f"adapter : {adapter}\n")
+
+    if args.autotune:
+        for size in args.sizes:
+            for k, mode in enumerate(args.normals_modes):
+                # tous les kernels au premier mode, ensuite seulement les normales
+                print(f"autotune {size}² (normales {mode}) :")
+                sim = ClothSimulation(device, size, size, workgroup_size=64, normals_mode=mode)
+                results = autotune(sim, kernels=None if k == 0 else ["normals"], trials=args.trials)
+                path = save_tuning(device, size, size, {name: r["best"] for name, r in results.items()},
+                                   normals_mode=mode)
+        print(f"\nautotune : {path}")
+        return
+
+    results = []
+    for size in args.sizes:
+        if "step" in args.suites:
+            for sub in args.substeps:
+                for wg in args.workgroups:
+                    results.append(bench_step(device, size, sub, wg, args.warmup, args.trials))
+                    _print_result(results[-1])
+
+        if "normals" in args.suites:
+            for mode in args.normals_modes:
+                for wg in args.workgroups:
+                    results.append(bench_normals(device, size, wg, args.warmup, args.trials, mode))
+                    _print_result(results[-1])
+
+        if "draw" in args.suites:
+            for geometry in args.draw_geometry:
+                results.append(bench_draw(device, size, args.warmup, args.trials, geometry=geometry))
+                _print_result(results[-1])
+
+        if "batch" in args.suites:
+            for count in args.instances:
+                results.append(bench_batch(device, size, count, args.warmup, args.trials))
+                _print_result(results[-1])
+
+        if "shading" in args.suites:
+            for mode in ("compute", "vertex"):
+                results.append(bench_shading(device, size, mode, args.warmup, args.trials))
+                _print_result(results[-1])
+
+    commit = _git_commit()
+    os.makedirs(args.out, exist_ok=True)
+    prefix = os.path.join(args.out, f"{time.strftime('%Y%m%d-%H%M%S')}_{commit}")
+
+    with open(prefix + ".json", "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "adapter": adapter,
+            "platform": platform.platform(),
+            "args": vars(args),
+            "results": results,
+        }, f, indent=2)
+    print(f"\nrésultats : {prefix}.json")
+
+    for path in write_plots(results, prefix):
+        print(f"courbe : {path}")
+
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
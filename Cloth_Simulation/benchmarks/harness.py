@@ -0,0 +1,43 @@
+import time
+
+import numpy as np
+
+from src.gpu_utils import wait_gpu_idle
+
+"""
+Outils de mesure communs aux benchmarks :
+- warmup puis essais répétés, chaque essai attend la fin du travail GPU
+- statistiques (médiane, percentiles)
+"""
+
+
+def time_trials(device, fn, warmup: int = 3, trials: int = 10, repeat: int = 1):
+    """
+    Exécute fn() `warmup` fois sans mesure, puis `trials` essais de `repeat`
+    appels chacun. Retourne les durées par appel (s), une par essai.
+    """
+    for _ in range(warmup):
+        fn()
+    wait_gpu_idle(device)
+
+    times = np.zeros(trials, dtype=np.float64)
+    for k in range(trials):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        wait_gpu_idle(device)
+        times[k] = (time.perf_counter() - t0) / repeat
+    return times
+
+
+def summarize(times: np.ndarray) -> dict:
+    """Statistiques (ms) d'une série de durées en secondes."""
+    ms = times * 1e3
+    return {
+        "mean_ms": float(ms.mean()),
+        "min_ms": float(ms.min()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "trials": int(ms.size),
+    }
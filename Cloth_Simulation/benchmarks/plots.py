@@ -0,0 +1,49 @@
+"""
+Courbes de mise à l'échelle (matplotlib optionnel).
+"""
+
+
+def write_plots(results: list, out_prefix: str) -> list:
+    """Écrit un PNG par suite (temps médian vs nb de particules). Retourne les fichiers écrits."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib absent : pas de courbes (pip install matplotlib)")
+        return []
+
+    written = []
+    for suite in sorted({r["suite"] for r in results}):
+        rows = [r for r in results if r["suite"] == suite]
+
+        # une courbe par configuration (substeps / workgroup / mode / nb de tissus)
+        series = {}
+        for r in rows:
+            label = ", ".join(
+                f"{k}={r[k]}" for k in ("substeps", "workgroup", "normals", "geometry", "instances") if k in r
+            ) or suite
+            series.setdefault(label, []).append((r["particles"], r["p50_ms"], r["p95_ms"]))
+
+        fig, ax = plt.subplots(figsize=(7, 4.5))
+        for label, pts in sorted(series.items()):
+            pts.sort()
+            x = [p[0] for p in pts]
+            ax.plot(x, [p[1] for p in pts], marker="o", label=f"{label} (p50)")
+            ax.fill_between(x, [p[1] for p in pts], [p[2] for p in pts], alpha=0.15)
+
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("particules")
+        ax.set_ylabel("temps (ms)")
+        ax.set_title(f"{suite} : mise à l'échelle")
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend(fontsize=7)
+        fig.tight_layout()
+
+        path = f"{out_prefix}_{suite}.png"
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
+        written.append(path)
+
+    return written
@@ -0,0 +1,139 @@
+import time
+
+from src.simulation import ClothSimulation
+from src.scene import Scene
+from src.cloth_batch import ClothBatch
+from src.offscreen import OffscreenTarget
+
+from benchmarks.harness import time_trials, summarize
+
+"""
+Suites de benchmarks (sans fenêtre) :
+- step     : ClothSimulation.step (grille x substeps x workgroup)
+- normals  : ClothSimulation.compute_normals (grille x workgroup x variante
+             grid / area / csr)
+- draw     : Scene.draw dans une texture offscreen (grille), tissu indexé
+             ou procédural (sans index buffers)
+- batch    : Scene.draw d'un ClothBatch de B tissus + sphères (un draw
+             instancié par renderer), par grille x B
+- shading  : normales du tissu, passe compute + rendu ("compute") contre
+             calcul dans le vertex shader ("vertex"), par grille
+"""
+
+
+def bench_step(device, size: int, substeps: int, workgroup: int, warmup: int, trials: int) -> dict:
+    sim = ClothSimulation(device, size, size, workgroup_size=workgroup)
+    sim.SUBSTEPS = substeps
+
+    stats = summarize(time_trials(device, sim.step, warmup, trials))
+    median_s = stats["p50_ms"] * 1e-3
+    stats.update({
+        "suite": "step",
+        "size": size,
+        "particles": sim.N,
+        "substeps": substeps,
+        "workgroup": workgroup,
+        "steps_per_sec": 1.0 / median_s,
+        "particle_substeps_per_sec": sim.N * substeps / median_s,
+    })
+    return stats
+
+
+def bench_normals(device, size: int, workgroup: int, warmup: int, trials: int, mode: str = "grid") -> dict:
+    sim = ClothSimulation(device, size, size, workgroup_size=workgroup, normals_mode=mode)
+
+    stats = summarize(time_trials(device, sim.compute_normals, warmup, trials, repeat=10))
+    median_s = stats["p50_ms"] * 1e-3
+    stats.update({
+        "suite": "normals",
+        "size": size,
+        "particles": sim.N,
+        "workgroup": workgroup,
+        "normals": mode,
+        "tile": list(sim.kernel_tiles["normals"]),
+        "vertices_per_sec": sim.N / median_s,
+    })
+    return stats
+
+
+def bench_draw(device, size: int, warmup: int, trials: int, resolution=(900, 700),
+               geometry: str = "indexed") -> dict:
+    """geometry = "indexed" (index buffers) ou "procedural" (vertex_index)."""
+    sim = ClothSimulation(device, size, size)
+    target = OffscreenTarget(device, resolution)
+    t0 = time.perf_counter()
+    scene = Scene(target.format, device, sim.W, sim.H, procedural_grid=geometry == "procedural")
+    scene_s = time.perf_counter() - t0
+    sim.compute_normals()
+
+    w, h = resolution
+
+    def frame():
+        scene.draw(device, target.color_view, target.depth_view, sim)
+
+    # une mesure par frame : percentiles de temps de frame
+    times = time_trials(device, frame, warmup, trials)
+    stats = summarize(times)
+    stats.update({
+        "suite": "draw",
+        "size": size,
+        "particles": sim.N,
+        "geometry": geometry,
+        "index_bytes": sum(b.size for b in (scene.idx_buf, scene.tri_idx_buf) if b is not None),
+        "scene_init_s": scene_s,
+        "resolution": [w, h],
+        "fps_p50": 1e3 / stats["p50_ms"],
+    })
+    return stats
+
+
+def bench_shading(device, size: int, normals: str, warmup: int, trials: int,
+                  resolution=(900, 700)) -> dict:
+    """Frame = normales + Scene.draw (surface du tissu seule), normals = "compute" ou "vertex"."""
+    vertex = normals == "vertex"
+    sim = ClothSimulation(device, size, size)
+    target = OffscreenTarget(device, resolution)
+    scene = Scene(target.format, device, sim.W, sim.H, vertex_normals=vertex)
+    scene.show_sphere_surface = scene.show_sphere_wire = False
+
+    def frame():
+        if not vertex:
+            sim.compute_normals()
+        scene.draw(device, target.color_view, target.depth_view, sim)
+
+    stats = summarize(time_trials(device, frame, warmup, trials))
+    stats.update({
+        "suite": "shading",
+        "size": size,
+        "particles": sim.N,
+        "normals": normals,
+        "resolution": list(resolution),
+        "fps_p50": 1e3 / stats["p50_ms"],
+    })
+    return stats
+
+
+def bench_batch(device, size: int, instances: int, warmup: int, trials: int,
+                resolution=(900, 700)) -> dict:
+    """B copies du même tissu dans un ClothBatch, dessinées en instancié."""
+    sim = ClothSimulation(device, size, size)
+    batch = ClothBatch(device, sim.W, sim.H, instances, spacing=max((size - 1) * sim.REST, 2 * sim.SPHERE_R) * 1.4)
+    for b in range(instances):
+        batch.capture(b, sim)
+    target = OffscreenTarget(device, resolution)
+    scene = Scene(target.format, device, sim.W, sim.H)
+    scene.show_batch(batch)
+
+    def frame():
+        scene.draw(device, target.color_view, target.depth_view, sim)
+
+    stats = summarize(time_trials(device, frame, warmup, trials))
+    stats.update({
+        "suite": "batch",
+        "size": size,
+        "particles": sim.N * instances,
+        "instances": instances,
+        "resolution": list(resolution),
+        "fps_p50": 1e3 / stats["p50_ms"],
+    })
+    return stats
@@ -1,4 +1,103 @@
-from src.app import run_app
+import argparse
+
+from src.headless import run_headless
 
 if __name__ == "__main__":
-    run_app()
+    parser = argparse.ArgumentParser(description="Cloth Simulation (wgpu)")
+    parser.add_argument("--record", metavar="PATH", help="enregistre la trajectoire dans PATH")
+    parser.add_argument("--record-normals", action="store_true", help="enregistre aussi les normales")
+    parser.add_argument("--playback", metavar="PATH", help="relit un enregistrement au lieu de simuler")
+    parser.add_argument("--timeline", type=int, default=0, metavar="K",
+                        help="K snapshots GPU pour revenir en arrière (0 = désactivé)")
+    parser.add_argument("--timeline-interval", type=int, default=6, metavar="M",
+                        help="un snapshot toutes les M frames")
+    parser.add_argument("--profile", action="store_true",
+                        help="profileur GPU par passe (rapport console périodique)")
+    parser.add_argument("--frame-stats", metavar="JSON",
+                        help="temps CPU par phase de draw() (p50/p95/p99, histogrammes) à la fermeture")
+    parser.add_argument("--cprofile", type=int, default=0, metavar="N",
+                        help="capture cProfile des N premières frames (frames.prof)")
+    parser.add_argument("--async-start", action="store_true",
+                        help="construit simulation et scène en arrière-plan (fenêtre affichée tout de suite)")
+    parser.add_argument("--max-steps", type=int, default=4, metavar="N",
+                        help="pas de simulation max par frame pour rattraper le retard")
+    parser.add_argument("--sim-thread", action="store_true",
+                        help="simulation sur un thread dédié (rendu découplé)")
+    parser.add_argument("--vertex-normals", action="store_true",
+                        help="normales du tissu calculées dans le vertex shader (pas de passe compute)")
+    parser.add_argument("--normals", choices=["grid", "area", "csr"], default="grid",
+                        help="kernel normales : différences centrales, pondérées par l'aire (tuiles), CSR")
+    parser.add_argument("--procedural-grid", action="store_true",
+                        help="tissu dessiné sans index buffers (sommets déduits de vertex_index)")
+    parser.add_argument("--sphere-impostors", action="store_true",
+                        help="sphère dessinée en imposteur (quad + lancer de rayon) au lieu du maillage UV")
+    parser.add_argument("--sweep", metavar="SCENARIO",
+                        help="balayage de paramètres du scénario, résultats affichés côte à côte")
+    parser.add_argument("--vary", action="append", default=[], metavar="NOM=v1,v2,...",
+                        help="valeurs balayées d'un paramètre (répétable, produit cartésien)")
+    parser.add_argument("--sweep-frames", type=int, default=None, metavar="N",
+                        help="frames simulées par run (défaut : celles du scénario)")
+    parser.add_argument("--render-scale", type=float, default=1.0, metavar="S",
+                        help="résolution de rendu interne (fraction de la fenêtre), remise à l'échelle ensuite")
+    parser.add_argument("--dynamic-res", type=float, default=None, metavar="MS",
+                        help="résolution dynamique : render scale ajusté pour tenir MS ms de rendu GPU par frame")
+    parser.add_argument("--sharpen", type=float, default=0.0, metavar="K",
+                        help="accentuation de la remise à l'échelle (0 = bilinéaire, ~0.1 à 0.5)")
+    parser.add_argument("--target-fps", type=float, default=None, metavar="FPS",
+                        help="gouverneur : substeps, fréquence des normales et render scale ajustés pour tenir FPS")
+    parser.add_argument("--governor-log", metavar="JSONL", help="journal des décisions du gouverneur")
+    parser.add_argument("--min-substeps", type=int, default=10, metavar="N",
+                        help="borne basse des substeps pour le gouverneur")
+    parser.add_argument("--headless", type=int, default=0, metavar="N",
+                        help="rendu sans fenêtre de N frames capturées sur disque (voir --out)")
+    parser.add_argument("--out", default="frames", metavar="PATH",
+                        help="sortie du rendu sans fenêtre : dossier (png) ou fichier (raw)")
+    parser.add_argument("--capture", choices=["png", "raw"], default="png",
+                        help="format de capture : un PNG par frame ou frames RGBA brutes")
+    parser.add_argument("--size", default="900x700", metavar="WxH", help="taille du rendu sans fenêtre")
+    parser.add_argument("--gpu", action="store_true",
+                        help="rendu sans fenêtre sur l'adapter matériel au lieu de l'adapter logiciel")
+    args = parser.parse_args()
+
+    if args.headless > 0:
+        run_headless(
+            args.headless, args.out,
+            size=tuple(int(v) for v in args.size.lower().split("x")),
+            mode=args.capture,
+            software=not args.gpu,
+            playback=args.playback,
+            vertex_normals=args.vertex_normals,
+            normals_mode=args.normals,
+            procedural_grid=args.procedural_grid,
+            sphere_impostors=args.sphere_impostors,
+            render_scale=args.render_scale,
+            sharpen=args.sharpen,
+        )
+    else:
+        # import ici : src.app choisit un backend de fenêtre (rendercanvas.auto)
+        from src.app import run_app
+
+        run_app(
+            record=args.record,
+            record_normals=args.record_normals,
+            playback=args.playback,
+            timeline_slots=args.timeline,
+            timeline_interval=args.timeline_interval,
+            profile=args.profile,
+            frame_stats=args.frame_stats,
+            cprofile_frames=args.cprofile,
+            async_start=args.async_start,
+            max_steps=args.max_steps,
+            sim_thread=args.sim_thread,
+            vertex_normals=args.vertex_normals,
+            normals_mode=args.normals,
+            procedural_grid=args.procedural_grid,
+            sphere_impostors=args.sphere_impostors,
+            sweep=(args.sweep, args.vary, args.sweep_frames) if args.sweep else None,
+            render_scale=args.render_scale,
+            dynamic_res=args.dynamic_res,
+            sharpen=args.sharpen,
+            target_fps=args.target_fps,
+            governor_log=args.governor_log,
+            min_substeps=args.min_substeps,
+        )
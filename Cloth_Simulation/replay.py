@@ -0,0 +1,74 @@
+import argparse
+import os
+import sys
+
+from src.gpu_utils import get_headless_device
+from src.replay import (
+    compare_traces,
+    load_scenario,
+    load_trace,
+    record_trace,
+    save_trace,
+)
+
+"""
+Régression déterministe (sans fenêtre) :
+
+    python replay.py check  scenarios/drape_default.json
+    python replay.py record scenarios/drape_default.json [autre/trace.npz]
+
+La trace de référence est par défaut à côté du scénario (même nom, .npz) ;
+celle de drape_default est enregistrée sur l'adapter logiciel et versionnée.
+`check` rejoue le scénario, affiche la dérive et le débit (steps/s),
+et retourne un code 1 si la dérive dépasse les tolérances.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Traces de référence de la simulation")
+    parser.add_argument("command", choices=["record", "check"])
+    parser.add_argument("scenario", help="fichier scénario JSON")
+    parser.add_argument("trace", nargs="?", help="fichier trace (.npz, défaut : scénario .json -> .npz)")
+    parser.add_argument("--gpu", action="store_true", help="adapter matériel au lieu de l'adapter logiciel")
+    parser.add_argument("--aabb-tol", type=float, default=1e-3, help="dérive AABB max (m)")
+    parser.add_argument("--energy-tol", type=float, default=1e-3, help="dérive relative d'énergie max")
+    parser.add_argument("--strict", action="store_true", help="exige des hash identiques (même adapter)")
+    args = parser.parse_args()
+    if args.trace is None:
+        args.trace = os.path.splitext(args.scenario)[0] + ".npz"
+
+    device = get_headless_device(software=not args.gpu)
+    scenario = load_scenario(args.scenario)
+
+    trace = record_trace(device, scenario)
+    print(f"adapter : {trace['adapter']}")
+    print(f"{trace['steps_per_sec']:.1f} steps/s | {trace['substeps_per_sec']:.0f} substeps/s")
+
+    if args.command == "record":
+        save_trace(args.trace, trace, scenario)
+        print(f"trace écrite : {args.trace} ({len(trace['hashes'])} frames)")
+        return 0
+
+    ref = load_trace(args.trace)
+    if ref["scenario"] != scenario:
+        print("⚠️  le scénario diffère de celui de la trace")
+
+    report = compare_traces(ref, trace)
+    print(f"frames comparées  : {report['frames']}")
+    print(f"dérive AABB max   : {report['max_aabb_drift']:.3e} m")
+    print(f"dérive énergie    : {report['max_energy_drift']:.3e}")
+    print(f"hash différents   : {report['hash_mismatches']}"
+          + (f" (première frame {report['first_mismatch']})" if report["first_mismatch"] is not None else ""))
+
+    ok = (
+        report["frame_count_match"]
+        and report["max_aabb_drift"] <= args.aabb_tol
+        and report["max_energy_drift"] <= args.energy_tol
+        and not (args.strict and report["hash_mismatches"])
+    )
+    print("✅ OK" if ok else "❌ DÉRIVE")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
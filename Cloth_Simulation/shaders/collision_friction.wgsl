@@ -22,37 +22,17 @@ struct SphereParams {
     _pad2: u32,
 };
 
-@group(0) @binding(0) var<storage, read> pos_in  : array<vec4<f32>>;
-@group(0) @binding(1) var<storage, read> vel_in  : array<vec4<f32>>;
-@group(0) @binding(2) var<storage, read_write> pos_out : array<vec4<f32>>;
-@group(0) @binding(3) var<storage, read_write> vel_out : array<vec4<f32>>;
+#include "common/pingpong.wgsl"
 @group(0) @binding(4) var<uniform> params : SphereParams;
 
 
-// Applique le modèle de frottement statique et dynamique
-fn apply_friction_static_dynamic(vt: vec3<f32>, jn_contact: f32, mu: f32) -> vec3<f32> {
-    let vt_len = length(vt); 
-    if (vt_len < 1e-6) { 
-        return vec3<f32>(0.0);
-    }
-
-    let limit = mu * jn_contact; 
-
-    // fric statique si on a assez de marge, on colle
-    let stick_k = 2.0;
-    if (vt_len * stick_k <= limit) {
-        return vec3<f32>(0.0);
-    }
-
-    // fric dynamique on réduit la norme tangentielle
-    let vt_new_len = max(0.0, vt_len - limit);
-    return vt * (vt_new_len / vt_len); 
-}
+#include "common/kernel.wgsl"
+#include "common/friction.wgsl"
 
-@compute @workgroup_size(64)
+@compute @workgroup_size(WG)
 fn main(@builtin(global_invocation_id) gid: vec3<u32>) {
     let i = gid.x;
-    if (i >= params.n) { return; }
+    if (i >= grid_n()) { return; }
 
     var p = pos_in[i].xyz; 
     var v = vel_in[i].xyz;
@@ -0,0 +1,10 @@
+// Uniform de frame partagé par tous les renderers (group 0), écrit une fois
+// par frame par Scene (voir src/renders/frame_uniform.py).
+struct Frame {
+    view: mat4x4<f32>,
+    proj: mat4x4<f32>,
+    mvp: mat4x4<f32>,
+    eye: vec4<f32>,   // position caméra (xyz)
+    light: vec4<f32>, // direction vers la lumière (xyz, normalisée)
+};
+@group(0) @binding(0) var<uniform> frame: Frame;
@@ -0,0 +1,23 @@
+// Rapport vitesse tangentielle / limite en dessous duquel on colle (statique)
+#ifndef STICK_K
+#define STICK_K 2.0
+#endif
+
+// Applique le modèle de frottement statique et dynamique
+fn apply_friction_static_dynamic(vt: vec3<f32>, jn_contact: f32, mu: f32) -> vec3<f32> {
+    let vt_len = length(vt); 
+    if (vt_len < 1e-6) { 
+        return vec3<f32>(0.0);
+    }
+
+    let limit = mu * jn_contact; 
+
+    // fric statique si on a assez de marge, on colle
+    if (vt_len * STICK_K <= limit) {
+        return vec3<f32>(0.0);
+    }
+
+    // fric dynamique on réduit la norme tangentielle
+    let vt_new_len = max(0.0, vt_len - limit);
+    return vt * (vt_new_len / vt_len); 
+}
@@ -0,0 +1,33 @@
+// Accès grille W x H (champs `width` / `height` de `params` si non spécialisé).
+
+#include "kernel.wgsl"
+
+fn grid_w() -> u32 {
+    if (GRID_W > 0u) { return GRID_W; }
+    return params.width;
+}
+
+fn grid_h() -> u32 {
+    if (GRID_H > 0u) { return GRID_H; }
+    return params.height;
+}
+
+fn idx_of(x: u32, y: u32) -> u32 {
+    return y * grid_w() + x;
+}
+
+// Sommet traité par une invocation (1D : gid.x = indice, 2D : gid.xy = (x, y))
+struct Cell {
+    i: u32,
+    x: u32,
+    y: u32,
+    inside: bool,
+};
+
+fn grid_cell(gid: vec3<u32>) -> Cell {
+    let w = grid_w();
+    if (WG_Y == 1u) {
+        return Cell(gid.x, gid.x % w, gid.x / w, gid.x < grid_n());
+    }
+    return Cell(gid.y * w + gid.x, gid.x, gid.y, gid.x < w && gid.y < grid_h());
+}
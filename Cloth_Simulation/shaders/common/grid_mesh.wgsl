@@ -0,0 +1,41 @@
+// Maillage de la grille sans index buffer : sommet de grille du vertex
+// `vi` d'un draw non indexé, même ordre que make_grid_indices /
+// make_grid_line_indices(diagonals=True). Le shader qui inclut ce fichier
+// déclare `params` (width, height, n).
+
+#include "grid.wgsl"
+
+// Triangles : 6 vertex par quad, (0,0) (1,0) (0,1) puis (1,0) (1,1) (0,1)
+// décalages x / y du coin k = bit k des masques
+const TRI_DX: u32 = 0x1Au; // 0b011010
+const TRI_DY: u32 = 0x34u; // 0b110100
+
+fn grid_tri_vertex(vi: u32) -> u32 {
+  let qw = grid_w() - 1u;
+  let q = vi / 6u;
+  let k = vi % 6u;
+  let x = q % qw + ((TRI_DX >> k) & 1u);
+  let y = q / qw + ((TRI_DY >> k) & 1u);
+  return idx_of(x, y);
+}
+
+// Lignes : 2 vertex par segment, horizontales, verticales puis diagonales
+fn grid_line_vertex(vi: u32) -> u32 {
+  let w = grid_w();
+  let h = grid_h();
+  let e = vi & 1u; // extrémité du segment
+  var s = vi >> 1u;
+
+  let n_h = h * (w - 1u);
+  let n_v = (h - 1u) * w;
+
+  if (s < n_h) {
+    return idx_of(s % (w - 1u) + e, s / (w - 1u));
+  }
+  s -= n_h;
+  if (s < n_v) {
+    return idx_of(s % w, s / w + e);
+  }
+  s -= n_v;
+  return idx_of(s % (w - 1u) + e, s / (w - 1u) + e);
+}
@@ -0,0 +1,26 @@
+// Normale d'un sommet (i, j) de la grille : produit vectoriel des différences
+// centrales, bords clampés. Le shader qui inclut ce fichier déclare
+// `pos : array<vec4<f32>>` et `params` (width, height, n).
+
+#include "grid.wgsl"
+#include "math.wgsl"
+
+fn grid_normal(i: u32, j: u32) -> vec3<f32> {
+  let w = grid_w();
+  let h = grid_h();
+
+  let il = max(i, 1u) - 1u;
+  let ir = min(i + 1u, w - 1u);
+  let jd = max(j, 1u) - 1u;
+  let ju = min(j + 1u, h - 1u);
+
+  let pL = pos[idx_of(il, j)].xyz;
+  let pR = pos[idx_of(ir, j)].xyz;
+  let pD = pos[idx_of(i, jd)].xyz;
+  let pU = pos[idx_of(i, ju)].xyz;
+
+  let dx = pR - pL; // vecteur horizontal
+  let dz = pU - pD; // vecteur vertical
+
+  return safe_normalize(cross(dz, dx));
+}
@@ -0,0 +1,15 @@
+// Constantes de pipeline (override) communes aux kernels compute.
+// WG x WG_Y : taille de workgroup (WG_Y = 1 : dispatch 1D sur les sommets,
+// sinon tuiles 2D sur la grille) ; GRID_W / GRID_H > 0 : variante spécialisée
+// pour une résolution (les % w et / w deviennent des constantes).
+// Le shader qui inclut ce fichier déclare `params` avec un champ `n`.
+
+override WG: u32 = 64u;
+override WG_Y: u32 = 1u;
+override GRID_W: u32 = 0u;
+override GRID_H: u32 = 0u;
+
+fn grid_n() -> u32 {
+    if (GRID_W > 0u) { return GRID_W * GRID_H; }
+    return params.n;
+}
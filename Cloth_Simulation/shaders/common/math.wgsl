@@ -0,0 +1,5 @@
+fn safe_normalize(v: vec3<f32>) -> vec3<f32> {
+    let l = length(v);
+    if (l < 1e-8) { return vec3<f32>(0.0, 1.0, 0.0); }
+    return v / l;
+}
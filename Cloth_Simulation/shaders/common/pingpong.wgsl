@@ -0,0 +1,6 @@
+// Bindings des passes ping-pong (entrée A/B -> sortie B/A), binding 4 = params.
+
+@group(0) @binding(0) var<storage, read>  pos_in  : array<vec4<f32>>;
+@group(0) @binding(1) var<storage, read>  vel_in  : array<vec4<f32>>;
+@group(0) @binding(2) var<storage, read_write> pos_out : array<vec4<f32>>;
+@group(0) @binding(3) var<storage, read_write> vel_out : array<vec4<f32>>;
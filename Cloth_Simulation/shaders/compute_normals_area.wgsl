@@ -0,0 +1,82 @@
+// Normales pondérées par l'aire : somme des normales (non normalisées) des
+// 6 triangles autour de chaque sommet (triangulation de make_grid_indices),
+// orientées comme compute_normals_grid.wgsl.
+// Tuiles 2D WG x WG_Y : positions de la tuile + 1 sommet de bord chargées une
+// fois en mémoire partagée, puis lues par les invocations voisines. Dispatch
+// toujours 2D sur la grille (pas de % w ni / w par sommet).
+
+struct Params {
+    width: u32,
+    height: u32,
+    n: u32,
+    _pad: u32,
+};
+
+@group(0) @binding(0) var<storage, read> pos : array<vec4<f32>>;
+@group(0) @binding(1) var<storage, read_write> nrm : array<vec4<f32>>;
+@group(0) @binding(2) var<uniform> params : Params;
+
+#include "common/grid.wgsl"
+#include "common/math.wgsl"
+
+var<workgroup> tile : array<vec4<f32>, (WG + 2u) * (WG_Y + 2u)>;
+
+fn tile_at(tx: u32, ty: u32) -> vec3<f32> {
+  return tile[ty * (WG + 2u) + tx].xyz;
+}
+
+@compute @workgroup_size(WG, WG_Y)
+fn main(
+  @builtin(global_invocation_id) gid: vec3<u32>,
+  @builtin(local_invocation_id) lid: vec3<u32>,
+  @builtin(local_invocation_index) li: u32,
+  @builtin(workgroup_id) wid: vec3<u32>,
+) {
+  let w = grid_w();
+  let h = grid_h();
+
+  // chargement coopératif (tuile + bord) ; hors grille : sommet clampé, jamais utilisé
+  let tw = WG + 2u;
+  let ox = i32(wid.x * WG) - 1;
+  let oy = i32(wid.y * WG_Y) - 1;
+  for (var k = li; k < tw * (WG_Y + 2u); k += WG * WG_Y) {
+    let x = clamp(ox + i32(k % tw), 0, i32(w) - 1);
+    let y = clamp(oy + i32(k / tw), 0, i32(h) - 1);
+    tile[k] = pos[idx_of(u32(x), u32(y))];
+  }
+  workgroupBarrier();
+
+  let i = gid.x;
+  let j = gid.y;
+  if (i >= w || j >= h) { return; }
+
+  let tx = lid.x + 1u;
+  let ty = lid.y + 1u;
+  let p = tile_at(tx, ty);
+
+  // anneau R, U, UL, L, D, DR (relatif à p) ; triangle (p, a, b) -> cross(b, a)
+  let r = tile_at(tx + 1u, ty) - p;
+  let u = tile_at(tx, ty + 1u) - p;
+  let ul = tile_at(tx - 1u, ty + 1u) - p;
+  let l = tile_at(tx - 1u, ty) - p;
+  let d = tile_at(tx, ty - 1u) - p;
+  let dr = tile_at(tx + 1u, ty - 1u) - p;
+
+  let has_r = i + 1u < w;
+  let has_l = i > 0u;
+  let has_u = j + 1u < h;
+  let has_d = j > 0u;
+
+  var n = vec3<f32>(0.0);
+  if (has_r && has_l && has_u && has_d) {
+    // anneau complet : les 6 termes se regroupent en 3 produits vectoriels
+    n = cross(ul - r, u) + cross(d - ul, l) + cross(r - d, dr);
+  } else {
+    if (has_r && has_u) { n += cross(u, r); }
+    if (has_l && has_u) { n += cross(ul, u) + cross(l, ul); }
+    if (has_l && has_d) { n += cross(d, l); }
+    if (has_r && has_d) { n += cross(dr, d) + cross(r, dr); }
+  }
+
+  nrm[j * w + i] = vec4<f32>(safe_normalize(n), 0.0);
+}
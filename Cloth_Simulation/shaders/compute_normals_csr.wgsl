@@ -0,0 +1,38 @@
+// Normales pondérées par l'aire pour un maillage quelconque : pour chaque
+// sommet, somme des normales (non normalisées) de ses triangles incidents,
+// listés en CSR (tri_offsets[i] .. tri_offsets[i + 1] dans tri_ids).
+// Normale d'un triangle (a, b, c) : cross(b - a, c - a).
+
+struct Params {
+    width: u32,
+    height: u32,
+    n: u32,
+    _pad: u32,
+};
+
+@group(0) @binding(0) var<storage, read> pos : array<vec4<f32>>;
+@group(0) @binding(1) var<storage, read_write> nrm : array<vec4<f32>>;
+@group(0) @binding(2) var<uniform> params : Params;
+@group(0) @binding(3) var<storage, read> tri_offsets : array<u32>;  // N + 1
+@group(0) @binding(4) var<storage, read> tri_ids : array<u32>;
+@group(0) @binding(5) var<storage, read> tris : array<u32>;         // 3 indices par triangle
+
+#include "common/kernel.wgsl"
+#include "common/math.wgsl"
+
+@compute @workgroup_size(WG)
+fn main(@builtin(global_invocation_id) gid: vec3<u32>) {
+  let i = gid.x;
+  if (i >= grid_n()) { return; }
+
+  var n = vec3<f32>(0.0);
+  for (var k = tri_offsets[i]; k < tri_offsets[i + 1u]; k++) {
+    let t = tri_ids[k] * 3u;
+    let a = pos[tris[t]].xyz;
+    let b = pos[tris[t + 1u]].xyz;
+    let c = pos[tris[t + 2u]].xyz;
+    n += cross(b - a, c - a);
+  }
+
+  nrm[i] = vec4<f32>(safe_normalize(n), 0.0);
+}
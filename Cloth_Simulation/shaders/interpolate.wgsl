@@ -0,0 +1,25 @@
+// Positions affichées entre les deux derniers états simulés (pas de temps
+// fixe) : out = mix(prev, cur, alpha), w repris de l'état courant.
+
+struct Params {
+    alpha: f32,
+    n: u32,
+    _pad0: u32,
+    _pad1: u32,
+};
+
+@group(0) @binding(0) var<storage, read> prev_pos : array<vec4<f32>>;
+@group(0) @binding(1) var<storage, read> cur_pos : array<vec4<f32>>;
+@group(0) @binding(2) var<storage, read_write> out_pos : array<vec4<f32>>;
+@group(0) @binding(3) var<uniform> params : Params;
+
+#include "common/kernel.wgsl"
+
+@compute @workgroup_size(WG)
+fn main(@builtin(global_invocation_id) gid: vec3<u32>) {
+    let i = gid.x;
+    if (i >= grid_n()) { return; }
+
+    let cur = cur_pos[i];
+    out_pos[i] = vec4<f32>(mix(prev_pos[i].xyz, cur.xyz, params.alpha), cur.w);
+}
@@ -1,26 +1,76 @@
-struct Camera {
-    mvp: mat4x4<f32>, // model-view-projection matrix
-};
+#include "common/frame.wgsl"
 
-@group(0) @binding(0) var<uniform> cam: Camera;
+// PROCEDURAL_GRID : lignes de la grille sans index buffer (sommet déduit de
+// vertex_index, positions lues en storage)
+// INSTANCED : B tissus concaténés, un draw instancié, décalage par instance
+#ifdef PROCEDURAL_GRID
+#define GRID_STORAGE 1
+#endif
+#ifdef INSTANCED
+#define GRID_STORAGE 1
+#endif
 
-struct VSIn {
-    @location(0) position: vec4<f32>,
+#ifdef GRID_STORAGE
+struct GridParams {
+    width: u32,
+    height: u32,
+    n: u32,
+    _pad: u32,
 };
 
+@group(1) @binding(0) var<storage, read> pos : array<vec4<f32>>;
+@group(1) @binding(1) var<uniform> params : GridParams;
+
+#include "common/grid.wgsl"
+#endif
+
+#ifdef PROCEDURAL_GRID
+#include "common/grid_mesh.wgsl"
+#endif
+
+#ifdef INSTANCED
+@group(1) @binding(3) var<storage, read> instances : array<vec4<f32>>; // décalage (xyz)
+#endif
+
 struct VSOut {
     @builtin(position) clip: vec4<f32>,
 };
 
+#ifdef INSTANCED
+@vertex
+fn vs_main(@builtin(vertex_index) vi: u32, @builtin(instance_index) ii: u32) -> VSOut {
+#ifdef PROCEDURAL_GRID
+    let k = ii * grid_n() + grid_line_vertex(vi);
+#else
+    let k = ii * grid_n() + vi;
+#endif
+    var out: VSOut;
+    out.clip = frame.mvp * (pos[k] + vec4<f32>(instances[ii].xyz, 0.0));
+    return out;
+}
+#else
+#ifdef PROCEDURAL_GRID
+@vertex
+fn vs_main(@builtin(vertex_index) vi: u32) -> VSOut {
+    var out: VSOut;
+    out.clip = frame.mvp * pos[grid_line_vertex(vi)];
+    return out;
+}
+#else
+struct VSIn {
+    @location(0) position: vec4<f32>,
+};
+
 @vertex
 fn vs_main(in: VSIn) -> VSOut {
     var out: VSOut;
-    out.clip = cam.mvp * in.position;
+    out.clip = frame.mvp * in.position;
     return out;
 }
+#endif
+#endif
 
 @fragment
 fn fs_main() -> @location(0) vec4<f32> {
     return vec4<f32>(1.0, 0.2, 0.2, 1.0); 
 }
-
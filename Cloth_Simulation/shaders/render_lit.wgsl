@@ -1,31 +1,113 @@
-struct Camera {
-  mvp: mat4x4<f32>,
-};
-@group(0) @binding(0) var<uniform> cam: Camera;
+#include "common/frame.wgsl"
 
-struct VSIn {
-  @location(0) position: vec4<f32>,
-  @location(1) normal: vec4<f32>,   // normal.xyz
+// VERTEX_NORMALS : normales calculées ici depuis les voisins de grille (lus
+// dans le buffer de positions), sans passe compute ni buffer de normales
+// PROCEDURAL_GRID : draw non indexé, le sommet de grille est déduit de
+// vertex_index et positions / normales sont lues en storage
+// INSTANCED : B tissus concaténés (tissu b = sommets [b*n, (b+1)*n)), un draw
+// instancié, décalage monde par instance ; normales toujours lues en storage
+#ifdef VERTEX_NORMALS
+#define GRID_STORAGE 1
+#endif
+#ifdef PROCEDURAL_GRID
+#define GRID_STORAGE 1
+#ifndef VERTEX_NORMALS
+#define NORMAL_STORAGE 1
+#endif
+#endif
+#ifdef INSTANCED
+#define GRID_STORAGE 1
+#define NORMAL_STORAGE 1
+#endif
+
+#ifdef GRID_STORAGE
+struct GridParams {
+  width: u32,
+  height: u32,
+  n: u32,
+  _pad: u32,
 };
 
+@group(1) @binding(0) var<storage, read> pos : array<vec4<f32>>;
+@group(1) @binding(1) var<uniform> params : GridParams;
+
+#include "common/grid.wgsl"
+#endif
+
+#ifdef VERTEX_NORMALS
+#include "common/grid_normal.wgsl"
+#endif
+
+#ifdef PROCEDURAL_GRID
+#include "common/grid_mesh.wgsl"
+#endif
+
+#ifdef NORMAL_STORAGE
+@group(1) @binding(2) var<storage, read> nrm : array<vec4<f32>>;
+#endif
+
+#ifdef INSTANCED
+@group(1) @binding(3) var<storage, read> instances : array<vec4<f32>>; // décalage (xyz)
+#endif
+
 struct VSOut {
   @builtin(position) clip: vec4<f32>,
   @location(0) n: vec3<f32>,
 };
 
-@vertex
-fn vs_main(v: VSIn) -> VSOut {
+fn shade_vertex(p: vec4<f32>, n: vec3<f32>) -> VSOut {
   var o: VSOut;
-  o.clip = cam.mvp * v.position;
-  o.n = normalize(v.normal.xyz);
+  o.clip = frame.mvp * p;
+  o.n = normalize(n);
   return o;
 }
 
+#ifdef INSTANCED
+@vertex
+fn vs_main(@builtin(vertex_index) vi: u32, @builtin(instance_index) ii: u32) -> VSOut {
+#ifdef PROCEDURAL_GRID
+  let k = ii * grid_n() + grid_tri_vertex(vi);
+#else
+  let k = ii * grid_n() + vi;
+#endif
+  return shade_vertex(pos[k] + vec4<f32>(instances[ii].xyz, 0.0), nrm[k].xyz);
+}
+#else
+#ifdef PROCEDURAL_GRID
+@vertex
+fn vs_main(@builtin(vertex_index) vi: u32) -> VSOut {
+  let k = grid_tri_vertex(vi);
+#ifdef VERTEX_NORMALS
+  let w = grid_w();
+  return shade_vertex(pos[k], grid_normal(k % w, k / w));
+#else
+  return shade_vertex(pos[k], nrm[k].xyz);
+#endif
+}
+#else
+struct VSIn {
+  @location(0) position: vec4<f32>,
+#ifndef VERTEX_NORMALS
+  @location(1) normal: vec4<f32>,   // normal.xyz
+#endif
+};
+
+@vertex
+fn vs_main(v: VSIn, @builtin(vertex_index) vi: u32) -> VSOut {
+#ifdef VERTEX_NORMALS
+  let w = grid_w();
+  return shade_vertex(v.position, grid_normal(vi % w, vi / w));
+#else
+  return shade_vertex(v.position, v.normal.xyz);
+#endif
+}
+#endif
+#endif
+
 @fragment
 fn fs_main(i: VSOut) -> @location(0) vec4<f32> {
-  // direction lumière
-  let L = normalize(vec3<f32>(0.3, 1.0, 0.4));
-  //let L = normalize(vec3<f32>(-1.0, 0.2, 0.0));
+  // direction lumière (uniform de frame)
+  let L = frame.light.xyz;
 
   let ndotl = max(0.0, dot(i.n, L));
 
@@ -1,5 +1,4 @@
-struct Camera { mvp: mat4x4<f32> };
-@group(0) @binding(0) var<uniform> cam: Camera; // camera matrix
+#include "common/frame.wgsl"
 
 
 struct SphereU {
@@ -18,7 +17,7 @@ fn vs_main(v: VSIn) -> VSOut {
   let radius = sph.data[1].x; 
 
   let world = v.position.xyz * radius + center;
-  o.clip = cam.mvp * vec4<f32>(world, 1.0); 
+  o.clip = frame.mvp * vec4<f32>(world, 1.0); 
   return o;
 }
 
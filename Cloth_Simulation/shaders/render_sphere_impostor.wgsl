@@ -0,0 +1,95 @@
+#include "common/frame.wgsl"
+
+// Sphères en imposteurs : un quad par instance (face à la caméra, couvrant la
+// silhouette), intersection rayon-sphère par fragment et frag_depth exact.
+// WIRE : seulement les lignes de latitude / longitude du maillage UV 16x32
+// (overlay, depth en lecture seule).
+
+@group(1) @binding(0) var<storage, read> spheres : array<vec4<f32>>; // (cx, cy, cz, r)
+
+// découpage des lignes du wireframe (make_uv_sphere_wire(16, 32))
+const STACKS: f32 = 16.0;
+const SLICES: f32 = 32.0;
+const PI: f32 = 3.14159265;
+
+struct VSOut {
+  @builtin(position) clip: vec4<f32>,
+  @location(0) world: vec3<f32>,
+  @location(1) @interpolate(flat) sphere: vec4<f32>,
+};
+
+@vertex
+fn vs_main(@builtin(vertex_index) vi: u32, @builtin(instance_index) ii: u32) -> VSOut {
+  let s = spheres[ii];
+  let c = s.xyz;
+  let r = s.w;
+
+  // repère perpendiculaire au rayon caméra -> centre
+  let to_c = c - frame.eye.xyz;
+  let d = length(to_c);
+  let fwd = to_c / d;
+  var up = vec3<f32>(0.0, 1.0, 0.0);
+  if (abs(fwd.y) > 0.99) {
+    up = vec3<f32>(1.0, 0.0, 0.0);
+  }
+  let right = normalize(cross(fwd, up));
+  let up2 = cross(right, fwd);
+
+  // demi-taille : section du cône tangent à la sphère dans le plan du centre
+  let half = r * d / sqrt(max(d * d - r * r, 1e-6));
+
+  // triangle strip : (-1,-1) (1,-1) (-1,1) (1,1)
+  let corner = vec2<f32>(f32(vi & 1u), f32(vi >> 1u)) * 2.0 - 1.0;
+  let world = c + (corner.x * right + corner.y * up2) * half;
+
+  var o: VSOut;
+  o.clip = frame.mvp * vec4<f32>(world, 1.0);
+  o.world = world;
+  o.sphere = s;
+  return o;
+}
+
+struct FSOut {
+  @location(0) color: vec4<f32>,
+  @builtin(frag_depth) depth: f32,
+};
+
+@fragment
+fn fs_main(i: VSOut) -> FSOut {
+  let eye = frame.eye.xyz;
+  let c = i.sphere.xyz;
+  let r = i.sphere.w;
+
+  // premier point d'entrée du rayon œil -> fragment
+  let rd = normalize(i.world - eye);
+  let oc = eye - c;
+  let b = dot(oc, rd);
+  let h = b * b - (dot(oc, oc) - r * r);
+  if (h < 0.0) {
+    discard;
+  }
+  let hit = eye + (-b - sqrt(h)) * rd;
+  let n = (hit - c) / r;
+
+  let clip = frame.mvp * vec4<f32>(hit, 1.0);
+
+  var o: FSOut;
+  o.depth = clip.z / clip.w;
+
+#ifdef WIRE
+  // distance (en pixels) à la ligne de latitude / longitude la plus proche
+  let v = acos(clamp(n.y, -1.0, 1.0)) / PI * STACKS;
+  let u = atan2(n.z, n.x) / (2.0 * PI) * SLICES;
+  let dv = abs(fract(v + 0.5) - 0.5) / max(fwidth(v), 1e-6);
+  let du = abs(fract(u + 0.5) - 0.5) / max(fwidth(u), 1e-6);
+  if (min(du, dv) > 0.5) {
+    discard;
+  }
+  o.color = vec4<f32>(1.0, 0.8, 0.2, 1.0);
+#else
+  let ndl = max(0.0, dot(n, frame.light.xyz));
+  let base = vec3<f32>(0.1, 0.1, 0.28);
+  o.color = vec4<f32>(base * (0.3 + 0.7 * ndl), 1.0);
+#endif
+  return o;
+}
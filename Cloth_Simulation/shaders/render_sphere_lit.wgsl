@@ -1,7 +1,4 @@
-struct Camera {
-    mvp: mat4x4<f32>,
-};
-@group(0) @binding(0) var<uniform> cam: Camera;
+#include "common/frame.wgsl"
 
 
 struct SphereU {
@@ -34,13 +31,13 @@ fn vs_main(input: VSIn) -> VSOut {
 
     var out: VSOut;
     out.normal = normalize(unit);
-    out.clip = cam.mvp * vec4<f32>(world, 1.0);
+    out.clip = frame.mvp * vec4<f32>(world, 1.0);
     return out;
 }
 
 @fragment
 fn fs_main(input: VSOut) -> @location(0) vec4<f32> {
-    let light_dir = normalize(vec3<f32>(0.3, 0.9, 0.2));
+    let light_dir = frame.light.xyz;
     let ndl = max(0.0, dot(input.normal, light_dir));
 
     let base = vec3<f32>(0.1, 0.1, 0.28);
@@ -0,0 +1,74 @@
+struct StrainParams {
+    dt: f32,
+    rest: f32, // longueur au repos des ressorts structurels
+    eps: f32, // allongement relatif toléré : [1-eps, 1+eps] * rest
+    omega: f32, // facteur de relaxation (Jacobi moyenné)
+
+    width: u32,
+    height: u32,
+    n: u32,
+    _pad: u32,
+};
+
+#include "common/pingpong.wgsl"
+@group(0) @binding(4) var<uniform> params : StrainParams;
+
+#include "common/grid.wgsl"
+
+// Correction de p pour ramener l'arête (p,q) dans [L_min, L_max].
+// Chaque extrémité fait la moitié du chemin (masses égales).
+fn add_strain_correction(
+    p: vec3<f32>,
+    q: vec3<f32>,
+    corr: ptr<function, vec3<f32>>,
+    count: ptr<function, f32>
+) {
+    let d = q - p;
+    let L = length(d);
+    if (L < 1e-6) { return; }
+
+    let L_min = params.rest * (1.0 - params.eps);
+    let L_max = params.rest * (1.0 + params.eps);
+    let L_target = clamp(L, L_min, L_max);
+
+    if (L != L_target) {
+        (*corr) = (*corr) + 0.5 * (L - L_target) * (d / L);
+        (*count) = (*count) + 1.0;
+    }
+}
+
+// Jacobi : chaque thread lit pos_in et n'écrit que son propre sommet,
+// les corrections des arêtes voisines sont moyennées (pas de conflit d'écriture).
+@compute @workgroup_size(WG, WG_Y)
+fn main(@builtin(global_invocation_id) gid: vec3<u32>) {
+    let c = grid_cell(gid);
+    if (!c.inside) { return; }
+
+    let w = grid_w();
+    let h = grid_h();
+
+    let i = c.i;
+    let x = c.x;
+    let y = c.y;
+
+    let p = pos_in[i].xyz;
+    let v = vel_in[i].xyz;
+
+    var corr = vec3<f32>(0.0);
+    var count = 0.0;
+
+    // Structural (4 voisins)
+    if (x > 0u)     { add_strain_correction(p, pos_in[idx_of(x - 1u, y)].xyz, &corr, &count); }
+    if (x + 1u < w) { add_strain_correction(p, pos_in[idx_of(x + 1u, y)].xyz, &corr, &count); }
+    if (y > 0u)     { add_strain_correction(p, pos_in[idx_of(x, y - 1u)].xyz, &corr, &count); }
+    if (y + 1u < h) { add_strain_correction(p, pos_in[idx_of(x, y + 1u)].xyz, &corr, &count); }
+
+    var dp = vec3<f32>(0.0);
+    if (count > 0.0) {
+        dp = params.omega * corr / count;
+    }
+
+    // la vitesse suit la correction de position (sinon le ressort ré-étire au pas suivant)
+    pos_out[i] = vec4<f32>(p + dp, 1.0);
+    vel_out[i] = vec4<f32>(v + dp / max(params.dt, 1e-6), 0.0);
+}
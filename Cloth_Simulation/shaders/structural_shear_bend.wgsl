@@ -20,15 +20,10 @@ struct Params {
 };
 
 
-@group(0) @binding(0) var<storage, read>  pos_in  : array<vec4<f32>>;
-@group(0) @binding(1) var<storage, read>  vel_in  : array<vec4<f32>>;
-@group(0) @binding(2) var<storage, read_write> pos_out : array<vec4<f32>>;
-@group(0) @binding(3) var<storage, read_write> vel_out : array<vec4<f32>>;
+#include "common/pingpong.wgsl"
 @group(0) @binding(4) var<uniform> params : Params;
 
-fn idx_of(x: u32, y: u32) -> u32 {
-    return y * params.width + x; 
-}
+#include "common/grid.wgsl"
 
 // Force ressort avec longueur au repos L0 donnée et raideur k donnée
 fn add_spring_force_L0(
@@ -47,16 +42,17 @@ fn add_spring_force_L0(
     }
 }
 
-@compute @workgroup_size(64) 
+@compute @workgroup_size(WG, WG_Y)
 fn main(@builtin(global_invocation_id) gid: vec3<u32>) {
-    let i = gid.x; 
-    if (i >= params.n) { return; } 
+    let c = grid_cell(gid);
+    if (!c.inside) { return; } 
 
-    let w = params.width; 
-    let h = params.height; 
+    let w = grid_w(); 
+    let h = grid_h(); 
 
-    let x = i % w; 
-    let y = i / w;  
+    let i = c.i;
+    let x = c.x; 
+    let y = c.y;  
 
     var p = pos_in[i].xyz;
     var v = vel_in[i].xyz;
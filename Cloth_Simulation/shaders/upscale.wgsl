@@ -0,0 +1,47 @@
+// Mise à l'échelle de la cible de rendu réduite (render scale) vers la
+// swapchain : triangle plein écran, échantillonnage bilinéaire.
+// SHARPEN : masque flou (unsharp mask) sur les 4 voisins à un texel source,
+// rend le contraste perdu par le filtrage bilinéaire.
+
+struct UpscaleParams {
+  texel: vec2<f32>,   // 1 / taille de la source
+  sharpness: f32,     // 0 = bilinéaire seul
+  _pad: f32,
+};
+
+@group(0) @binding(0) var src_tex: texture_2d<f32>;
+@group(0) @binding(1) var src_smp: sampler;
+@group(0) @binding(2) var<uniform> params: UpscaleParams;
+
+struct VSOut {
+  @builtin(position) clip: vec4<f32>,
+  @location(0) uv: vec2<f32>,
+};
+
+@vertex
+fn vs_main(@builtin(vertex_index) vi: u32) -> VSOut {
+  // triangle couvrant l'écran : (0, 0), (2, 0), (0, 2) en coordonnées [0, 1]
+  let p = vec2<f32>(f32((vi << 1u) & 2u), f32(vi & 2u));
+  var out: VSOut;
+  out.clip = vec4<f32>(p * 2.0 - 1.0, 0.0, 1.0);
+  out.uv = vec2<f32>(p.x, 1.0 - p.y);
+  return out;
+}
+
+@fragment
+fn fs_main(in: VSOut) -> @location(0) vec4<f32> {
+  let c = textureSampleLevel(src_tex, src_smp, in.uv, 0.0);
+#ifdef SHARPEN
+  let t = params.texel;
+  let around =
+      textureSampleLevel(src_tex, src_smp, in.uv + vec2<f32>(t.x, 0.0), 0.0).rgb
+    + textureSampleLevel(src_tex, src_smp, in.uv - vec2<f32>(t.x, 0.0), 0.0).rgb
+    + textureSampleLevel(src_tex, src_smp, in.uv + vec2<f32>(0.0, t.y), 0.0).rgb
+    + textureSampleLevel(src_tex, src_smp, in.uv - vec2<f32>(0.0, t.y), 0.0).rgb;
+  let s = params.sharpness;
+  let rgb = c.rgb * (1.0 + 4.0 * s) - s * around;
+  return vec4<f32>(clamp(rgb, vec3<f32>(0.0), vec3<f32>(1.0)), c.a);
+#else
+  return c;
+#endif
+}
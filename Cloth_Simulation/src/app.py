@@ -1,51 +1,302 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from rendercanvas.auto import RenderCanvas, loop
 from wgpu.utils import get_default_device
 import wgpu
 
+from src.gpu_utils import get_device
 from src.simulation import ClothSimulation
 from src.scene import Scene
 from src.input_controller import InputController
+from src.recording import TrajectoryRecorder, TrajectoryPlayer
+from src.timeline import GpuTimeline
+from src.profiler import GpuProfiler
+from src.frame_timer import FrameTimer
+from src.pipeline_cache import get_pipeline_cache
+from src.startup import Startup
+from src.frame_scheduler import FrameScheduler
+from src.interpolation import FrameInterpolator
+from src.sim_thread import SimulationThread
+from src.replay import load_scenario
+from src.sweep import parse_vary, run_sweep
+from src.render_scale import RenderScale
+from src.governor import FrameGovernor
 
 """
 Point central de l'application.
 - initialise GPU
 - crée simulation et scène
-- gère la boucle draw
+- gère la boucle draw : simulation à pas fixe (accumulateur), affichage
+  interpolé, nouvelle frame demandée seulement si quelque chose bouge, et
+  frame sautée (rien rendu ni présenté) si l'image ne changerait pas
 """
 
+# Taille de grille du tissu (simulation et scène)
+W, H = 22, 22
+
+
+def _draw_loading(device, context):
+    """Frame d'attente (fond uni) tant que la scène n'est pas prête."""
+    view = context.get_current_texture().create_view()
+    enc = device.create_command_encoder()
+    rp = enc.begin_render_pass(color_attachments=[{
+        "view": view,
+        "load_op": wgpu.LoadOp.clear,
+        "store_op": wgpu.StoreOp.store,
+        "clear_value": (0.1, 0.1, 0.1, 1.0),
+    }])
+    rp.end()
+    device.queue.submit([enc.finish()])
 
-def run_app():
-    device = get_default_device()
+
+def run_app(record=None, record_normals=False, playback=None,
+            timeline_slots=0, timeline_interval=6, profile=False,
+            frame_stats=None, cprofile_frames=0, async_start=False, max_steps=4,
+            sim_thread=False, vertex_normals=False, normals_mode="grid",
+            procedural_grid=False, sphere_impostors=False, sweep=None,
+            render_scale=1.0, dynamic_res=None, sharpen=0.0,
+            target_fps=None, governor_log=None, min_substeps=10):
+    """
+    - record   : chemin d'un enregistrement de trajectoire à écrire
+    - playback : chemin d'un enregistrement à relire (la simulation ne tourne pas)
+    - timeline_slots : nb de snapshots GPU pour le retour arrière (0 = désactivé)
+    - profile  : profileur GPU par passe (timestamp-query si disponible)
+    - frame_stats : chemin JSON des temps CPU par phase (p50/p95/p99 + histogrammes)
+    - cprofile_frames : capture cProfile des N premières frames (frames.prof)
+    - async_start : simulation + scène construites en arrière-plan, la fenêtre
+      affiche des frames d'attente en attendant
+    - max_steps : nb max de pas de simulation par frame pour rattraper le retard
+    - sim_thread : simulation sur un thread dédié, le rendu affiche le dernier
+      état publié (pas d'interpolation)
+    - vertex_normals : normales du tissu calculées dans le vertex shader
+      (plus de passe compute normales)
+    - normals_mode : kernel normales, "grid" / "area" / "csr" (voir ClothSimulation)
+    - procedural_grid : tissu dessiné sans index buffers (sommets déduits de
+      vertex_index, positions lues en storage)
+    - sphere_impostors : sphère dessinée en imposteur (quad + lancer de rayon)
+    - sweep : (scénario, ["NOM=v1,v2", ...], frames ou None) : balayage de
+      paramètres, états finaux affichés côte à côte (la simulation ne tourne pas)
+    - render_scale : résolution de rendu interne (fraction de la swapchain),
+      remise à l'échelle par une passe plein écran
+    - dynamic_res : temps GPU de rendu visé par frame (ms), render_scale ajusté pour le tenir
+    - sharpen : accentuation de la remise à l'échelle (0 = bilinéaire)
+    - target_fps : gouverneur de budget de frame (substeps, fréquence des
+      normales, render scale ajustés pour tenir 1000 / target_fps ms) ;
+      remplace dynamic_res
+    - governor_log : journal JSONL des décisions du gouverneur
+    - min_substeps : borne basse des substeps pour le gouverneur
+    """
+    scaled = render_scale != 1.0 or dynamic_res is not None or sharpen > 0.0 or target_fps is not None
+    # résolution dynamique et gouverneur mesurent le GPU avec les timestamps du profileur
+    timed = profile or dynamic_res is not None or target_fps is not None
+    device = get_device(["timestamp-query"]) if timed else get_default_device()
     canvas = RenderCanvas(title="Cloth Simulation", size=(900, 700))
 
     context = canvas.get_context("wgpu")
     format = context.get_preferred_format(device.adapter)
     context.configure(device=device, format=format)
 
-    sim = ClothSimulation(device)
-    scene = Scene(canvas, device)
-    inputs = InputController(canvas, sim, scene.camera)
-    # inputs = InputController(canvas, sim, scene.camera)  # DÉSACTIVE LES ENTRÉES
+    cache = get_pipeline_cache(device)
+
+    def build():
+        # Compilation parallèle de tous les shaders, puis simulation et scène
+        # construites en parallèle (maillages CPU + pipelines)
+        cache.precompile_modules()
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="build") as pool:
+            sim_future = pool.submit(ClothSimulation, device, W, H, normals_mode=normals_mode)
+            scene_future = pool.submit(Scene, format, device, W, H, vertex_normals, procedural_grid,
+                                       sphere_impostors)
+            return sim_future.result(), scene_future.result()
+
+    startup = Startup(build, background=async_start)
+
+    sim = scene = inputs = None
+    profiler = timer = timeline = recorder = None
+    scaler = governor = None
+    scheduler = interpolator = stepper = None
+
+    def after_step():
+        """Après chaque pas simulé (sur le thread de simulation avec sim_thread)."""
+        if timeline is not None:
+            timeline.capture()
+        if recorder is not None:
+            # un enregistrement par pas simulé (normales de cet état)
+            if recorder.record_normals:
+                sim.compute_normals()
+            recorder.capture()
+
+    def setup(result):
+        """Objets dépendant de la simulation / scène (thread principal)."""
+        nonlocal sim, scene, inputs, profiler, timer, timeline, recorder
+        nonlocal scheduler, interpolator, stepper, scaler, governor
+        sim, scene = result
+        print(cache.report())
+
+        threaded = sim_thread and not playback and not sweep
+        if not threaded:
+            scheduler = FrameScheduler(sim.DT, max_steps)
+            interpolator = FrameInterpolator(sim, normals=not vertex_normals)
+            scene.cloth_source = interpolator
+
+        if timed:
+            # jusqu'à max_steps pas par frame (rattrapage) + normales, interpolation, rendu
+            sim_passes = 0 if threaded else sim.passes_per_step() * max_steps
+            profiler = GpuProfiler(device, max_passes=sim_passes + 16)
+            if not threaded:  # le profileur suit les frames du thread de rendu
+                sim.profiler = profiler
+            scene.profiler = profiler
+            print(f"⏱️  Profileur GPU : {profiler.mode}")
+
+        if scaled:
+            # avec le gouverneur, c'est lui qui choisit la résolution
+            scaler = RenderScale(format, device, render_scale, sharpen,
+                                 target_ms=dynamic_res if target_fps is None else None)
+            scaler.upscale.profiler = profiler
+
+        if frame_stats or cprofile_frames > 0:
+            timer = FrameTimer()
+            scene.frame_timer = timer
+            if cprofile_frames > 0:
+                timer.profile_frames(cprofile_frames, "frames.prof")
+
+        if timeline_slots > 0:
+            timeline = GpuTimeline(sim, timeline_slots, timeline_interval)
+
+        inputs = InputController(canvas, sim, scene.camera, timeline=timeline)
+        # inputs = InputController(canvas, sim, scene.camera)  # DÉSACTIVE LES ENTRÉES
+
+        if record:
+            recorder = TrajectoryRecorder(sim, record, record_normals=record_normals,
+                                          captures_per_frame=max_steps)
+            print(f"⏺️  Enregistrement -> {record}")
+        if playback:
+            scene.playback = TrajectoryPlayer(device, playback, grid=(scene.W, scene.H))
+            print(f"⏯️  Relecture {playback} ({scene.playback.frame_count} frames)")
+        if sweep:
+            scenario, vary, frames = sweep
+            scene.show_batch(run_sweep(device, load_scenario(scenario), parse_vary(vary), frames))
+
+        if threaded:
+            # le thread demande lui-même une frame à chaque nouvel état publié
+            stepper = SimulationThread(
+                sim, paused=lambda: inputs.paused, max_steps=max_steps,
+                on_step=[after_step], on_publish=canvas.request_draw,
+                normals=not vertex_normals,
+            )
+            scene.cloth_source = stepper
+            stepper.start()
+            print("🧵 Simulation sur thread dédié")
+
+        if target_fps is not None:
+            normals = [] if vertex_normals else [stepper if threaded else interpolator]
+            governor = FrameGovernor(
+                1000.0 / target_fps, sim, scaler=scaler, normals=normals, profiler=profiler,
+                min_substeps=min_substeps, log_path=governor_log,
+            )
+            print(f"🎛️  Gouverneur : {target_fps:g} images/s ({governor.target_ms:.1f} ms par frame)")
+
+    if not async_start:
+        setup(startup.wait())
 
     depth_tex = None
     depth_view = None
     depth_size = (0, 0)
+    last_view_key = None    # scene.view_key + taille de la dernière frame rendue
+    idle_frames = 0         # frames demandées mais sautées (image inchangée)
 
-    
     @canvas.request_draw
     def draw():
-        nonlocal depth_tex, depth_view, depth_size
-        
-        # Met à jour la simulation si pas en pause
-        if not inputs.paused:
-            sim.step()
-        
-        sim.compute_normals()
-        
+        nonlocal depth_tex, depth_view, depth_size, last_view_key, idle_frames
+
+        if sim is None:
+            result = startup.poll()
+            if result is None:
+                # une seule frame d'attente, ensuite on se contente de sonder
+                if startup.first_frame_ms is None:
+                    _draw_loading(device, context)
+                    startup.frame_presented()
+                canvas.request_draw()
+                return
+            setup(result)
+
+        if profiler is not None:
+            profiler.begin_frame()
+        if timer is not None:
+            timer.begin_frame()
+        if governor is not None:
+            governor.begin_frame()
+
+        # la boucle continue tant que la simulation ou la relecture avance ;
+        # sinon elle s'arrête (les entrées redemandent une frame)
+        animating = not inputs.paused
+
+        if stepper is not None:
+            # Thread de simulation : dernier état publié (redraw demandé par le thread)
+            cloth_changed = stepper.acquire()
+            if stepper.published:
+                startup.sim_frame()
+            animating = False
+            if timer is not None:
+                timer.lap("step")
+        elif scene.batch is not None:
+            # Balayage : états finaux figés, rien à simuler
+            animating = False
+            cloth_changed = False
+        elif scene.playback is not None:
+            # Relecture : frame suivante de l'enregistrement, pas de simulation
+            if not inputs.paused:
+                scene.playback.advance()
+            cloth_changed = False  # frame relue : dans scene.view_key
+            if timer is not None:
+                timer.lap("step")
+        else:
+            # Pas fixe : 0..max_steps pas selon le temps réel écoulé
+            if inputs.paused:
+                scheduler.reset()
+                steps = 0
+            else:
+                steps = scheduler.advance()
+
+            for k in range(steps):
+                if k == steps - 1:
+                    interpolator.save_previous()
+                sim.step()
+                startup.sim_frame()
+                after_step()
+            if timer is not None:
+                timer.lap("step")
+
+            # positions interpolées + normales (seulement si l'état ou alpha a changé)
+            if inputs.paused:
+                cloth_changed = interpolator.update(1.0, settle=True)
+            else:
+                cloth_changed = interpolator.update(scheduler.alpha)
+        if timer is not None:
+            timer.lap("normals")
+
+        # Rien n'a changé (pause, caméra immobile, entrée sans effet visible) :
+        # pas de rendu ni de présentation, la fenêtre garde la dernière frame
+        view_key = (scene.view_key(sim), tuple(canvas.get_physical_size()),
+                    scaler.scale if scaler is not None else None)
+        if not (cloth_changed or scene.camera_dirty or view_key != last_view_key):
+            idle_frames += 1
+            # frame fermée sans échantillon (le gouverneur ne compte que les frames rendues)
+            if profiler is not None:
+                profiler.end_frame()
+            if timer is not None:
+                timer.skip_frame()
+            if animating:
+                canvas.request_draw()
+            return
+        last_view_key = view_key
+
         tex = context.get_current_texture()
         view = tex.create_view()
-        
-        if depth_tex is None or depth_size != (tex.width, tex.height):
+        if timer is not None:
+            timer.lap("acquire")
+
+        # avec render scale, le depth est celui de la cible réduite (RenderScale)
+        if scaler is None and (depth_tex is None or depth_size != (tex.width, tex.height)):
             depth_tex = device.create_texture(
                 size=(tex.width, tex.height, 1),
                 format=wgpu.TextureFormat.depth24plus,
@@ -53,8 +304,55 @@ def run_app():
             )
             depth_view = depth_tex.create_view()
             depth_size = (tex.width, tex.height)
-        
-        scene.draw(device, view, depth_view, sim)
-        canvas.request_draw()
+            scene.set_viewport(tex.width, tex.height)
+        if timer is not None:
+            timer.lap("depth")
+
+        if scaler is not None:
+            # résolution interne réduite + remise à l'échelle dans la swapchain
+            scaler.draw(scene, device, view, (tex.width, tex.height), sim)
+        else:
+            scene.draw(device, view, depth_view, sim)
+        startup.frame_presented()
+
+        if profiler is not None:
+            profiler.end_frame()
+            if profile:
+                profiler.maybe_report()
+        if scaler is not None and scaler.dynamic and scaler.observe(profiler):
+            # la frame suivante est rendue à la nouvelle résolution
+            animating = True
+        if timer is not None:
+            timer.end_frame()
+        if governor is not None:
+            governor.end_frame()
+
+        if animating:
+            canvas.request_draw()
 
     loop.run()
+
+    if idle_frames:
+        print(f"💤 {idle_frames} frames sautées (image inchangée)")
+
+    if stepper is not None:
+        stepper.stop()
+        print(f"🧵 {stepper.steps} pas simulés, {stepper.published} états publiés")
+
+    if scaler is not None:
+        print(scaler.report())
+    if governor is not None:
+        governor.close()
+        print(governor.report())
+        if governor_log:
+            print(f"🎛️  Décisions -> {governor_log}")
+
+    if recorder is not None:
+        recorder.close()
+        print(f"⏹️  {recorder.frames} frames enregistrées")
+
+    if timer is not None:
+        print(timer.report())
+        if frame_stats:
+            timer.export_json(frame_stats)
+            print(f"🕒 Temps CPU -> {frame_stats}")
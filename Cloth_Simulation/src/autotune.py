@@ -0,0 +1,169 @@
+import json
+import math
+import os
+import re
+import statistics
+import time
+
+from src.gpu_utils import wait_gpu_idle
+
+"""
+Autotune des tailles de workgroup des kernels compute.
+
+Pour chaque kernel (springs, strain, collision, normals), on mesure sur
+l'adapter courant les tailles candidates : 1D (x, 1) sur les sommets et,
+pour les kernels sur grille, tuiles 2D (x, y). Les meilleures tailles sont
+écrites dans autotune/<adapter>.json, par résolution "WxH" :
+
+    {"adapter": "...", "grids": {"64x64": {"springs": [16, 8], "normals_area": [8, 8], ...}}}
+
+Le kernel normales est rangé par mode ("normals_grid", "normals_area",
+"normals_csr") : tuile partagée pour area, 1D seulement pour csr, un
+gagnant ne vaut que pour le mode mesuré.
+
+ClothSimulation(workgroup_size=None) relit ce fichier au démarrage
+(résolution exacte, sinon la plus proche en nombre de sommets).
+"""
+
+TUNE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "autotune")
+
+CANDIDATES_1D = (32, 64, 128, 256)
+CANDIDATES_2D = ((8, 4), (8, 8), (16, 4), (16, 8), (16, 16), (32, 4), (32, 8))
+
+
+def adapter_key(device) -> str:
+    """Nom de fichier stable pour l'adapter (device + backend)."""
+    info = device.adapter.info
+    name = f"{info.get('device', '')}_{info.get('backend_type', '')}"
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower() or "unknown"
+
+
+def tuning_path(device) -> str:
+    return os.path.join(TUNE_DIR, adapter_key(device) + ".json")
+
+
+def _read(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _stored_name(name: str, normals_mode: str) -> str:
+    return f"normals_{normals_mode}" if name == "normals" else name
+
+
+def load_tuning(device, W: int, H: int, normals_mode: str = "grid") -> dict:
+    """{kernel: (x, y)} pour cette résolution et ce mode de normales ({} si pas d'autotune)."""
+    grids = _read(tuning_path(device)).get("grids", {})
+    if not grids:
+        return {}
+
+    key = f"{W}x{H}"
+    if key not in grids:
+        # résolution la plus proche (en log du nombre de sommets)
+        def distance(k):
+            w, h = (int(v) for v in k.split("x"))
+            return abs(math.log((w * h) / (W * H)))
+        key = min(grids, key=distance)
+
+    normals = _stored_name("normals", normals_mode)
+    tiles = {}
+    for name, tile in grids[key].items():
+        if name == normals:
+            tiles["normals"] = tuple(tile)
+        elif not name.startswith("normals"):  # autres modes (et ancienne clé sans mode)
+            tiles[name] = tuple(tile)
+    return tiles
+
+
+def save_tuning(device, W: int, H: int, tiles: dict, normals_mode: str = "grid") -> str:
+    """Fusionne les gagnants dans autotune/<adapter>.json (les autres modes de normales sont gardés)."""
+    path = tuning_path(device)
+    data = _read(path)
+    data["adapter"] = device.adapter.info.get("device", "")
+    data.setdefault("grids", {}).setdefault(f"{W}x{H}", {}).update(
+        {_stored_name(name, normals_mode): list(tile) for name, tile in tiles.items()}
+    )
+
+    os.makedirs(TUNE_DIR, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    return path
+
+
+def candidates(device, sim, name: str) -> list:
+    """Tailles (x, y) valides pour ce kernel sur cet adapter."""
+    limits = device.limits
+    max_inv = limits["max-compute-invocations-per-workgroup"]
+    max_x = limits["max-compute-workgroup-size-x"]
+    max_y = limits["max-compute-workgroup-size-y"]
+
+    tiles = [(x, 1) for x in CANDIDATES_1D]
+    if name in sim.tiled_kernels:
+        # une tuile plus grande que la grille ne fait que des threads vides
+        tiles += [(x, y) for x, y in CANDIDATES_2D if x <= 2 * sim.W and y <= 2 * sim.H]
+    return [(x, y) for x, y in tiles if x * y <= max_inv and x <= max_x and y <= max_y]
+
+
+def time_kernel(sim, name: str, repeat: int = 20, trials: int = 5) -> float:
+    """
+    Médiane (ms) d'un dispatch du kernel, `repeat` dispatches par soumission.
+    Les uniforms doivent être écrits (sim.write_params()).
+    """
+    device = sim.device
+    bind_groups = {
+        "springs": sim.bg_springs,
+        "strain": sim.bg_strain,
+        "collision": sim.bg_collision,
+        "normals": sim.bg_normals,
+    }[name]
+
+    def run():
+        enc = device.create_command_encoder()
+        cp = enc.begin_compute_pass()
+        cp.set_pipeline(sim.pipelines[name])
+        for k in range(repeat):
+            cp.set_bind_group(0, bind_groups[k % 2])
+            cp.dispatch_workgroups(*sim.dispatch[name])
+        cp.end()
+        device.queue.submit([enc.finish()])
+        wait_gpu_idle(device)
+
+    run()  # warmup
+    times = []
+    for _ in range(trials):
+        t0 = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - t0) * 1e3 / repeat)
+    return statistics.median(times)
+
+
+def autotune(sim, kernels=None, repeat: int = 20, trials: int = 5, log=print) -> dict:
+    """
+    Mesure chaque kernel de `sim` sur ses tailles candidates et applique la
+    meilleure. Retourne {kernel: {"best": (x, y), "ms": {"x×y": ms}}}.
+    """
+    results = {}
+    for name in kernels or sim.KERNELS:
+        timings = {}
+        for tile in candidates(sim.device, sim, name):
+            sim.set_kernel_tile(name, tile)
+            # état initial et vrais uniforms (écrits sinon par step()) : un
+            # état fini et identique pour chaque candidat
+            sim.reset()
+            sim.write_params()
+            timings[tile] = time_kernel(sim, name, repeat, trials)
+
+        best = min(timings, key=timings.get)
+        sim.set_kernel_tile(name, best)
+        results[name] = {"best": best, "ms": {f"{x}x{y}": ms for (x, y), ms in timings.items()}}
+
+        if log is not None:
+            worst = max(timings.values())
+            log(f"  {name:10s} {best[0]:3d}x{best[1]:<3d} {timings[best]:8.4f} ms/dispatch "
+                f"(pire {worst:8.4f} ms, {len(timings)} candidats)")
+
+    sim.reset()
+    return results
@@ -0,0 +1,112 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+"""
+Sauvegarde / restauration de l'état complet de la simulation.
+
+Format binaire versionné (little-endian) :
+- en-tête fixe : magic, version, W, H, N, ping, taille JSON, offset données
+- paramètres physiques en JSON (utf-8)
+- padding jusqu'à une frontière de page
+- positions (N,4) float32 puis vitesses (N,4) float32
+
+Les données sont alignées sur une page : au chargement, le fichier est
+mappé en mémoire et les vues sont passées directement à write_buffer
+(pas de copie intermédiaire côté Python).
+"""
+
+MAGIC = b"CLST"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sIIIIIQQ")
+_ALIGN = 4096
+
+
+def _align(n: int, a: int = _ALIGN) -> int:
+    return (n + a - 1) // a * a
+
+
+def save_state(sim, path: str):
+    """Écrit positions, vitesses, ping et paramètres de `sim` dans `path`."""
+    params = {name: getattr(sim, name) for name in sim.PARAM_NAMES}
+    params_bytes = json.dumps(params).encode("utf-8")
+
+    data_offset = _align(_HEADER.size + len(params_bytes))
+    header = _HEADER.pack(
+        MAGIC, VERSION,
+        sim.W, sim.H, sim.N, int(sim.ping),
+        len(params_bytes), data_offset,
+    )
+
+    q = sim.device.queue
+    pos = q.read_buffer(sim.current_pos_buffer)
+    vel = q.read_buffer(sim.current_vel_buffer)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(params_bytes)
+        f.write(b"\0" * (data_offset - _HEADER.size - len(params_bytes)))
+        f.write(pos)
+        f.write(vel)
+
+
+def read_header(path: str):
+    """Lit l'en-tête et les paramètres sans toucher aux données."""
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            raise ValueError(f"{path}: fichier trop court pour un checkpoint")
+
+        magic, version, W, H, N, ping, params_len, data_offset = _HEADER.unpack(head)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: pas un checkpoint de simulation")
+        if version != VERSION:
+            raise ValueError(f"{path}: version {version} non supportée (attendu {VERSION})")
+
+        if N != W * H:
+            raise ValueError(f"{path}: N={N} incohérent avec la grille {W}x{H}")
+        size = os.fstat(f.fileno()).st_size
+        if size < data_offset + 2 * N * 16:
+            raise ValueError(
+                f"{path}: checkpoint tronqué ({size} octets, attendu {data_offset + 2 * N * 16})"
+            )
+
+        params = json.loads(f.read(params_len).decode("utf-8"))
+
+    return {
+        "W": W, "H": H, "N": N,
+        "ping": bool(ping),
+        "params": params,
+        "data_offset": data_offset,
+    }
+
+
+def load_state(sim, path: str):
+    """Recharge un checkpoint dans `sim` (même taille de grille requise)."""
+    info = read_header(path)
+    if (info["W"], info["H"]) != (sim.W, sim.H):
+        raise ValueError(
+            f"{path}: grille {info['W']}x{info['H']} != simulation {sim.W}x{sim.H}"
+        )
+
+    geometry = [getattr(sim, name) for name in sim.GEOMETRY_PARAMS]
+    for name, value in info["params"].items():
+        if name in sim.PARAM_NAMES:
+            setattr(sim, name, value)
+    # état initial (reset, timeline) cohérent avec la géométrie rechargée
+    if [getattr(sim, name) for name in sim.GEOMETRY_PARAMS] != geometry:
+        sim.rebuild_initial_state(reset=False)
+
+    nbytes = sim.N * 16
+    off = info["data_offset"]
+    mm = np.memmap(path, dtype=np.uint8, mode="r", offset=off, shape=(2 * nbytes,))
+
+    # ping d'abord : current_*_buffer pointe alors vers les bons buffers
+    sim.ping = info["ping"]
+    q = sim.device.queue
+    q.write_buffer(sim.current_pos_buffer, 0, mm[:nbytes])
+    q.write_buffer(sim.current_vel_buffer, 0, mm[nbytes:])
+    del mm
@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import wgpu
+
+"""
+Lot de B tissus W x H (résultats d'un balayage de paramètres) affichés côte
+à côte en un seul draw instancié par renderer.
+
+- pos_buf / normal_buf : un seul gros buffer par attribut, tissu b aux
+  sommets [b*N, (b+1)*N) (copies GPU -> GPU depuis une simulation)
+- instance_buf : décalage monde (xyz) de chaque tissu, grille de `columns`
+  colonnes dans le plan XZ, centrée sur l'origine
+- sphere_buf : collider de chaque tissu (cx, cy, cz, r), déjà décalé
+  (dessiné par SphereImpostorRenderer, une instance par tissu)
+"""
+
+
+class ClothBatch:
+    def __init__(self, device, W: int, H: int, count: int, spacing: float, columns: int = None):
+        self.device = device
+        self.W, self.H = int(W), int(H)
+        self.N = self.W * self.H
+        self.count = int(count)
+        self.spacing = float(spacing)
+        self.columns = int(columns or math.ceil(math.sqrt(self.count)))
+        self.rows = math.ceil(self.count / self.columns)
+
+        self.slot_bytes = self.N * 16
+        usage = wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST
+        self.pos_buf = device.create_buffer(size=self.count * self.slot_bytes, usage=usage)
+        self.normal_buf = device.create_buffer(size=self.count * self.slot_bytes, usage=usage)
+
+        # décalages : colonne -> x, ligne -> z
+        b = np.arange(self.count)
+        self.offsets = np.zeros((self.count, 4), dtype=np.float32)
+        self.offsets[:, 0] = (b % self.columns - (self.columns - 1) / 2) * self.spacing
+        self.offsets[:, 2] = (b // self.columns - (self.rows - 1) / 2) * self.spacing
+        self.instance_buf = device.create_buffer_with_data(
+            data=self.offsets.tobytes(),
+            usage=wgpu.BufferUsage.STORAGE,
+        )
+
+        self.spheres = np.zeros((self.count, 4), dtype=np.float32)
+        self.sphere_buf = device.create_buffer(
+            size=self.count * 16,
+            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST,
+        )
+
+        self.labels = [None] * self.count
+
+    @property
+    def current_pos_buffer(self):
+        return self.pos_buf
+
+    @property
+    def extent(self) -> float:
+        """Largeur de la grille de tissus (m), pour cadrer la caméra."""
+        return max(self.columns, self.rows) * self.spacing
+
+    def capture(self, b: int, sim, label=None):
+        """Copie l'état courant de `sim` (positions, normales, sphère) dans le tissu b."""
+        if (sim.W, sim.H) != (self.W, self.H):
+            raise ValueError(f"grille {sim.W}x{sim.H} != lot {self.W}x{self.H}")
+        sim.compute_normals()
+
+        offset = b * self.slot_bytes
+        enc = self.device.create_command_encoder()
+        enc.copy_buffer_to_buffer(sim.current_pos_buffer, 0, self.pos_buf, offset, self.slot_bytes)
+        enc.copy_buffer_to_buffer(sim.normal_buf, 0, self.normal_buf, offset, self.slot_bytes)
+        self.device.queue.submit([enc.finish()])
+
+        self.spheres[b, :3] = np.array([sim.sphere_cx, sim.sphere_cy, sim.sphere_cz]) + self.offsets[b, :3]
+        self.spheres[b, 3] = sim.SPHERE_R
+        self.device.queue.write_buffer(self.sphere_buf, b * 16, self.spheres[b])
+        self.labels[b] = label
@@ -88,6 +88,24 @@ def make_grid_indices(W: int, H: int) -> np.ndarray:
     return np.array(indices, dtype=np.uint32)
 
 
+def make_vertex_triangle_csr(triangles: np.ndarray, n_vertices: int):
+    """
+    Adjacence sommet -> triangles au format CSR (maillage quelconque).
+    - triangles : (T, 3) indices
+    Retourne (offsets (N+1,), tri_ids) uint32 : les triangles du sommet i sont
+    tri_ids[offsets[i]:offsets[i + 1]].
+    """
+    tris = np.asarray(triangles, dtype=np.uint32).reshape(-1, 3)
+    verts = tris.reshape(-1)
+    ids = np.repeat(np.arange(tris.shape[0], dtype=np.uint32), 3)
+
+    order = np.argsort(verts, kind="stable")
+    counts = np.bincount(verts, minlength=n_vertices)
+    offsets = np.zeros(n_vertices + 1, dtype=np.uint32)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets, ids[order]
+
+
 def make_grid_line_indices(W: int, H: int, diagonals: bool = False) -> np.ndarray:
     """
     Index buffer pour affichage wireframe (lines).
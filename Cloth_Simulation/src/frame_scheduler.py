@@ -0,0 +1,56 @@
+import time
+
+"""
+Pas de temps fixe pour la simulation, indépendant de la cadence d'affichage.
+
+Accumulateur classique : chaque frame ajoute le temps réel écoulé, la
+simulation avance d'autant de pas `dt` que l'accumulateur en contient. Sous
+charge, au plus `max_steps` pas par frame : le retard au-delà est abandonné
+(la simulation ralentit au lieu de s'effondrer en rattrapage). Le reste de
+l'accumulateur donne `alpha` dans [0, 1[ pour interpoler l'affichage entre
+les deux derniers états.
+"""
+
+
+class FrameScheduler:
+    def __init__(self, dt: float, max_steps: int = 4, clock=time.perf_counter):
+        self.dt = float(dt)
+        self.max_steps = max(1, int(max_steps))
+        self.clock = clock
+
+        self.accumulator = 0.0
+        self._last = None
+
+        # statistiques
+        self.steps = 0
+        self.dropped = 0
+
+    def reset(self):
+        """Repart de zéro (pause, inactivité) : pas de rattrapage du temps écoulé."""
+        self.accumulator = 0.0
+        self._last = None
+
+    def advance(self) -> int:
+        """Nombre de pas de simulation à faire pour cette frame."""
+        now = self.clock()
+        if self._last is None:
+            self.accumulator = self.dt  # (re)démarrage : un pas tout de suite
+        else:
+            self.accumulator += now - self._last
+        self._last = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.dt
+        else:
+            self.accumulator -= steps * self.dt
+
+        self.steps += steps
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Position de l'affichage entre l'avant-dernier (0) et le dernier état (1)."""
+        return min(self.accumulator / self.dt, 1.0)
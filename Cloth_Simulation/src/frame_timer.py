@@ -0,0 +1,133 @@
+import cProfile
+import json
+import pstats
+import time
+
+import numpy as np
+
+"""
+Instrumentation CPU de la boucle draw.
+
+- lap(phase) attribue le temps écoulé depuis le lap précédent à `phase`
+  (perf_counter_ns), les phases sont fixées à la construction
+- les échantillons vont dans un anneau numpy préalloué (capacity x phases) :
+  pas d'allocation de tableau par frame
+- stats() : p50 / p95 / p99 par phase, histograms() : histogrammes
+- profile_frames(n) : capture cProfile sur les n frames suivantes (.prof,
+  lisible par snakeviz / flameprof pour un flamegraph)
+"""
+
+# Phases de app.draw() + Scene.draw()
+DRAW_PHASES = (
+    "step",
+    "normals",
+    "acquire",
+    "depth",
+    "scene_setup",
+    "encode",
+    "submit",
+)
+
+
+class FrameTimer:
+    def __init__(self, phases=DRAW_PHASES, capacity: int = 2048):
+        self.phases = tuple(phases) + ("frame",)
+        self.index = {name: i for i, name in enumerate(self.phases)}
+        self._frame_col = len(self.phases) - 1
+
+        self.capacity = int(capacity)
+        self.samples = np.zeros((self.capacity, len(self.phases)), dtype=np.int64)
+
+        self.count = 0      # frames enregistrées (bornées par capacity)
+        self._row = 0
+        self._t_frame = 0
+        self._t = 0
+
+        self._profiler = None
+        self._profile_left = 0
+        self._profile_path = None
+
+    # MESURE
+    def begin_frame(self):
+        t = time.perf_counter_ns()
+        self._t_frame = t
+        self._t = t
+        self.samples[self._row] = 0
+
+        if self._profiler is None and self._profile_left > 0:
+            self._profiler = cProfile.Profile()
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def lap(self, phase: str):
+        t = time.perf_counter_ns()
+        self.samples[self._row, self.index[phase]] += t - self._t
+        self._t = t
+
+    def skip_frame(self):
+        """Frame abandonnée (rien rendu) : échantillon ignoré, cProfile suspendu jusqu'au prochain begin_frame."""
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    def end_frame(self):
+        self.samples[self._row, self._frame_col] = time.perf_counter_ns() - self._t_frame
+        self._row = (self._row + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+        if self._profiler is not None:
+            self._profile_left -= 1
+            if self._profile_left <= 0:
+                self._finish_profile()
+
+    # cPROFILE
+    def profile_frames(self, n: int, path: str = "frames.prof"):
+        """Active cProfile pour les n frames suivantes, puis écrit `path`."""
+        self._profile_left = int(n)
+        self._profile_path = path
+
+    def _finish_profile(self):
+        self._profiler.disable()
+        self._profiler.dump_stats(self._profile_path)
+        print(f"🔥 cProfile -> {self._profile_path}")
+        pstats.Stats(self._profiler).sort_stats("cumulative").print_stats(15)
+        self._profiler = None
+
+    # RÉSULTATS
+    def _valid(self) -> np.ndarray:
+        return self.samples[:self.count] if self.count < self.capacity else self.samples
+
+    def stats(self) -> dict:
+        """{phase: {mean, p50, p95, p99}} en ms sur les frames de l'anneau."""
+        data = self._valid() * 1e-6
+        out = {}
+        for name, i in self.index.items():
+            col = data[:, i]
+            if col.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(col, [50, 95, 99])
+            out[name] = {
+                "mean_ms": float(col.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+            }
+        return out
+
+    def histograms(self, bins: int = 32) -> dict:
+        """{phase: (counts, bords en ms)}."""
+        data = self._valid() * 1e-6
+        return {name: np.histogram(data[:, i], bins=bins) for name, i in self.index.items()}
+
+    def report(self) -> str:
+        lines = [f"🕒 CPU par phase ({self.count} frames) :        p50      p95      p99 (ms)"]
+        for name, st in self.stats().items():
+            lines.append(f"  {name:20s} {st['p50_ms']:8.3f} {st['p95_ms']:8.3f} {st['p99_ms']:8.3f}")
+        return "\n".join(lines)
+
+    def export_json(self, path: str, bins: int = 32):
+        hist = {
+            name: {"counts": counts.tolist(), "edges_ms": edges.tolist()}
+            for name, (counts, edges) in self.histograms(bins).items()
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"frames": self.count, "stats": self.stats(), "histograms": hist}, f, indent=2)
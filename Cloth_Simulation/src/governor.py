@@ -0,0 +1,203 @@
+import json
+import math
+import time
+
+import numpy as np
+
+from src.render_scale import RENDER_PASSES, STEP
+
+"""
+Gouverneur de budget de frame : tient un temps par frame cible (target_ms)
+en ajustant, dans des bornes, la qualité de la simulation et du rendu.
+
+Leviers :
+- substeps : sim.SUBSTEPS (min_substeps .. valeur initiale)
+- normals_every : normales recalculées une frame sur N (FrameInterpolator /
+  SimulationThread, 1 .. max_normals_every)
+- scale : résolution de rendu interne (RenderScale, min_scale .. 1)
+
+Mesures par frame : temps CPU de draw() (begin_frame / end_frame) et temps
+GPU par passe du profileur (dernière frame livrée). Tous les `window`
+échantillons, coût = max(CPU, GPU) moyens (les deux se recouvrent) :
+- au-delà de HIGH x cible : on dégrade le levier dont la part du coût est
+  la plus grande (passes GPU "render" / "normals" / simulation, ou les
+  substeps si le CPU domine : un pas encode 3 passes par substep)
+- en deçà de LOW x cible : on restaure, la physique d'abord (substeps),
+  puis les normales, puis la résolution
+La fenêtre repart de zéro après chaque décision. Chaque décision est écrite
+en JSON (une ligne) dans `log_path` pour analyse.
+"""
+
+HIGH = 1.05
+LOW = 0.70
+
+# Passes GPU -> levier qui les fait baisser (rendu : RENDER_PASSES -> scale)
+_NORMALS_PASSES = ("normals", "interpolate")
+
+
+class FrameGovernor:
+    def __init__(self, target_ms: float, sim, scaler=None, normals=(), profiler=None,
+                 min_substeps: int = 10, max_normals_every: int = 4, min_scale: float = 0.5,
+                 window: int = 30, log_path=None):
+        self.target_ms = float(target_ms)
+        self.sim = sim
+        self.scaler = scaler              # RenderScale (None : pas de levier résolution)
+        self.normals = list(normals)      # objets ayant un attribut normals_every
+        self.profiler = profiler
+        self.window = int(window)
+
+        self.max_substeps = int(sim.SUBSTEPS)
+        self.min_substeps = min(int(min_substeps), self.max_substeps)
+        self.max_normals_every = int(max_normals_every)
+        self.min_scale = float(min_scale)
+        if scaler is not None:
+            scaler.min_scale = min(scaler.min_scale, self.min_scale)
+
+        self.frames = 0
+        self.decisions = 0
+        self._cpu = []
+        self._gpu = {}            # nom de passe -> ms cumulées sur la fenêtre
+        self._gpu_frames = 0
+        self._seen = 0            # GpuProfiler.frames à la dernière lecture
+        self._t = 0.0
+
+        self._log = open(log_path, "a", encoding="utf-8") if log_path else None
+
+    # LEVIERS
+    @property
+    def substeps(self) -> int:
+        return self.sim.SUBSTEPS
+
+    @property
+    def normals_every(self) -> int:
+        return self.normals[0].normals_every if self.normals else 1
+
+    @property
+    def scale(self) -> float:
+        return self.scaler.scale if self.scaler is not None else 1.0
+
+    def _set_substeps(self, n: int) -> bool:
+        n = min(self.max_substeps, max(self.min_substeps, int(n)))
+        if n == self.sim.SUBSTEPS:
+            return False
+        with self.sim.lock:  # pas de changement au milieu d'un step (thread de simulation)
+            self.sim.SUBSTEPS = n
+        return True
+
+    def _set_normals_every(self, n: int) -> bool:
+        n = min(self.max_normals_every, max(1, int(n)))
+        if not self.normals or n == self.normals_every:
+            return False
+        for target in self.normals:
+            target.normals_every = n
+        return True
+
+    def _set_scale(self, s: float) -> bool:
+        if self.scaler is None:
+            return False
+        return self.scaler.set_scale(max(self.min_scale, s))
+
+    def _degrade(self, knob: str, cost: float) -> bool:
+        if knob == "substeps":
+            n = self.substeps
+            return self._set_substeps(min(n - 1, round(n * 0.8)))
+        if knob == "normals_every":
+            return self._set_normals_every(self.normals_every * 2)
+        # coût du rendu ~ scale² : saut vers la cible, au moins un palier
+        s = self.scale
+        return self._set_scale(min(s - STEP, s * math.sqrt(self.target_ms / cost)))
+
+    def _restore(self, knob: str, cost: float) -> bool:
+        if knob == "substeps":
+            n = self.substeps
+            return self._set_substeps(max(n + 1, round(n * 1.25)))
+        if knob == "normals_every":
+            return self._set_normals_every(self.normals_every // 2)
+        return self._set_scale(self.scale + STEP)
+
+    # MESURE
+    def begin_frame(self):
+        self._t = time.perf_counter()
+
+    def end_frame(self):
+        """Fin de draw() : échantillons CPU / GPU, décision toutes les `window` frames."""
+        self._cpu.append((time.perf_counter() - self._t) * 1e3)
+        self.frames += 1
+
+        p = self.profiler
+        if p is not None and p.frames != self._seen:
+            self._seen = p.frames
+            for name, ms in p.last_frame.items():
+                self._gpu[name] = self._gpu.get(name, 0.0) + ms
+            self._gpu_frames += 1
+
+        if len(self._cpu) >= self.window:
+            self._decide()
+            self._cpu.clear()
+            self._gpu.clear()
+            self._gpu_frames = 0
+
+    def _decide(self):
+        cpu_ms = float(np.mean(self._cpu))
+        n = max(self._gpu_frames, 1)
+        passes = {name: ms / n for name, ms in self._gpu.items()}
+        gpu_ms = sum(passes.values())
+        cost = max(cpu_ms, gpu_ms)
+
+        if cost > HIGH * self.target_ms:
+            action = "degrade"
+            if cpu_ms >= gpu_ms:
+                order = ["substeps", "normals_every", "scale"]
+            else:
+                render = sum(passes.get(k, 0.0) for k in RENDER_PASSES)
+                normals = sum(passes.get(k, 0.0) for k in _NORMALS_PASSES)
+                shares = {"scale": render, "normals_every": normals, "substeps": gpu_ms - render - normals}
+                order = sorted(shares, key=lambda k: -shares[k])
+            apply = self._degrade
+        elif cost < LOW * self.target_ms:
+            action = "restore"
+            order = ["substeps", "normals_every", "scale"]
+            apply = self._restore
+        else:
+            return
+
+        before = self._settings()
+        for knob in order:
+            if apply(knob, cost):
+                self.decisions += 1
+                self._record(action, knob, before, cpu_ms, gpu_ms, passes)
+                return
+
+    def _settings(self) -> dict:
+        return {"substeps": self.substeps, "normals_every": self.normals_every, "scale": self.scale}
+
+    def _record(self, action, knob, before, cpu_ms, gpu_ms, passes):
+        after = self._settings()
+        print(f"🎛️  {action} {knob} : {before[knob]} -> {after[knob]} "
+              f"(CPU {cpu_ms:.1f} ms, GPU {gpu_ms:.1f} ms, cible {self.target_ms:.1f} ms)")
+        if self._log is not None:
+            self._log.write(json.dumps({
+                "t": time.time(),
+                "frame": self.frames,
+                "action": action,
+                "knob": knob,
+                "from": before[knob],
+                "to": after[knob],
+                "cpu_ms": round(cpu_ms, 3),
+                "gpu_ms": round(gpu_ms, 3),
+                "gpu_passes": {k: round(v, 3) for k, v in passes.items()},
+                "target_ms": self.target_ms,
+                "settings": after,
+            }) + "\n")
+            self._log.flush()
+
+    # RÉSULTATS
+    def report(self) -> str:
+        s = self._settings()
+        return (f"🎛️  Gouverneur ({self.target_ms:.1f} ms) : {self.decisions} décisions, "
+                f"substeps {s['substeps']}, normales 1/{s['normals_every']}, scale {s['scale']:.3f}")
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -1,6 +1,43 @@
+from collections import deque
+
 import numpy as np
 import wgpu
 
+def get_device(features=()) -> wgpu.GPUDevice:
+    """
+    Device sur l'adapter haute performance, avec les `features` demandées
+    quand l'adapter les supporte (les autres sont ignorées).
+    """
+    adapter = wgpu.gpu.request_adapter_sync(power_preference="high-performance")
+    wanted = [f for f in features if f in adapter.features]
+    return adapter.request_device_sync(required_features=wanted)
+
+def get_headless_device(software: bool = True) -> wgpu.GPUDevice:
+    """
+    Device sans fenêtre. Si `software`, demande l'adapter de repli (CPU :
+    llvmpipe / WARP / SwiftShader) et sinon prend n'importe quel adapter.
+    """
+    adapter = None
+    if software:
+        adapter = wgpu.gpu.request_adapter_sync(force_fallback_adapter=True)
+    if adapter is None:
+        adapter = wgpu.gpu.request_adapter_sync(power_preference="high-performance")
+    return adapter.request_device_sync()
+
+def wait_gpu_idle(device: wgpu.GPUDevice):
+    """
+    Attend que tout le travail déjà soumis soit terminé (pour les mesures de temps).
+    Un petit buffer est effacé puis mappé : la file GPU étant ordonnée,
+    le map ne se résout qu'après les soumissions précédentes.
+    """
+    buf = device.create_buffer(size=4, usage=wgpu.BufferUsage.MAP_READ | wgpu.BufferUsage.COPY_DST)
+    enc = device.create_command_encoder()
+    enc.clear_buffer(buf)
+    device.queue.submit([enc.finish()])
+    buf.map_sync(wgpu.MapMode.READ)
+    buf.unmap()
+    buf.destroy()
+
 def read_text(path: str) -> str:
     """Lit un fichier texte (shader WGSL)."""
     with open(path, "r", encoding="utf-8") as f:
@@ -39,3 +76,52 @@ def create_index_buffer(device: wgpu.GPUDevice, indices: np.ndarray):
     buf = device.create_buffer_with_data(data=indices, usage=usage)
     return buf
 
+
+class StagingRing:
+    """
+    Anneau de buffers MAP_READ pour relire le GPU sans bloquer la frame.
+
+    Utilisation par frame :
+        buf = ring.begin()                 # buffer libre
+        enc.copy_buffer_to_buffer(src, 0, buf, 0, size)
+        device.queue.submit([enc.finish()])
+        ring.end(buf, tag)                 # lance map_async
+
+    Un buffer n'est relu que lorsque l'anneau est plein (count frames plus tard),
+    le GPU a alors terminé et l'attente est quasi nulle. `on_ready(tag, data)`
+    reçoit une copie des octets.
+    """
+
+    def __init__(self, device: wgpu.GPUDevice, size: int, on_ready, count: int = 3):
+        self.size = int(size)
+        self.on_ready = on_ready
+        self._free = [
+            device.create_buffer(
+                size=self.size,
+                usage=wgpu.BufferUsage.MAP_READ | wgpu.BufferUsage.COPY_DST,
+            )
+            for _ in range(count)
+        ]
+        self._in_flight = deque()
+
+    def begin(self):
+        if not self._free:
+            self._deliver_oldest()
+        return self._free.pop()
+
+    def end(self, buf, tag=None):
+        promise = buf.map_async(wgpu.MapMode.READ)
+        self._in_flight.append((buf, promise, tag))
+
+    def flush(self):
+        """Attend et livre toutes les relectures en cours."""
+        while self._in_flight:
+            self._deliver_oldest()
+
+    def _deliver_oldest(self):
+        buf, promise, tag = self._in_flight.popleft()
+        promise.sync_wait()
+        data = buf.read_mapped(copy=True)
+        buf.unmap()
+        self._free.append(buf)
+        self.on_ready(tag, data)
@@ -0,0 +1,62 @@
+import time
+
+from src.gpu_utils import get_headless_device
+from src.offscreen import FrameCapture, OffscreenTarget
+from src.recording import TrajectoryPlayer
+from src.render_scale import RenderScale
+from src.scene import Scene
+from src.simulation import ClothSimulation
+
+"""
+Rendu sans fenêtre : simulation (ou relecture) rendue dans une OffscreenTarget
+et capturée sur disque, une frame par pas de simulation (vidéo à 1 / DT
+images/s). Aucun canvas ni swapchain : tourne sur l'adapter logiciel
+(llvmpipe / WARP) d'une machine sans écran.
+
+    python main.py --headless 240 --out frames/           # PNG
+    python main.py --headless 240 --out run.rgba --capture raw --size 1280x720
+"""
+
+
+def run_headless(frames: int, out: str, size=(900, 700), mode: str = "png", software: bool = True,
+                 W: int = 22, H: int = 22, playback=None, vertex_normals=False, normals_mode="grid",
+                 procedural_grid=False, sphere_impostors=False, render_scale=1.0, sharpen=0.0):
+    """
+    - frames : nb de frames rendues
+    - out : dossier (mode "png") ou fichier (mode "raw")
+    - playback : enregistrement relu au lieu de simuler
+    - render_scale / sharpen : résolution interne et remise à l'échelle (voir RenderScale)
+    Retourne le nb de frames écrites.
+    """
+    device = get_headless_device(software=software)
+    print(f"🖥️  Sans fenêtre : {device.adapter.info.get('device', '')}, {size[0]}x{size[1]}")
+
+    target = OffscreenTarget(device, size)
+    sim = ClothSimulation(device, W, H, normals_mode=normals_mode)
+    scene = Scene(target.format, device, W, H, vertex_normals, procedural_grid, sphere_impostors)
+    scene.set_viewport(*target.size)
+    if playback:
+        scene.playback = TrajectoryPlayer(device, playback, grid=(scene.W, scene.H))
+    scaler = None
+    if render_scale != 1.0 or sharpen > 0.0:
+        scaler = RenderScale(target.format, device, render_scale, sharpen)
+
+    capture = FrameCapture(target, out, mode)
+    t0 = time.perf_counter()
+    for _ in range(int(frames)):
+        if scene.playback is not None:
+            scene.playback.advance()
+        else:
+            sim.step()
+            if not vertex_normals:
+                sim.compute_normals()
+        if scaler is not None:
+            scaler.draw(scene, device, target.color_view, target.size, sim)
+        else:
+            scene.draw(device, target.color_view, target.depth_view, sim)
+        capture.capture()
+    capture.close()
+
+    elapsed = time.perf_counter() - t0
+    print(f"🎞️  {capture.frames} frames -> {out} en {elapsed:.1f} s ({capture.frames / elapsed:.1f} images/s)")
+    return capture.frames
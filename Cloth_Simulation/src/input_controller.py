@@ -5,10 +5,11 @@ Gestion des entrées utilisateur :
 """
 
 class InputController:
-    def __init__(self, canvas, simulation, camera_scene):
+    def __init__(self, canvas, simulation, camera_scene, timeline=None):
         self.canvas = canvas
         self.simulation = simulation
         self.scene = camera_scene
+        self.timeline = timeline  # GpuTimeline optionnelle (rewind)
 
         self.dragging = False
         self.last_x = None
@@ -60,7 +61,8 @@ class InputController:
             self.scene.PITCH_MAX,
         )
 
-        self.scene.update_mvp()
+        self.scene.invalidate_camera()
+        self._wake()
 
     def on_wheel(self, evt):
         dy = evt.get("dy", evt.get("delta_y", 0.0))
@@ -70,7 +72,8 @@ class InputController:
             self.scene.DIST_MIN,
             self.scene.DIST_MAX,
         )
-        self.scene.update_mvp()
+        self.scene.invalidate_camera()
+        self._wake()
 
     # CLAVIER
     def _hook_keyboard(self):
@@ -78,6 +81,10 @@ class InputController:
         # Événements clavier (RenderCanvas)
         self.canvas.add_event_handler(self.on_any_event, "key_down")
 
+    def _wake(self):
+        """Redessine : la boucle ne redemande pas de frame quand rien ne bouge."""
+        self.canvas.request_draw()
+
     def _clamp(self, v, a, b):
         return a if v < a else b if v > b else v
 
@@ -91,12 +98,17 @@ class InputController:
         if not key:
             return
 
+        # toute touche peut changer l'affichage (toggles, reset, rewind...)
+        self._wake()
+
         if key == "p":
             self.paused = not self.paused
             print("⏸️ Pause" if self.paused else "▶️ Resume")
 
         elif key == "r":
             self.simulation.reset()
+            if self.timeline is not None:
+                self.timeline.clear()
             self.paused = False
             print("🔁 Reset")
 
@@ -136,6 +148,19 @@ class InputController:
         elif key == "i":
             self._print_phys()
 
+        # Timeline : , / . = snapshot précédent / suivant (met en pause)
+        elif key in (",", ".") and self.timeline is not None:
+            if self.timeline.scrub(-1 if key == "," else 1):
+                self.paused = True
+                print(f"⏪ -{self.timeline.seconds_back:.2f} s")
+
+        # Relecture : J / L = -1 s / +1 s
+        elif key == "j" and self.scene.playback is not None:
+            self.scene.playback.seek(self.scene.playback.frame - 60)
+
+        elif key == "l" and self.scene.playback is not None:
+            self.scene.playback.seek(self.scene.playback.frame + 60)
+
 
 
     # AIDE
@@ -152,5 +177,9 @@ class InputController:
         print("\n🧪 Démo physique :")
         print("  [ / ] : MU - / + (glisse)")
         print("  - / = : |G| - / + (chute)")
-        print("  I : affiche MU, G\n")
+        print("  I : affiche MU, G")
+        print("\n⏪ Timeline (si activée) :")
+        print("  , / . : reculer / avancer (P pour repartir d'ici)")
+        print("\n⏯️  Relecture :")
+        print("  J / L : -1 s / +1 s\n")
 
@@ -0,0 +1,142 @@
+import numpy as np
+import wgpu
+
+from src.pipeline_cache import get_pipeline_cache
+
+"""
+Affichage interpolé entre les deux derniers états de la simulation (pas de
+temps fixe, voir frame_scheduler.py).
+
+- save_previous() : copie GPU -> GPU de l'état courant, juste avant le
+  dernier step de la frame
+- update(alpha) : positions affichées = mix(précédent, courant, alpha)
+  (kernel compute), puis normales de ces positions (sauf `normals=False`,
+  normales faites au rendu) ; rien n'est relancé si ni l'état ni alpha
+  n'ont changé
+- normals_every = N : normales recalculées une mise à jour sur N (les
+  autres gardent les précédentes), toujours avec settle=True (pause)
+
+Expose current_pos_buffer / normal_buf comme la simulation et le lecteur
+d'enregistrement : Scene le dessine tel quel.
+"""
+
+
+class FrameInterpolator:
+    def __init__(self, sim, normals: bool = True):
+        self.sim = sim
+        self.device = sim.device
+        self.normals = bool(normals)
+        d = self.device
+        nbytes = sim.N * 16
+
+        self.prev_buf = d.create_buffer(
+            size=nbytes,
+            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST,
+        )
+        # positions affichées (STORAGE + VERTEX), COPY_SRC pour les captures
+        self.pos_buf = d.create_buffer(
+            size=nbytes,
+            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_SRC,
+        )
+        self.params = d.create_buffer(
+            size=16,  # alpha, n
+            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
+        )
+        self._params_np = np.zeros(4, dtype=np.uint32)
+
+        cache = get_pipeline_cache(d)
+        bgl = cache.bind_group_layout([
+            {"binding": 0, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},
+            {"binding": 1, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},
+            {"binding": 2, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "storage"}},
+            {"binding": 3, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "uniform"}},
+        ])
+        wg = sim.WORKGROUP_SIZE
+        self.pipeline = cache.compute_pipeline(
+            cache.pipeline_layout([bgl]),
+            cache.shader_module_file("interpolate.wgsl"),
+            constants={"WG": wg, "GRID_W": sim.W, "GRID_H": sim.H},
+        )
+        self.dispatch = (sim.N + wg - 1) // wg
+
+        # état courant dans A ou dans B
+        self.bind_groups = [
+            d.create_bind_group(layout=bgl, entries=[
+                {"binding": 0, "resource": {"buffer": self.prev_buf}},
+                {"binding": 1, "resource": {"buffer": cur}},
+                {"binding": 2, "resource": {"buffer": self.pos_buf}},
+                {"binding": 3, "resource": {"buffer": self.params}},
+            ])
+            for cur in (sim.pos_a, sim.pos_b)
+        ]
+        self.bg_normals = sim.normals_bind_group(self.pos_buf)
+
+        self._prev_version = None  # version de la simulation copiée dans prev_buf
+        self._shown = None         # (version, alpha) affichés
+
+        # normales une mise à jour sur N (FrameGovernor)
+        self.normals_every = 1
+        self._skipped = 0          # mises à jour sans normales depuis le dernier calcul
+
+    def save_previous(self):
+        """À appeler juste avant le dernier sim.step() de la frame."""
+        enc = self.device.create_command_encoder()
+        enc.copy_buffer_to_buffer(self.sim.current_pos_buffer, 0, self.prev_buf, 0, self.sim.N * 16)
+        self.device.queue.submit([enc.finish()])
+        self._prev_version = self.sim.version
+
+    def update(self, alpha: float, settle: bool = False) -> bool:
+        """
+        Positions + normales affichées pour `alpha` ; False si rien n'a changé.
+        settle : état figé (pause), normales à jour même avec normals_every > 1.
+        """
+        sim = self.sim
+        # état modifié hors step (reset, rewind, ...) : prev_buf n'est plus le
+        # prédécesseur de l'état courant, on affiche l'état courant
+        if self._prev_version is None or sim.version != self._prev_version + 1:
+            alpha = 1.0
+
+        shown = (sim.version, alpha)
+        if shown == self._shown:
+            if settle and self._skipped:
+                self._compute_normals()
+                return True
+            return False
+        self._shown = shown
+
+        self._params_np.view(np.float32)[0] = alpha
+        self._params_np[1] = sim.N
+        self.device.queue.write_buffer(self.params, 0, self._params_np)
+
+        profiler = sim.profiler
+        enc = self.device.create_command_encoder()
+        cp = enc.begin_compute_pass(
+            timestamp_writes=profiler.timestamp_writes("interpolate") if profiler is not None else None
+        )
+        cp.set_pipeline(self.pipeline)
+        cp.set_bind_group(0, self.bind_groups[0 if sim.ping else 1])
+        cp.dispatch_workgroups(self.dispatch)
+        cp.end()
+        if profiler is not None:
+            profiler.submit(enc, "interpolate")
+        else:
+            self.device.queue.submit([enc.finish()])
+
+        if settle or self._skipped + 1 >= self.normals_every:
+            self._compute_normals()
+        else:
+            self._skipped += 1
+        return True
+
+    def _compute_normals(self):
+        if self.normals:
+            self.sim.compute_normals(self.bg_normals)
+        self._skipped = 0
+
+    @property
+    def current_pos_buffer(self):
+        return self.pos_buf
+
+    @property
+    def normal_buf(self):
+        return self.sim.normal_buf
@@ -0,0 +1,186 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+
+import numpy as np
+import wgpu
+
+from src.gpu_utils import StagingRing
+
+"""
+Rendu sans fenêtre et capture de frames sur disque.
+
+- OffscreenTarget : textures couleur (format explicite) + depth, rendues par
+  Scene.draw comme la swapchain
+- FrameCapture : copie texture -> buffer (lignes alignées sur 256 octets,
+  contrainte de copy_texture_to_buffer) dans un anneau de buffers de relecture
+  mappés en asynchrone (StagingRing) ; un thread d'écriture retire le padding
+  et écrit un PNG par frame ou un flux de frames brutes RGBA (vidéo :
+  ffmpeg -f rawvideo -pix_fmt rgba -s WxH -i frames.rgba out.mp4)
+"""
+
+# Alignement de bytes_per_row imposé par WebGPU pour les copies texture <-> buffer
+ROW_ALIGN = 256
+
+# Formats couleur capturables (4 octets par pixel)
+_RGBA_FORMATS = (wgpu.TextureFormat.rgba8unorm, wgpu.TextureFormat.rgba8unorm_srgb)
+_BGRA_FORMATS = (wgpu.TextureFormat.bgra8unorm, wgpu.TextureFormat.bgra8unorm_srgb)
+
+
+def aligned_bytes_per_row(width: int, bytes_per_pixel: int = 4) -> int:
+    row = width * bytes_per_pixel
+    return (row + ROW_ALIGN - 1) // ROW_ALIGN * ROW_ALIGN
+
+
+def write_png(path: str, rgba: np.ndarray):
+    """PNG RGBA 8 bits (zlib seul, sans dépendance image)."""
+    h, w, _ = rgba.shape
+    raw = np.zeros((h, 1 + w * 4), dtype=np.uint8)  # octet de filtre 0 par ligne
+    raw[:, 1:] = rgba.reshape(h, w * 4)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 3)))
+        f.write(chunk(b"IEND", b""))
+
+
+class OffscreenTarget:
+    """Cible de rendu sans fenêtre : color_view / depth_view pour Scene.draw."""
+
+    def __init__(self, device, size, format=wgpu.TextureFormat.rgba8unorm_srgb):
+        self.device = device
+        self.format = format
+        self.size = (0, 0)
+        self.resize(size)
+
+    def resize(self, size):
+        size = (int(size[0]), int(size[1]))
+        if size == self.size:
+            return
+        self.size = size
+        w, h = size
+        self.color = self.device.create_texture(
+            size=(w, h, 1),
+            format=self.format,
+            usage=wgpu.TextureUsage.RENDER_ATTACHMENT | wgpu.TextureUsage.COPY_SRC | wgpu.TextureUsage.TEXTURE_BINDING,
+        )
+        self.depth = self.device.create_texture(
+            size=(w, h, 1),
+            format=wgpu.TextureFormat.depth24plus,
+            usage=wgpu.TextureUsage.RENDER_ATTACHMENT,
+        )
+        self.color_view = self.color.create_view()
+        self.depth_view = self.depth.create_view()
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+
+class FrameCapture:
+    """
+    Capture des frames d'une OffscreenTarget.
+    - mode "png" : path = dossier, un fichier frame_00000.png par frame
+    - mode "raw" : path = fichier, frames RGBA concaténées (w*h*4 octets chacune)
+    - capture() : après Scene.draw (même file GPU), ne bloque pas tant que
+      l'anneau n'est pas plein
+    - close() : vide l'anneau et attend le thread d'écriture
+    - une erreur du thread d'écriture est relancée par le capture() suivant
+      et par close()
+    """
+
+    def __init__(self, target: OffscreenTarget, path: str, mode: str = "png", ring: int = 3):
+        if target.format not in _RGBA_FORMATS + _BGRA_FORMATS:
+            raise ValueError(f"format non capturable : {target.format}")
+        if mode not in ("png", "raw"):
+            raise ValueError(f"mode de capture inconnu : {mode}")
+        self.target = target
+        self.device = target.device
+        self.path = path
+        self.mode = mode
+        self.bgra = target.format in _BGRA_FORMATS
+
+        self.size = target.size
+        self.bytes_per_row = aligned_bytes_per_row(target.width)
+        self.ring = StagingRing(self.device, self.bytes_per_row * target.height, self._on_frame, count=ring)
+
+        self.frames = 0
+        self.error = None
+        self._queue = queue.Queue()
+
+        if mode == "png":
+            os.makedirs(path, exist_ok=True)
+            self._file = None
+        else:
+            self._file = open(path, "wb")
+
+        self._thread = threading.Thread(target=self._writer, name="frame-writer", daemon=True)
+        self._thread.start()
+
+    # CAPTURE (thread rendu)
+    def _check(self):
+        if self.error is not None:
+            raise RuntimeError(f"l'écriture de {self.path} s'est arrêtée") from self.error
+
+    def capture(self):
+        self._check()
+        if self.target.size != self.size:
+            raise ValueError("la cible a changé de taille pendant la capture")
+        w, h = self.size
+        buf = self.ring.begin()
+
+        enc = self.device.create_command_encoder()
+        enc.copy_texture_to_buffer(
+            {"texture": self.target.color},
+            {"buffer": buf, "offset": 0, "bytes_per_row": self.bytes_per_row, "rows_per_image": h},
+            (w, h, 1),
+        )
+        self.device.queue.submit([enc.finish()])
+
+        self.ring.end(buf, self.frames)
+        self.frames += 1
+
+    def _on_frame(self, frame, data):
+        self._queue.put((frame, data))
+
+    def close(self):
+        self.ring.flush()
+        self._queue.put(None)
+        self._thread.join()
+        if self._file is not None:
+            self._file.close()
+        self._check()
+
+    # ÉCRITURE (thread d'arrière-plan)
+    def _writer(self):
+        try:
+            self._write_all()
+        except Exception as e:  # relancée côté rendu par capture() / close()
+            self.error = e
+
+    def _write_all(self):
+        w, h = self.size
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            frame, data = item
+            # lignes paddées -> image compacte
+            rows = np.frombuffer(data, dtype=np.uint8).reshape(h, self.bytes_per_row)
+            img = rows[:, :w * 4].reshape(h, w, 4)
+            if self.bgra:
+                img = img[:, :, [2, 1, 0, 3]]
+            if self.mode == "png":
+                write_png(os.path.join(self.path, f"frame_{frame:05d}.png"), img)
+            else:
+                self._file.write(np.ascontiguousarray(img).tobytes())
@@ -0,0 +1,202 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.wgsl import preprocess
+
+"""
+Cache partagé (par device, pour tout le processus) des objets GPU immuables :
+- shader modules, clé = hash du source WGSL
+- bind group layouts / pipeline layouts, clé = descripteur
+- compute / render pipelines, clé = descripteur (objets GPU par identité)
+
+Les shaders sont lus une seule fois, par chemin absolu (plus de dépendance
+au répertoire courant), et passent par le préprocesseur (src/wgsl.py) :
+une variante = (fichier, defines). Les pipelines peuvent être créés en asynchrone :
+compute_pipeline_async() lance la création sur un pool de threads (wgpu-native
+compile dans l'appel, hors GIL : les pipelines compilent en parallèle) et
+retourne une clé ; is_ready(clé) ne bloque pas, resolve(clé) attend le résultat.
+Le temps de compilation est cumulé dans `stats`.
+"""
+
+SHADER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shaders")
+
+_lock = threading.Lock()
+
+
+def get_pipeline_cache(device) -> "PipelineCache":
+    """
+    Cache associé à `device` (créé au premier appel). Rangé sur le device
+    lui-même : les objets en cache référencent le device, le cycle est libéré
+    avec lui (un registre global, même à clés faibles, le garderait vivant).
+    """
+    with _lock:
+        cache = getattr(device, "_pipeline_cache", None)
+        if cache is None:
+            cache = PipelineCache(device)
+            device._pipeline_cache = cache
+        return cache
+
+
+def _freeze(obj):
+    """Descripteur -> clé hashable (dict triés, listes -> tuples, objets GPU par identité)."""
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    return ("gpu", id(obj))
+
+
+class PipelineCache:
+    def __init__(self, device, workers: int = 4):
+        self.device = device
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipelines")
+        self._lock = threading.Lock()
+
+        self._files = {}        # chemin absolu -> texte brut
+        self._sources = {}      # (nom, defines) -> code WGSL préprocessé
+        self._modules = {}      # hash du code -> shader module
+        self._bgls = {}
+        self._layouts = {}
+        self._pipelines = {}
+        self._pending = {}      # clé -> Future (création en cours sur le pool)
+
+        self.stats = {"hits": 0, "misses": 0, "seconds": 0.0}
+
+    def _miss(self, t0):
+        with self._lock:
+            self.stats["misses"] += 1
+            self.stats["seconds"] += time.perf_counter() - t0
+
+    def _get_or_create(self, table: dict, key, create):
+        """
+        table[key], créé par create() si absent. Appelé depuis les threads de
+        construction et le pool : recherche et insertion sous verrou, création
+        hors verrou (les compilations restent parallèles). Si deux threads créent
+        la même clé, le premier inséré gagne et tous deux le retournent.
+        """
+        with self._lock:
+            obj = table.get(key)
+            if obj is not None:
+                self.stats["hits"] += 1
+                return obj
+
+        t0 = time.perf_counter()
+        obj = create()
+        with self._lock:
+            winner = table.setdefault(key, obj)
+            if winner is obj:
+                self.stats["misses"] += 1
+                self.stats["seconds"] += time.perf_counter() - t0
+            else:
+                self.stats["hits"] += 1
+        return winner
+
+    # SHADERS
+    def _read(self, path: str) -> str:
+        text = self._files.get(path)
+        if text is None:
+            with open(path, "r", encoding="utf-8") as f:
+                text = self._files.setdefault(path, f.read())
+        return text
+
+    def source(self, name: str, defines=None) -> str:
+        """Code WGSL de shaders/<name>, includes et defines résolus (mis en cache)."""
+        key = (name, _freeze(defines or {}))
+        code = self._sources.get(key)
+        if code is None:
+            code = self._sources.setdefault(key, preprocess(name, SHADER_DIR, defines, read=self._read))
+        return code
+
+    def shader_module(self, code: str):
+        key = hashlib.sha1(code.encode("utf-8")).hexdigest()
+        return self._get_or_create(self._modules, key, lambda: self.device.create_shader_module(code=code))
+
+    def shader_module_file(self, name: str, defines=None):
+        return self.shader_module(self.source(name, defines))
+
+    def precompile_modules(self, names=None):
+        """Compile en parallèle les shaders listés (par défaut : tout shaders/)."""
+        if names is None:
+            names = sorted(n for n in os.listdir(SHADER_DIR) if n.endswith(".wgsl"))
+
+        codes = [self.source(n) for n in names]
+        t0 = time.perf_counter()
+        list(self._pool.map(self.shader_module, codes))
+        return time.perf_counter() - t0
+
+    # LAYOUTS
+    def bind_group_layout(self, entries):
+        key = _freeze(entries)
+        return self._get_or_create(self._bgls, key, lambda: self.device.create_bind_group_layout(entries=entries))
+
+    def pipeline_layout(self, bind_group_layouts):
+        bind_group_layouts = list(bind_group_layouts)
+        key = _freeze(bind_group_layouts)
+        return self._get_or_create(
+            self._layouts, key, lambda: self.device.create_pipeline_layout(bind_group_layouts=bind_group_layouts),
+        )
+
+    # PIPELINES
+    def _create(self, create, descriptor):
+        """Exécuté sur le pool : création + attente du pipeline."""
+        t0 = time.perf_counter()
+        pipeline = create(**descriptor).sync_wait()
+        self._miss(t0)
+        return pipeline
+
+    def _launch(self, key, create, descriptor):
+        """Une seule création par clé, même lancée depuis plusieurs threads."""
+        with self._lock:
+            if key in self._pipelines or key in self._pending:
+                self.stats["hits"] += 1
+            else:
+                self._pending[key] = self._pool.submit(self._create, create, descriptor)
+        return key
+
+    def compute_pipeline_async(self, layout, module, entry_point: str = "main", constants=None):
+        """Lance la création (si absente du cache) et retourne sa clé."""
+        stage = {"module": module, "entry_point": entry_point}
+        if constants:
+            stage["constants"] = dict(constants)
+
+        key = ("compute", _freeze(layout), _freeze(stage))
+        return self._launch(key, self.device.create_compute_pipeline_async, {"layout": layout, "compute": stage})
+
+    def render_pipeline_async(self, **descriptor):
+        key = ("render", _freeze(descriptor))
+        return self._launch(key, self.device.create_render_pipeline_async, descriptor)
+
+    def resolve(self, key):
+        """Pipeline associé à la clé (attend la fin de la création si besoin)."""
+        future = self._pending.get(key)
+        if future is not None:
+            pipeline = future.result()  # hors verrou : le pool en a besoin pour _miss
+            with self._lock:
+                self._pipelines[key] = pipeline
+                self._pending.pop(key, None)
+        return self._pipelines[key]
+
+    def is_ready(self, key) -> bool:
+        """Vrai si resolve(key) ne bloquera pas."""
+        future = self._pending.get(key)
+        return key in self._pipelines or (future is not None and future.done())
+
+    def compute_pipeline(self, layout, module, entry_point: str = "main", constants=None):
+        return self.resolve(self.compute_pipeline_async(layout, module, entry_point, constants))
+
+    def render_pipeline(self, **descriptor):
+        return self.resolve(self.render_pipeline_async(**descriptor))
+
+    # RAPPORT
+    def report(self) -> str:
+        return (
+            f"🧩 Cache GPU : {len(self._modules)} shaders, {len(self._bgls)} layouts, "
+            f"{len(self._pipelines) + len(self._pending)} pipelines | "
+            f"{self.stats['hits']} hits / {self.stats['misses']} créations | "
+            f"{self.stats['seconds'] * 1e3:.1f} ms"
+        )
@@ -0,0 +1,157 @@
+import time
+from collections import deque
+
+import numpy as np
+import wgpu
+
+from src.gpu_utils import StagingRing
+
+"""
+Profileur GPU par passe (optionnel).
+
+- si l'adapter supporte `timestamp-query` : chaque passe compute / render
+  reçoit des timestamp_writes (début / fin), les requêtes sont résolues en fin
+  de frame dans un buffer, relu de façon asynchrone (StagingRing)
+- sinon : repli sur le temps CPU de finish() + submit() par passe
+
+Les durées sont sommées par nom de passe et par frame, puis moyennées sur
+une fenêtre glissante : averages(), report(), maybe_report().
+
+max_passes borne le nombre de passes horodatées par frame (dimensionné par
+l'appelant : passes d'un step x pas par frame + rendu). Une frame qui le
+dépasse est incomplète (les dernières passes, dont le rendu, n'ont pas de
+timestamps) : elle est signalée et n'est pas livrée, pour que last_frame ne
+montre jamais un rendu à 0 ms.
+"""
+
+
+class GpuProfiler:
+    def __init__(self, device, max_passes: int = 256, window: int = 120, report_every: float = 2.0):
+        self.device = device
+        self.max_passes = int(max_passes)
+        self.window = int(window)
+        self.report_every = float(report_every)
+
+        self.use_timestamps = "timestamp-query" in device.features
+
+        if self.use_timestamps:
+            self.query_set = device.create_query_set(type="timestamp", count=2 * self.max_passes)
+            self.resolve_buf = device.create_buffer(
+                size=16 * self.max_passes,
+                usage=wgpu.BufferUsage.QUERY_RESOLVE | wgpu.BufferUsage.COPY_SRC,
+            )
+            self.ring = StagingRing(device, 16 * self.max_passes, self._on_timestamps)
+
+        self.history = {}       # nom -> deque des ms par frame
+        self.frames = 0
+        self.last_frame = {}    # nom -> ms de la dernière frame livrée
+        self.incomplete = 0     # frames non livrées (plus de max_passes passes)
+
+        self._names = []        # passes de la frame courante (index k -> requêtes 2k, 2k+1)
+        self._cpu_ms = {}       # repli CPU : ms par passe sur la frame courante
+        self._dropped = 0       # passes sans timestamps sur la frame courante
+        self._last_report = time.perf_counter()
+
+    @property
+    def mode(self) -> str:
+        return "timestamp-query" if self.use_timestamps else "cpu-submit"
+
+    # FRAME
+    def begin_frame(self):
+        self._names.clear()
+        self._cpu_ms.clear()
+        self._dropped = 0
+
+    def timestamp_writes(self, name: str):
+        """timestamp_writes pour begin_compute_pass / begin_render_pass (ou None)."""
+        if not self.use_timestamps:
+            return None
+        if len(self._names) >= self.max_passes:
+            self._dropped += 1
+            return None
+        k = len(self._names)
+        self._names.append(name)
+        return {
+            "query_set": self.query_set,
+            "beginning_of_pass_write_index": 2 * k,
+            "end_of_pass_write_index": 2 * k + 1,
+        }
+
+    def submit(self, enc, name: str):
+        """Remplace queue.submit([enc.finish()]) ; en repli CPU, mesure la soumission."""
+        if self.use_timestamps:
+            self.device.queue.submit([enc.finish()])
+            return
+        t0 = time.perf_counter()
+        self.device.queue.submit([enc.finish()])
+        dt = (time.perf_counter() - t0) * 1e3
+        self._cpu_ms[name] = self._cpu_ms.get(name, 0.0) + dt
+
+    def end_frame(self):
+        if not self.use_timestamps:
+            if self._cpu_ms:
+                self._push(dict(self._cpu_ms))
+            return
+
+        n = len(self._names)
+        if n == 0:
+            return
+        if self._dropped:
+            if self.incomplete == 0:
+                print(f"⚠️  Profileur GPU : {n + self._dropped} passes sur une frame (max_passes={self.max_passes}), "
+                      f"frames incomplètes ignorées")
+            self.incomplete += 1
+            return
+
+        buf = self.ring.begin()
+        enc = self.device.create_command_encoder()
+        enc.resolve_query_set(self.query_set, 0, 2 * n, self.resolve_buf, 0)
+        enc.copy_buffer_to_buffer(self.resolve_buf, 0, buf, 0, 16 * n)
+        self.device.queue.submit([enc.finish()])
+        self.ring.end(buf, tuple(self._names))
+
+    def _on_timestamps(self, names, data):
+        ts = np.frombuffer(data, dtype=np.uint64)[:2 * len(names)].astype(np.int64)
+        durations = (ts[1::2] - ts[0::2]) * 1e-6  # ns -> ms
+
+        per_pass = {}
+        for name, ms in zip(names, durations):
+            per_pass[name] = per_pass.get(name, 0.0) + max(0.0, float(ms))
+        self._push(per_pass)
+
+    def _push(self, per_pass: dict):
+        for name, ms in per_pass.items():
+            if name not in self.history:
+                self.history[name] = deque(maxlen=self.window)
+            self.history[name].append(ms)
+        self.last_frame = per_pass
+        self.frames += 1
+
+    # RÉSULTATS
+    @property
+    def last_frame_ms(self) -> float:
+        """Total (toutes passes) de la dernière frame livrée."""
+        return sum(self.last_frame.values())
+
+    def averages(self) -> dict:
+        """Moyenne glissante (ms par frame) de chaque passe."""
+        return {name: float(np.mean(h)) for name, h in self.history.items() if h}
+
+    def report(self) -> str:
+        avg = self.averages()
+        total = sum(avg.values())
+        lines = [f"⏱️  GPU par passe ({self.mode}, {min(self.frames, self.window)} frames) :"]
+        for name, ms in sorted(avg.items(), key=lambda kv: -kv[1]):
+            share = 100.0 * ms / total if total > 0 else 0.0
+            lines.append(f"  {name:14s} {ms:8.3f} ms  {share:5.1f} %")
+        lines.append(f"  {'total':14s} {total:8.3f} ms")
+        if self.incomplete:
+            lines.append(f"  ⚠️  {self.incomplete} frames ignorées (plus de {self.max_passes} passes)")
+        return "\n".join(lines)
+
+    def maybe_report(self):
+        """Affiche report() toutes les `report_every` secondes."""
+        now = time.perf_counter()
+        if now - self._last_report >= self.report_every and self.history:
+            self._last_report = now
+            print(self.report())
@@ -0,0 +1,312 @@
+import queue
+import struct
+import threading
+import zlib
+
+import numpy as np
+import wgpu
+
+from src.gpu_utils import StagingRing
+
+"""
+Enregistrement compressé de trajectoires + relecture (playback).
+
+Format (little-endian) :
+- en-tête : magic, version, W, H, flags (bit0 = normales), chunk_frames
+- chunks : chaque chunk regroupe `chunk_frames` frames
+    positions quantifiées uint16 sur la boîte englobante du chunk,
+    normales quantifiées int8 (snorm),
+    encodage delta frame à frame (arithmétique modulo 2^16 / 2^8),
+    puis zlib
+- index : (offset, tailles, nb frames, bornes lo/hi) par chunk
+- pied : offset de l'index, nb chunks, nb frames, magic
+
+La relecture mappe le fichier en mémoire ; un seek ne décompresse que le
+chunk concerné (cumsum des deltas).
+"""
+
+MAGIC = b"CTRJ"
+VERSION = 1
+
+FLAG_NORMALS = 1
+
+_HEADER = struct.Struct("<4sIIIII")
+_INDEX = struct.Struct("<QIII6f")
+_FOOTER = struct.Struct("<QII4s")
+
+_Q_POS = 65535.0
+_Q_NRM = 127.0
+
+
+def _encode_chunk(pos, nrm):
+    """pos (F,N,3) float32, nrm (F,N,3) float32 ou None -> (blob_pos, blob_nrm, lo, hi)"""
+    lo = pos.min(axis=(0, 1))
+    hi = pos.max(axis=(0, 1))
+    scale = np.maximum(hi - lo, 1e-9)
+
+    q = np.rint((pos - lo) / scale * _Q_POS).astype(np.uint16)
+    q[1:] = q[1:] - q[:-1]  # deltas (wrap modulo 2^16)
+    blob_pos = zlib.compress(q.tobytes(), 1)
+
+    blob_nrm = b""
+    if nrm is not None:
+        qn = np.rint(np.clip(nrm, -1.0, 1.0) * _Q_NRM).astype(np.int8).view(np.uint8)
+        qn[1:] = qn[1:] - qn[:-1]
+        blob_nrm = zlib.compress(qn.tobytes(), 1)
+
+    return blob_pos, blob_nrm, lo, hi
+
+
+class TrajectoryRecorder:
+    """
+    Enregistre les positions (et optionnellement les normales) de chaque frame.
+
+    - capture() : à appeler après step()/compute_normals(), copie GPU -> staging
+    - la relecture GPU est pipelinée (StagingRing), la quantification, la
+      compression et l'écriture disque sont faites par un thread d'arrière-plan
+    - captures_per_frame : captures max entre deux frames rendues (un capture
+      par pas : max_steps) ; l'anneau en garde 2 frames de plus en vol, sans
+      quoi un rattrapage attendrait une copie soumise dans la même frame
+    - close() : vide le pipeline et écrit l'index
+    - une erreur du thread d'écriture (disque plein...) est relancée par le
+      capture() suivant et par close()
+    """
+
+    def __init__(self, sim, path: str, record_normals: bool = False, chunk_frames: int = 64,
+                 captures_per_frame: int = 1):
+        self.sim = sim
+        self.device = sim.device
+        self.path = path
+        self.record_normals = bool(record_normals)
+        self.chunk_frames = int(chunk_frames)
+
+        self.frame_bytes = sim.N * 16
+        staging_size = self.frame_bytes * (2 if self.record_normals else 1)
+        self.ring = StagingRing(self.device, staging_size, self._on_frame, count=int(captures_per_frame) + 2)
+
+        self.frames = 0
+        self.error = None
+        self._queue = queue.Queue()
+
+        self._file = open(path, "wb")
+        flags = FLAG_NORMALS if self.record_normals else 0
+        self._file.write(_HEADER.pack(MAGIC, VERSION, sim.W, sim.H, flags, self.chunk_frames))
+
+        self._thread = threading.Thread(target=self._writer, name="trajectory-writer", daemon=True)
+        self._thread.start()
+
+    # CAPTURE (thread rendu)
+    def _check(self):
+        if self.error is not None:
+            raise RuntimeError(f"l'écriture de {self.path} s'est arrêtée") from self.error
+
+    def capture(self):
+        self._check()
+        buf = self.ring.begin()
+
+        enc = self.device.create_command_encoder()
+        enc.copy_buffer_to_buffer(self.sim.current_pos_buffer, 0, buf, 0, self.frame_bytes)
+        if self.record_normals:
+            enc.copy_buffer_to_buffer(self.sim.normal_buf, 0, buf, self.frame_bytes, self.frame_bytes)
+        self.device.queue.submit([enc.finish()])
+
+        self.ring.end(buf, self.frames)
+        self.frames += 1
+
+    def _on_frame(self, frame, data):
+        self._queue.put(data)
+
+    def close(self):
+        self.ring.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._check()
+
+    # ÉCRITURE (thread d'arrière-plan)
+    def _writer(self):
+        try:
+            self._write_all()
+        except Exception as e:  # relancée côté rendu par capture() / close()
+            self.error = e
+
+    def _write_all(self):
+        N = self.sim.N
+        index = []
+        pos_chunk, nrm_chunk = [], []
+        total = 0
+
+        def flush_chunk():
+            pos = np.stack(pos_chunk)
+            nrm = np.stack(nrm_chunk) if self.record_normals else None
+            blob_pos, blob_nrm, lo, hi = _encode_chunk(pos, nrm)
+
+            offset = self._file.tell()
+            self._file.write(blob_pos)
+            self._file.write(blob_nrm)
+            index.append((offset, len(blob_pos), len(blob_nrm), len(pos_chunk), *lo, *hi))
+
+            pos_chunk.clear()
+            nrm_chunk.clear()
+
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+
+            arr = np.frombuffer(data, dtype=np.float32)
+            pos_chunk.append(arr[:N * 4].reshape(N, 4)[:, :3])
+            if self.record_normals:
+                nrm_chunk.append(arr[N * 4:].reshape(N, 4)[:, :3])
+            total += 1
+
+            if len(pos_chunk) == self.chunk_frames:
+                flush_chunk()
+
+        if pos_chunk:
+            flush_chunk()
+
+        index_offset = self._file.tell()
+        for entry in index:
+            self._file.write(_INDEX.pack(*entry))
+        self._file.write(_FOOTER.pack(index_offset, len(index), total, MAGIC))
+
+
+class TrajectoryPlayer:
+    """
+    Relecture d'un fichier enregistré par TrajectoryRecorder.
+
+    Expose `current_pos_buffer` et `normal_buf` comme ClothSimulation :
+    Scene.draw peut l'utiliser à la place de la simulation.
+    - seek(i) : accès aléatoire (ne décompresse que le chunk de la frame i)
+    - advance() : frame suivante (boucle)
+    - grid=(W, H) : taille de grille attendue (celle de la Scene), ValueError sinon
+    """
+
+    def __init__(self, device, path: str, grid=None):
+        self.device = device
+        self.path = path
+
+        self._mm = np.memmap(path, dtype=np.uint8, mode="r")
+
+        magic, version, W, H, flags, chunk_frames = _HEADER.unpack(self._mm[:_HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{path}: pas un enregistrement de trajectoire")
+        if version != VERSION:
+            raise ValueError(f"{path}: version {version} non supportée (attendu {VERSION})")
+
+        if grid is not None and (W, H) != tuple(grid):
+            raise ValueError(f"{path}: grille {W}x{H} != scène {grid[0]}x{grid[1]}")
+
+        self.W, self.H = W, H
+        self.N = W * H
+        self.has_normals = bool(flags & FLAG_NORMALS)
+        self.chunk_frames = chunk_frames
+
+        index_offset, n_chunks, n_frames, magic = _FOOTER.unpack(
+            self._mm[-_FOOTER.size:].tobytes()
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path}: enregistrement incomplet (pas d'index)")
+
+        if n_frames == 0:
+            raise ValueError(f"{path}: enregistrement vide (0 frame)")
+        self.frame_count = n_frames
+        self.index = [
+            _INDEX.unpack_from(self._mm, index_offset + k * _INDEX.size)
+            for k in range(n_chunks)
+        ]
+
+        self._chunk_id = None
+        self._chunk_pos = None
+        self._chunk_nrm = None
+
+        self.frame = 0
+
+        # Buffers GPU propres à la relecture (l'état de la simulation est conservé)
+        usage = wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST
+        self.pos_buf = device.create_buffer(size=self.N * 16, usage=usage)
+        self.normal_buf = device.create_buffer(size=self.N * 16, usage=usage)
+
+        self._pos4 = np.ones((self.N, 4), dtype=np.float32)
+        self._nrm4 = np.zeros((self.N, 4), dtype=np.float32)
+
+        self.seek(0)
+
+    @property
+    def current_pos_buffer(self):
+        return self.pos_buf
+
+    # DÉCODAGE
+    def _load_chunk(self, k: int):
+        if k == self._chunk_id:
+            return
+
+        offset, size_pos, size_nrm, n, *bounds = self.index[k]
+        lo = np.array(bounds[:3], dtype=np.float32)
+        hi = np.array(bounds[3:], dtype=np.float32)
+        scale = np.maximum(hi - lo, 1e-9)
+
+        raw = zlib.decompress(self._mm[offset:offset + size_pos])
+        q = np.frombuffer(raw, dtype=np.uint16).reshape(n, self.N, 3)
+        q = np.cumsum(q, axis=0, dtype=np.uint16)
+        self._chunk_pos = lo + q.astype(np.float32) * (scale / _Q_POS)
+
+        self._chunk_nrm = None
+        if self.has_normals:
+            start = offset + size_pos
+            raw = zlib.decompress(self._mm[start:start + size_nrm])
+            qn = np.frombuffer(raw, dtype=np.uint8).reshape(n, self.N, 3)
+            qn = np.cumsum(qn, axis=0, dtype=np.uint8).view(np.int8)
+            self._chunk_nrm = qn.astype(np.float32) / _Q_NRM
+
+        self._chunk_id = k
+
+    def read_frame(self, i: int):
+        """Retourne (positions (N,4), normales (N,4) ou None) de la frame i."""
+        k, j = divmod(int(i), self.chunk_frames)
+        self._load_chunk(k)
+
+        pos = self._pos4.copy()
+        pos[:, :3] = self._chunk_pos[j]
+        nrm = None
+        if self._chunk_nrm is not None:
+            nrm = self._nrm4.copy()
+            nrm[:, :3] = self._chunk_nrm[j]
+        return pos, nrm
+
+    # NAVIGATION
+    def seek(self, i: int):
+        """Affiche la frame i (bornée à [0, frame_count-1])."""
+        self.frame = max(0, min(int(i), self.frame_count - 1))
+
+        k, j = divmod(self.frame, self.chunk_frames)
+        self._load_chunk(k)
+
+        self._pos4[:, :3] = self._chunk_pos[j]
+        self.device.queue.write_buffer(self.pos_buf, 0, self._pos4)
+
+        if self._chunk_nrm is not None:
+            self._nrm4[:, :3] = self._chunk_nrm[j]
+        else:
+            self._nrm4[:, :3] = _grid_normals(self._pos4[:, :3], self.W, self.H)
+        self.device.queue.write_buffer(self.normal_buf, 0, self._nrm4)
+
+    def advance(self, n: int = 1):
+        self.seek((self.frame + n) % self.frame_count)
+
+
+def _grid_normals(pos, W, H):
+    """Normales de grille (même schéma que compute_normals_grid.wgsl), côté CPU."""
+    p = pos.reshape(H, W, 3)
+    il = np.maximum(np.arange(W) - 1, 0)
+    ir = np.minimum(np.arange(W) + 1, W - 1)
+    jd = np.maximum(np.arange(H) - 1, 0)
+    ju = np.minimum(np.arange(H) + 1, H - 1)
+
+    dx = p[:, ir] - p[:, il]
+    dz = p[ju] - p[jd]
+    n = np.cross(dz, dx)
+    length = np.linalg.norm(n, axis=-1, keepdims=True)
+    n = np.where(length < 1e-8, np.array([0.0, 1.0, 0.0], dtype=np.float32), n / np.maximum(length, 1e-8))
+    return n.reshape(-1, 3).astype(np.float32)
@@ -0,0 +1,145 @@
+import wgpu
+
+from src.offscreen import OffscreenTarget
+from src.renders.upscale_pass import UpscalePass
+
+"""
+Résolution de rendu interne (render scale).
+
+La scène est dessinée dans une OffscreenTarget réduite (couleur + depth,
+scale x la taille de la cible finale, même format que la swapchain), puis
+une passe plein écran la ramène à la taille finale (UpscalePass :
+bilinéaire, ou bilinéaire + accentuation). Le coût des fragments (tissu,
+sphères) baisse comme scale². À scale 1 sans accentuation, la scène est
+dessinée directement dans la cible finale (depth plein format) : pas de
+passe de copie.
+
+Résolution dynamique (target_ms) : update(frame_ms) suit le temps GPU de
+rendu par frame (passes RENDER_PASSES seulement : la simulation ne dépend
+pas de scale ; moyenne exponentielle) et ajuste scale par paliers de STEP entre
+min_scale et max_scale pour tenir target_ms. Après chaque changement, on
+attend COOLDOWN frames (les timestamps arrivent avec quelques frames de
+retard, voir GpuProfiler) avant de mesurer à nouveau.
+"""
+
+# Passes GPU dont le coût dépend de scale
+RENDER_PASSES = ("render", "upscale")
+
+# Palier de scale (tailles de cible réutilisées d'une frame à l'autre)
+STEP = 1.0 / 16.0
+# Frames ignorées après un changement de scale
+COOLDOWN = 20
+# Marges autour de target_ms : au-delà on réduit, en deçà on augmente
+HIGH = 1.05
+LOW = 0.80
+
+
+class RenderScale:
+    def __init__(self, texture_format, device, scale: float = 1.0, sharpen: float = 0.0,
+                 target_ms=None, min_scale: float = 0.5, max_scale: float = 1.0, smoothing: float = 0.1):
+        self.device = device
+        # bornes de la résolution dynamique (un scale fixe hors bornes les élargit)
+        self.min_scale = min(float(min_scale), float(scale))
+        self.max_scale = max(float(max_scale), float(scale))
+        self.scale = self._quantize(scale)
+        # résolution dynamique si target_ms est donné
+        self.target_ms = None if target_ms is None else float(target_ms)
+        self.smoothing = float(smoothing)
+
+        self.upscale = UpscalePass(texture_format, device, sharpen)
+        self.target = OffscreenTarget(device, (1, 1), format=texture_format)
+        # depth plein format du rendu direct (scale 1), créé au besoin
+        self._depth = None
+        self._depth_view = None
+        self._depth_size = None
+
+        self.frame_ms = None    # moyenne exponentielle du temps par frame
+        self.changes = 0
+        self._cooldown = COOLDOWN
+        self._seen = 0          # GpuProfiler.frames à la dernière lecture (observe)
+
+    @property
+    def dynamic(self) -> bool:
+        return self.target_ms is not None
+
+    def _quantize(self, scale: float) -> float:
+        scale = round(float(scale) / STEP) * STEP
+        return min(self.max_scale, max(self.min_scale, scale))
+
+    def size_for(self, width: int, height: int):
+        """Taille de la cible réduite pour une cible finale width x height."""
+        return max(1, round(width * self.scale)), max(1, round(height * self.scale))
+
+    @property
+    def direct(self) -> bool:
+        """Rendu sans cible intermédiaire (scale 1, pas d'accentuation)."""
+        return self.scale == 1.0 and self.upscale.sharpen <= 0.0
+
+    def _full_depth(self, size):
+        if self._depth_size != size:
+            self._depth = self.device.create_texture(
+                size=(size[0], size[1], 1),
+                format=wgpu.TextureFormat.depth24plus,
+                usage=wgpu.TextureUsage.RENDER_ATTACHMENT,
+            )
+            self._depth_view = self._depth.create_view()
+            self._depth_size = size
+        return self._depth_view
+
+    # RENDU
+    def draw(self, scene, device, dst_view, dst_size, sim):
+        """Scene.draw dans la cible réduite puis mise à l'échelle dans dst_view."""
+        dst_size = (int(dst_size[0]), int(dst_size[1]))
+        if self.direct:
+            scene.set_viewport(*dst_size)
+            scene.draw(device, dst_view, self._full_depth(dst_size), sim)
+            return
+        self.target.resize(self.size_for(*dst_size))
+        # projection : ratio de la cible finale (l'arrondi peut le décaler d'un pixel)
+        scene.set_viewport(*dst_size)
+        scene.draw(device, self.target.color_view, self.target.depth_view, sim)
+        self.upscale.draw(device, self.target.color_view, self.target.size, dst_view)
+
+    # RÉSOLUTION DYNAMIQUE
+    def set_scale(self, scale: float) -> bool:
+        """Nouveau scale (quantifié, borné) ; True s'il a changé."""
+        scale = self._quantize(scale)
+        if scale == self.scale:
+            return False
+        self.scale = scale
+        self.changes += 1
+        self.frame_ms = None
+        self._cooldown = COOLDOWN
+        return True
+
+    def update(self, frame_ms: float) -> bool:
+        """Un échantillon de temps par frame (ms) ; True si scale a changé."""
+        if not self.dynamic:
+            return False
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return False
+
+        a = self.smoothing
+        self.frame_ms = frame_ms if self.frame_ms is None else (1.0 - a) * self.frame_ms + a * frame_ms
+
+        if self.frame_ms > HIGH * self.target_ms:
+            # coût ~ nombre de pixels ~ scale² : saut direct vers la cible
+            wanted = self.scale * (self.target_ms / self.frame_ms) ** 0.5
+            return self.set_scale(min(wanted, self.scale - STEP))
+        if self.frame_ms < LOW * self.target_ms:
+            return self.set_scale(self.scale + STEP)
+        return False
+
+    def observe(self, profiler) -> bool:
+        """update() avec les passes de rendu de la dernière frame livrée par le profileur (si nouvelle)."""
+        if profiler.frames == self._seen:
+            return False
+        self._seen = profiler.frames
+        frame = profiler.last_frame
+        return self.update(sum(frame.get(name, 0.0) for name in RENDER_PASSES))
+
+    def report(self) -> str:
+        w, h = self._depth_size if self.direct and self._depth_size else self.target.size
+        mode = f"dynamique, cible {self.target_ms:.1f} ms" if self.dynamic else "fixe"
+        return f"🔍 Render scale {self.scale:.3f} ({mode}) : {w}x{h}, {self.changes} changements"
@@ -1,5 +1,6 @@
+import numpy as np
 import wgpu
-from ..gpu_utils import read_text
+from ..pipeline_cache import get_pipeline_cache
 
 
 class ClothRenderer:
@@ -7,64 +8,78 @@ class ClothRenderer:
     Renderer wireframe du tissu (lignes).
     Utilisé pour le debug et l’overlay.
     Compatible depth (lecture seule).
+
+    procedural=True : draw non indexé de index_count vertex, les extrémités
+    des segments sont déduites de vertex_index (grid = (W, H)) et les
+    positions lues en storage ; pas d'index buffer (record(..., None)).
+
+    instanced=True : B tissus concaténés dessinés en un draw instancié
+    (voir ClothRendererLit).
     """
 
-    def __init__(self, canvas, device, index_count: int):
+    def __init__(self, texture_format, device, index_count: int, frame, grid=None, procedural: bool = False,
+                 instanced: bool = False):
         self.device = device 
         self.queue = device.queue 
         self.index_count = int(index_count) 
+        self.procedural = bool(procedural)
+        self.instanced = bool(instanced)
+        self.grid_storage = self.procedural or self.instanced
+        # format de la cible (swapchain ou texture offscreen)
+        self.texture_format = texture_format
 
-        context = canvas.get_context("wgpu")
-        self.texture_format = context.get_preferred_format(device.adapter)
-
-        shader = device.create_shader_module(
-            code=read_text("shaders/render_basic.wgsl")
-        )
+        cache = get_pipeline_cache(device)
+        defines = {}
+        if self.procedural:
+            defines["PROCEDURAL_GRID"] = 1
+        if self.instanced:
+            defines["INSTANCED"] = 1
+        shader = cache.shader_module_file("render_basic.wgsl", defines)
 
         
-        # Uniform caméra (MVP)
-        self.cam_buf = device.create_buffer(
-            size=64,
-            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
-        )
-
-        self.cam_bgl = device.create_bind_group_layout(entries=[{
-            "binding": 0,
-            "visibility": wgpu.ShaderStage.VERTEX,
-            "buffer": {"type": wgpu.BufferBindingType.uniform},
-        }])
+        # Uniform de frame partagé (caméra, lumière)
+        self.frame = frame
+        bgls = [frame.bgl]
 
-        self.cam_bg = device.create_bind_group(
-            layout=self.cam_bgl,
-            entries=[{
-                "binding": 0,
-                "resource": {
-                    "buffer": self.cam_buf,
+        if self.grid_storage:
+            # group 1 : positions en storage + taille de grille (+ décalages d'instance)
+            W, H = grid
+            self.grid_buf = device.create_buffer_with_data(
+                data=np.array([W, H, W * H, 0], dtype=np.uint32).tobytes(),
+                usage=wgpu.BufferUsage.UNIFORM,
+            )
+            entries = [
+                {"binding": 0, "visibility": wgpu.ShaderStage.VERTEX, "buffer": {"type": "read-only-storage"}},
+                {"binding": 1, "visibility": wgpu.ShaderStage.VERTEX, "buffer": {"type": "uniform"}},
+            ]
+            if self.instanced:
+                entries.append(
+                    {"binding": 3, "visibility": wgpu.ShaderStage.VERTEX, "buffer": {"type": "read-only-storage"}},
+                )
+            self.grid_bgl = cache.bind_group_layout(entries)
+            bgls.append(self.grid_bgl)
+            self._grid_bgs = {}  # (positions, instances) -> bind group
+            vertex_buffers = []
+        else:
+            vertex_buffers = [{
+                "array_stride": 16,
+                "step_mode": wgpu.VertexStepMode.vertex,
+                "attributes": [{
+                    "shader_location": 0,
                     "offset": 0,
-                    "size": 64,
-                },
-            }],
-        )
+                    "format": wgpu.VertexFormat.float32x4,
+                }],
+            }]
 
-        pipeline_layout = device.create_pipeline_layout(
-            bind_group_layouts=[self.cam_bgl]
-        )
+        pipeline_layout = cache.pipeline_layout(bgls)
 
         # Render pipeline wireframe depth lecture seule
-        self.pipeline = device.create_render_pipeline(
+        self.pipeline = cache.render_pipeline(
             layout=pipeline_layout,
             vertex={
                 "module": shader,
                 "entry_point": "vs_main",
-                "buffers": [{
-                    "array_stride": 16,
-                    "step_mode": wgpu.VertexStepMode.vertex,
-                    "attributes": [{
-                        "shader_location": 0,
-                        "offset": 0,
-                        "format": wgpu.VertexFormat.float32x4,
-                    }],
-                }],
+                "buffers": vertex_buffers,
             },
             fragment={
                 "module": shader,
@@ -82,40 +97,33 @@ class ClothRenderer:
             },
         )
 
-    # API
-    def set_mvp(self, mvp_bytes: bytes):
-        self.queue.write_buffer(self.cam_buf, 0, mvp_bytes)
-
-    def encode(
-        self,
-        enc,
-        color_view,
-        position_buffer,
-        index_buffer,
-        depth_view=None,
-        clear: bool = False,
-    ):
-        attachments = {
-            "color_attachments": [{
-                "view": color_view,
-                "load_op": wgpu.LoadOp.clear if clear else wgpu.LoadOp.load,
-                "store_op": wgpu.StoreOp.store,
-                "clear_value": (0.1, 0.1, 0.1, 1.0),
-            }]
-        }
-
-        if depth_view is not None:
-            attachments["depth_stencil_attachment"] = {
-                "view": depth_view,
-                "depth_load_op": wgpu.LoadOp.load,
-                "depth_store_op": wgpu.StoreOp.store,
-                "depth_clear_value": 1.0, 
-            }
+    def _grid_bind_group(self, position_buffer, instance_buffer):
+        key = (position_buffer, instance_buffer)
+        bg = self._grid_bgs.get(key)
+        if bg is None:
+            entries = [
+                {"binding": 0, "resource": {"buffer": position_buffer}},
+                {"binding": 1, "resource": {"buffer": self.grid_buf}},
+            ]
+            if self.instanced:
+                entries.append({"binding": 3, "resource": {"buffer": instance_buffer}})
+            bg = self.device.create_bind_group(layout=self.grid_bgl, entries=entries)
+            self._grid_bgs[key] = bg
+        return bg
 
-        rp = enc.begin_render_pass(**attachments)
+    # API
+    def record(self, rp, position_buffer, index_buffer, instance_buffer=None, instance_count: int = 1):
+        """Enregistre le dessin dans une render pass ou un render bundle (attachments fournis par Scene)."""
         rp.set_pipeline(self.pipeline)
-        rp.set_bind_group(0, self.cam_bg, [], 0, 999999)
-        rp.set_vertex_buffer(0, position_buffer, 0)
+        rp.set_bind_group(0, self.frame.bind_group, [], 0, 999999)
+        if not self.instanced:
+            instance_buffer, instance_count = None, 1
+        if self.grid_storage:
+            rp.set_bind_group(1, self._grid_bind_group(position_buffer, instance_buffer), [], 0, 999999)
+        if self.procedural:
+            rp.draw(self.index_count, instance_count, 0, 0)
+            return
+        if not self.instanced:
+            rp.set_vertex_buffer(0, position_buffer, 0)
         rp.set_index_buffer(index_buffer, wgpu.IndexFormat.uint32, 0)
-        rp.draw_indexed(self.index_count, 1, 0, 0, 0)
-        rp.end()
+        rp.draw_indexed(self.index_count, instance_count, 0, 0, 0)
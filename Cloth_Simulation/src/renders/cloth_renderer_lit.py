@@ -1,73 +1,120 @@
+import numpy as np
 import wgpu
-from ..gpu_utils import read_text
+from ..pipeline_cache import get_pipeline_cache
+
+# Nb max de bind groups de grille gardés en cache (comme les bundles de Scene)
+_MAX_GRID_BGS = 8
 
 
 class ClothRendererLit:
-    def __init__(self, canvas, device, tri_index_count: int):
-        self.canvas = canvas
+    """
+    Renderer surface du tissu (éclairé).
+
+    vertex_normals=True : normales calculées dans le vertex shader à partir des
+    4 voisins de grille (buffer de positions lu en storage, grid = (W, H)) ;
+    le buffer de normales n'est plus lu, la passe compute normales devient
+    inutile.
+
+    procedural=True : draw non indexé de tri_index_count vertex, le sommet de
+    grille est déduit de vertex_index (grid = (W, H)) et positions / normales
+    sont lues en storage ; pas d'index buffer (record(..., None)).
+
+    instanced=True : B tissus concaténés dans les mêmes buffers (tissu b =
+    sommets [b*W*H, (b+1)*W*H)) dessinés en un seul draw instancié, lus en
+    storage avec un décalage monde par instance (record(..., instance_buffer,
+    instance_count)). Normales toujours lues dans le buffer (pas de
+    vertex_normals).
+    """
+
+    def __init__(self, texture_format, device, tri_index_count: int, frame, vertex_normals: bool = False, grid=None,
+                 procedural: bool = False, instanced: bool = False):
         self.device = device
         self.queue = device.queue
         self.tri_index_count = int(tri_index_count)
+        self.vertex_normals = bool(vertex_normals)
+        self.procedural = bool(procedural)
+        self.instanced = bool(instanced)
+        if self.instanced and self.vertex_normals:
+            raise ValueError("instanced et vertex_normals sont incompatibles (normales lues dans le buffer)")
+        # format de la cible (swapchain ou texture offscreen)
+        self.texture_format = texture_format
 
-        self.context = canvas.get_context("wgpu")
-        self.texture_format = self.context.get_preferred_format(device.adapter)
-
-        shader = device.create_shader_module(code=read_text("shaders/render_lit.wgsl"))
+        cache = get_pipeline_cache(device)
+        defines = {}
+        if self.vertex_normals:
+            defines["VERTEX_NORMALS"] = 1
+        if self.procedural:
+            defines["PROCEDURAL_GRID"] = 1
+        if self.instanced:
+            defines["INSTANCED"] = 1
+        shader = cache.shader_module_file("render_lit.wgsl", defines)
 
        
-        # Camera uniform 
-        self.cam_buf = device.create_buffer(
-            size=64,
-            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
-        )
+        # Uniform de frame partagé (caméra, lumière)
+        self.frame = frame
 
-        self.cam_bgl = device.create_bind_group_layout(entries=[
-            {
-                "binding": 0,
-                "visibility": wgpu.ShaderStage.VERTEX,
-                "buffer": {"type": wgpu.BufferBindingType.uniform},
-            }
-        ])
-
-        self.cam_bg = device.create_bind_group(
-            layout=self.cam_bgl,
-            entries=[{
-                "binding": 0,
-                "resource": {"buffer": self.cam_buf, "offset": 0, "size": 64},
-            }],
-        )
+        # Vertex buffers : positions, plus normales sans vertex_normals
+        # (aucun en procédural / instancié : tout est lu en storage)
+        self.grid_storage = self.vertex_normals or self.procedural or self.instanced
+        self.normal_storage = self.instanced or (self.procedural and not self.vertex_normals)
+        vertex_buffers = []
+        if not (self.procedural or self.instanced):
+            # positions (location 0)
+            vertex_buffers.append({
+                "array_stride": 16,
+                "step_mode": wgpu.VertexStepMode.vertex,
+                "attributes": [{
+                    "shader_location": 0,
+                    "offset": 0,
+                    "format": wgpu.VertexFormat.float32x4,
+                }],
+            })
+            if not self.vertex_normals:
+                # normals (location 1)
+                vertex_buffers.append({
+                    "array_stride": 16,
+                    "step_mode": wgpu.VertexStepMode.vertex,
+                    "attributes": [{
+                        "shader_location": 1,
+                        "offset": 0,
+                        "format": wgpu.VertexFormat.float32x4,
+                    }],
+                })
+        bgls = [frame.bgl]
+
+        # group 1 : positions en storage + taille de grille (+ normales,
+        # décalages d'instance)
+        if self.grid_storage:
+            W, H = grid
+            self.grid_buf = device.create_buffer_with_data(
+                data=np.array([W, H, W * H, 0], dtype=np.uint32).tobytes(),
+                usage=wgpu.BufferUsage.UNIFORM,
+            )
+            entries = [
+                {"binding": 0, "visibility": wgpu.ShaderStage.VERTEX, "buffer": {"type": "read-only-storage"}},
+                {"binding": 1, "visibility": wgpu.ShaderStage.VERTEX, "buffer": {"type": "uniform"}},
+            ]
+            for binding, used in ((2, self.normal_storage), (3, self.instanced)):
+                if used:
+                    entries.append({
+                        "binding": binding,
+                        "visibility": wgpu.ShaderStage.VERTEX,
+                        "buffer": {"type": "read-only-storage"},
+                    })
+            self.grid_bgl = cache.bind_group_layout(entries)
+            bgls.append(self.grid_bgl)
+            self._grid_bgs = {}  # (positions, normales, instances) -> bind group
 
-        pipeline_layout = device.create_pipeline_layout(bind_group_layouts=[self.cam_bgl])
+        pipeline_layout = cache.pipeline_layout(bgls)
 
        
         # Render pipeline avec depth
-        self.pipeline = device.create_render_pipeline(
+        self.pipeline = cache.render_pipeline(
             layout=pipeline_layout,
             vertex={
                 "module": shader,
                 "entry_point": "vs_main",
-                "buffers": [
-                    # positions (location 0)
-                    {
-                        "array_stride": 16,
-                        "step_mode": wgpu.VertexStepMode.vertex,
-                        "attributes": [{
-                            "shader_location": 0,
-                            "offset": 0,
-                            "format": wgpu.VertexFormat.float32x4,
-                        }],
-                    },
-                    # normals (location 1)
-                    {
-                        "array_stride": 16,
-                        "step_mode": wgpu.VertexStepMode.vertex,
-                        "attributes": [{
-                            "shader_location": 1,
-                            "offset": 0,
-                            "format": wgpu.VertexFormat.float32x4,
-                        }],
-                    },
-                ],
+                "buffers": vertex_buffers,
             },
             fragment={
                 "module": shader,
@@ -87,29 +134,47 @@ class ClothRendererLit:
             },
         )
 
-    def set_mvp(self, mvp: bytes):
-        self.queue.write_buffer(self.cam_buf, 0, mvp)
-
-    def encode(self, enc, color_view, position_buffer, normal_buffer, tri_index_buffer, depth_view, clear: bool = True):
-        rp = enc.begin_render_pass(
-            color_attachments=[{
-                "view": color_view,
-                "load_op": wgpu.LoadOp.clear if clear else wgpu.LoadOp.load,
-                "store_op": wgpu.StoreOp.store,
-                "clear_value": (0.1, 0.1, 0.1, 1.0),
-            }],
-            depth_stencil_attachment={
-                "view": depth_view,
-                "depth_load_op": wgpu.LoadOp.clear if clear else wgpu.LoadOp.load,
-                "depth_store_op": wgpu.StoreOp.store,
-                "depth_clear_value": 1.0,
-            },
-        )
+    def _grid_bind_group(self, position_buffer, normal_buffer, instance_buffer):
+        key = (position_buffer, normal_buffer, instance_buffer)
+        bg = self._grid_bgs.get(key)
+        if bg is None:
+            # buffers remplacés (balayage, relecture rechargée) : on repart de zéro
+            if len(self._grid_bgs) >= _MAX_GRID_BGS:
+                self._grid_bgs.clear()
+            entries = [
+                {"binding": 0, "resource": {"buffer": position_buffer}},
+                {"binding": 1, "resource": {"buffer": self.grid_buf}},
+            ]
+            if self.normal_storage:
+                entries.append({"binding": 2, "resource": {"buffer": normal_buffer}})
+            if self.instanced:
+                entries.append({"binding": 3, "resource": {"buffer": instance_buffer}})
+            bg = self.device.create_bind_group(layout=self.grid_bgl, entries=entries)
+            self._grid_bgs[key] = bg
+        return bg
 
+    def record(self, rp, position_buffer, normal_buffer, tri_index_buffer, instance_buffer=None,
+               instance_count: int = 1):
+        """
+        Enregistre le dessin dans une render pass ou un render bundle (attachments fournis par Scene).
+        normal_buffer est ignoré avec vertex_normals, tri_index_buffer en procédural,
+        instance_buffer (décalages vec4) sans instanced.
+        """
         rp.set_pipeline(self.pipeline)
-        rp.set_bind_group(0, self.cam_bg, [], 0, 999999)
-        rp.set_vertex_buffer(0, position_buffer, 0)
-        rp.set_vertex_buffer(1, normal_buffer, 0)
+        rp.set_bind_group(0, self.frame.bind_group, [], 0, 999999)
+        if self.grid_storage:
+            if not self.normal_storage:
+                normal_buffer = None  # non lu
+            if not self.instanced:
+                instance_buffer, instance_count = None, 1
+            bg = self._grid_bind_group(position_buffer, normal_buffer, instance_buffer)
+            rp.set_bind_group(1, bg, [], 0, 999999)
+        if self.procedural:
+            rp.draw(self.tri_index_count, instance_count, 0, 0)
+            return
+        if not self.instanced:
+            rp.set_vertex_buffer(0, position_buffer, 0)
+            if not self.vertex_normals:
+                rp.set_vertex_buffer(1, normal_buffer, 0)
         rp.set_index_buffer(tri_index_buffer, wgpu.IndexFormat.uint32, 0)
-        rp.draw_indexed(self.tri_index_count, 1, 0, 0, 0)
-        rp.end()
+        rp.draw_indexed(self.tri_index_count, instance_count, 0, 0, 0)
@@ -0,0 +1,44 @@
+import numpy as np
+import wgpu
+
+from ..pipeline_cache import get_pipeline_cache
+
+
+class FrameUniform:
+    """
+    Uniform de frame commun à tous les renderers (shaders/common/frame.wgsl) :
+    view, proj, MVP, position caméra, direction de la lumière.
+    Un seul buffer, un seul bind group (group 0) ; écrit une fois par frame.
+    """
+
+    SIZE = 3 * 64 + 2 * 16
+
+    def __init__(self, device):
+        self.device = device
+        cache = get_pipeline_cache(device)
+
+        self.buffer = device.create_buffer(
+            size=self.SIZE,
+            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
+        )
+        self.bgl = cache.bind_group_layout([{
+            "binding": 0,
+            "visibility": wgpu.ShaderStage.VERTEX | wgpu.ShaderStage.FRAGMENT,
+            "buffer": {"type": wgpu.BufferBindingType.uniform},
+        }])
+        self.bind_group = device.create_bind_group(layout=self.bgl, entries=[{
+            "binding": 0,
+            "resource": {"buffer": self.buffer, "offset": 0, "size": self.SIZE},
+        }])
+
+        self._data = np.zeros(self.SIZE // 4, dtype=np.float32)
+
+    def write(self, view, proj, mvp, eye, light):
+        """Matrices numpy (convention colonne, transposées ici) + vec3 eye / light."""
+        d = self._data
+        d[0:16] = view.T.ravel()
+        d[16:32] = proj.T.ravel()
+        d[32:48] = mvp.T.ravel()
+        d[48:51] = eye
+        d[52:55] = light
+        self.device.queue.write_buffer(self.buffer, 0, d)
@@ -0,0 +1,67 @@
+import wgpu
+from ..pipeline_cache import get_pipeline_cache
+
+
+class SphereImpostorRenderer:
+    """
+    Sphères en imposteurs instanciés (shaders/render_sphere_impostor.wgsl) :
+    un quad de 4 vertex par sphère, rayon lancé dans le fragment shader,
+    frag_depth exact (se croise correctement avec le tissu).
+    - wire=False : surface éclairée (écrit le depth)
+    - wire=True  : lignes latitude / longitude (overlay, depth en lecture seule)
+    - record(rp, sphere_buf, count) : sphere_buf = storage de vec4 (cx, cy, cz, r)
+    """
+
+    def __init__(self, texture_format, device, frame, wire: bool = False):
+        self.device = device
+        self.wire = bool(wire)
+        # format de la cible (swapchain ou texture offscreen)
+        self.texture_format = texture_format
+
+        cache = get_pipeline_cache(device)
+        shader = cache.shader_module_file("render_sphere_impostor.wgsl", {"WIRE": 1} if self.wire else None)
+
+        # Uniform de frame partagé (caméra, lumière)
+        self.frame = frame
+
+        self.sphere_bgl = cache.bind_group_layout([{
+            "binding": 0,
+            "visibility": wgpu.ShaderStage.VERTEX,
+            "buffer": {"type": "read-only-storage"},
+        }])
+        self._bgs = {}  # buffer de sphères -> bind group
+
+        pl = cache.pipeline_layout([frame.bgl, self.sphere_bgl])
+
+        self.pipeline = cache.render_pipeline(
+            layout=pl,
+            vertex={"module": shader, "entry_point": "vs_main", "buffers": []},
+            fragment={
+                "module": shader,
+                "entry_point": "fs_main",
+                "targets": [{"format": self.texture_format}],
+            },
+            primitive={"topology": wgpu.PrimitiveTopology.triangle_strip, "cull_mode": wgpu.CullMode.none},
+            depth_stencil={
+                "format": wgpu.TextureFormat.depth24plus,
+                "depth_write_enabled": not self.wire,
+                # le wireframe recalcule le même depth que la surface
+                "depth_compare": wgpu.CompareFunction.less_equal if self.wire else wgpu.CompareFunction.less,
+            },
+        )
+
+    def _bind_group(self, sphere_buf):
+        bg = self._bgs.get(sphere_buf)
+        if bg is None:
+            bg = self.device.create_bind_group(layout=self.sphere_bgl, entries=[
+                {"binding": 0, "resource": {"buffer": sphere_buf}},
+            ])
+            self._bgs[sphere_buf] = bg
+        return bg
+
+    def record(self, rp, sphere_buf, count: int):
+        """Enregistre le dessin dans une render pass ou un render bundle (attachments fournis par Scene)."""
+        rp.set_pipeline(self.pipeline)
+        rp.set_bind_group(0, self.frame.bind_group, [], 0, 999999)
+        rp.set_bind_group(1, self._bind_group(sphere_buf), [], 0, 999999)
+        rp.draw(4, count, 0, 0)
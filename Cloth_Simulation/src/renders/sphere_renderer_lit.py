@@ -1,43 +1,31 @@
 import wgpu
 import numpy as np
-from ..gpu_utils import read_text
+from ..pipeline_cache import get_pipeline_cache
 
 
 class SphereRendererLit:
     """
     Sphere surface renderer (triangles).
-    - set_mvp(mvp_bytes)
     - set_sphere((cx,cy,cz), r)
-    - encode(enc, color_view, sphere_pos_buf, sphere_tri_idx_buf, depth_view, clear=False)
+    - record(rp, sphere_pos_buf, sphere_tri_idx_buf)
     """
-    def __init__(self, canvas, device, index_count: int):
-        self.canvas = canvas
+    def __init__(self, texture_format, device, index_count: int, frame):
         self.device = device
         self.queue = device.queue
         self.index_count = int(index_count)
-
-        self.context = canvas.get_context("wgpu")
-        self.texture_format = self.context.get_preferred_format(device.adapter)
+        # format de la cible (swapchain ou texture offscreen)
+        self.texture_format = texture_format
         
 
-        shader_code = read_text("shaders/render_sphere_lit.wgsl")
-        shader = device.create_shader_module(code=shader_code)
+        cache = get_pipeline_cache(device)
+        shader = cache.shader_module_file("render_sphere_lit.wgsl")
 
-        # Camera uniform 
-        self.cam_buf = device.create_buffer(size=64, usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST)
-        self.cam_bgl = device.create_bind_group_layout(entries=[{
-            "binding": 0,
-            "visibility": wgpu.ShaderStage.VERTEX,
-            "buffer": {"type": wgpu.BufferBindingType.uniform},
-        }])
-        self.cam_bg = device.create_bind_group(layout=self.cam_bgl, entries=[{
-            "binding": 0,
-            "resource": {"buffer": self.cam_buf, "offset": 0, "size": 64}
-        }])
+        # Uniform de frame partagé (caméra, lumière)
+        self.frame = frame
 
         # SphereU uniform
         self.sphere_buf = device.create_buffer(size=112, usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST)
-        self.sphere_bgl = device.create_bind_group_layout(entries=[{
+        self.sphere_bgl = cache.bind_group_layout([{
             "binding": 0,
             "visibility": wgpu.ShaderStage.VERTEX | wgpu.ShaderStage.FRAGMENT,
             "buffer": {"type": wgpu.BufferBindingType.uniform},
@@ -47,10 +35,10 @@ class SphereRendererLit:
             "resource": {"buffer": self.sphere_buf, "offset": 0, "size": 112}
         }])
 
-        pl = device.create_pipeline_layout(bind_group_layouts=[self.cam_bgl, self.sphere_bgl])
+        pl = cache.pipeline_layout([frame.bgl, self.sphere_bgl])
 
         # Pipeline triangles et depth
-        self.pipeline = device.create_render_pipeline(
+        self.pipeline = cache.render_pipeline(
             layout=pl,
             vertex={
                 "module": shader,
@@ -77,9 +65,6 @@ class SphereRendererLit:
         # default sphere
         self.set_sphere((0.0, 1.0, 0.0), 0.8)
 
-    def set_mvp(self, mvp_bytes: bytes):
-        self.queue.write_buffer(self.cam_buf, 0, mvp_bytes)
-
     def set_sphere(self, center_xyz, radius: float):
         cx, cy, cz = center_xyz
         vecs = np.array([
@@ -93,26 +78,11 @@ class SphereRendererLit:
         ], dtype=np.float32)
         self.queue.write_buffer(self.sphere_buf, 0, vecs.tobytes())
 
-    def encode(self, enc, color_view, sphere_pos_buf, sphere_tri_idx_buf, depth_view, clear: bool = False):
-        rp = enc.begin_render_pass(
-            color_attachments=[{
-                "view": color_view,
-                "load_op": wgpu.LoadOp.clear if clear else wgpu.LoadOp.load,
-                "store_op": wgpu.StoreOp.store,
-                "clear_value": (0.1, 0.1, 0.1, 1.0),
-            }],
-            depth_stencil_attachment={
-                "view": depth_view,
-                "depth_load_op": wgpu.LoadOp.clear if clear else wgpu.LoadOp.load,
-                "depth_store_op": wgpu.StoreOp.store,
-                "depth_clear_value": 1.0,
-            },
-        )
-
+    def record(self, rp, sphere_pos_buf, sphere_tri_idx_buf):
+        """Enregistre le dessin dans une render pass ou un render bundle (attachments fournis par Scene)."""
         rp.set_pipeline(self.pipeline)
-        rp.set_bind_group(0, self.cam_bg, [], 0, 999999)
+        rp.set_bind_group(0, self.frame.bind_group, [], 0, 999999)
         rp.set_bind_group(1, self.sphere_bg, [], 0, 999999)
         rp.set_vertex_buffer(0, sphere_pos_buf, 0)
         rp.set_index_buffer(sphere_tri_idx_buf, wgpu.IndexFormat.uint32, 0)
         rp.draw_indexed(self.index_count, 1, 0, 0, 0)
-        rp.end()
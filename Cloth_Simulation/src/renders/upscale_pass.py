@@ -0,0 +1,91 @@
+import numpy as np
+import wgpu
+
+from ..pipeline_cache import get_pipeline_cache
+
+
+class UpscalePass:
+    """
+    Passe plein écran (shaders/upscale.wgsl) : texture rendue en résolution
+    réduite -> cible finale (swapchain ou texture offscreen).
+    - sharpen=0 : bilinéaire seul
+    - sharpen>0 : bilinéaire + masque flou sur 4 voisins (force, ~0.1 à 0.5)
+    - draw(device, src_view, src_size, dst_view) : une render pass, soumise
+    """
+
+    def __init__(self, texture_format, device, sharpen: float = 0.0):
+        self.device = device
+        self.texture_format = texture_format
+        self.sharpen = float(sharpen)
+
+        # GpuProfiler optionnel (timestamps de la passe "upscale")
+        self.profiler = None
+
+        cache = get_pipeline_cache(device)
+        shader = cache.shader_module_file("upscale.wgsl", {"SHARPEN": 1} if self.sharpen > 0 else None)
+
+        self.bgl = cache.bind_group_layout([
+            {"binding": 0, "visibility": wgpu.ShaderStage.FRAGMENT, "texture": {"sample_type": "float"}},
+            {"binding": 1, "visibility": wgpu.ShaderStage.FRAGMENT, "sampler": {"type": "filtering"}},
+            {"binding": 2, "visibility": wgpu.ShaderStage.FRAGMENT,
+             "buffer": {"type": wgpu.BufferBindingType.uniform}},
+        ])
+        self.sampler = device.create_sampler(
+            mag_filter=wgpu.FilterMode.linear,
+            min_filter=wgpu.FilterMode.linear,
+            address_mode_u=wgpu.AddressMode.clamp_to_edge,
+            address_mode_v=wgpu.AddressMode.clamp_to_edge,
+        )
+        self.params = device.create_buffer(size=16, usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST)
+
+        self.pipeline = cache.render_pipeline(
+            layout=cache.pipeline_layout([self.bgl]),
+            vertex={"module": shader, "entry_point": "vs_main", "buffers": []},
+            fragment={
+                "module": shader,
+                "entry_point": "fs_main",
+                "targets": [{"format": self.texture_format}],
+            },
+            primitive={"topology": wgpu.PrimitiveTopology.triangle_list},
+        )
+
+        # bind group de la dernière source (recréé quand la cible réduite change)
+        self._src = None
+        self._bg = None
+
+    def _bind_group(self, src_view, src_size):
+        if self._src is not src_view:
+            w, h = src_size
+            self.device.queue.write_buffer(
+                self.params, 0, np.array([1.0 / w, 1.0 / h, self.sharpen, 0.0], dtype=np.float32),
+            )
+            self._bg = self.device.create_bind_group(layout=self.bgl, entries=[
+                {"binding": 0, "resource": src_view},
+                {"binding": 1, "resource": self.sampler},
+                {"binding": 2, "resource": {"buffer": self.params, "offset": 0, "size": 16}},
+            ])
+            self._src = src_view
+        return self._bg
+
+    def draw(self, device, src_view, src_size, dst_view):
+        bg = self._bind_group(src_view, src_size)
+
+        enc = device.create_command_encoder()
+        rp = enc.begin_render_pass(
+            color_attachments=[{
+                "view": dst_view,
+                "load_op": wgpu.LoadOp.clear,  # entièrement recouvert, pas de relecture
+                "store_op": wgpu.StoreOp.store,
+                "clear_value": (0.0, 0.0, 0.0, 1.0),
+            }],
+            timestamp_writes=self.profiler.timestamp_writes("upscale") if self.profiler is not None else None,
+        )
+        rp.set_pipeline(self.pipeline)
+        rp.set_bind_group(0, bg, [], 0, 999999)
+        rp.draw(3, 1, 0, 0)
+        rp.end()
+
+        if self.profiler is not None:
+            self.profiler.submit(enc, "upscale")
+        else:
+            device.queue.submit([enc.finish()])
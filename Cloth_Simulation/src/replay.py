@@ -0,0 +1,131 @@
+import hashlib
+import json
+import time
+
+import numpy as np
+
+from src.gpu_utils import wait_gpu_idle
+from src.simulation import ClothSimulation
+
+"""
+Mode déterministe + traces de référence (golden traces).
+
+Un scénario (JSON) fixe la grille, le nombre de frames et tous les paramètres :
+la simulation est alors avancée exactement `frames` fois, avec SUBSTEPS fixe,
+sans horloge ni entrée utilisateur. À chaque frame on garde une trace compacte :
+- AABB des positions (min xyz, max xyz)
+- énergie (cinétique + potentielle de gravité)
+- hash 64 bits des positions quantifiées
+
+compare_traces() rejoue un scénario contre une trace enregistrée et mesure la dérive.
+"""
+
+# Pas de quantification des positions avant hash (m)
+HASH_QUANTUM = 1e-4
+
+
+def load_scenario(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_simulation(device, scenario: dict) -> ClothSimulation:
+    """Crée une simulation configurée par le scénario."""
+    sim = ClothSimulation(device, scenario.get("W", 22), scenario.get("H", 22))
+    for name, value in scenario.get("params", {}).items():
+        if name not in sim.PARAM_NAMES:
+            raise ValueError(f"paramètre inconnu dans le scénario : {name}")
+        setattr(sim, name, value)
+    if any(name in sim.GEOMETRY_PARAMS for name in scenario.get("params", {})):
+        # espacement / placement du tissu : l'état initial en dépend
+        sim.rebuild_initial_state()
+    return sim
+
+
+def frame_record(sim, pos: np.ndarray, vel: np.ndarray):
+    """(aabb (6,), énergie, hash) pour une frame."""
+    p = pos[:, :3]
+    v = vel[:, :3]
+
+    aabb = np.concatenate([p.min(axis=0), p.max(axis=0)])
+
+    kinetic = 0.5 * sim.MASS * float(np.sum(v.astype(np.float64) ** 2))
+    potential = sim.MASS * (-sim.G) * float(np.sum(p[:, 1].astype(np.float64) - sim.FLOOR_Y))
+
+    q = np.rint(p / HASH_QUANTUM).astype(np.int32)
+    h = np.frombuffer(hashlib.blake2b(q.tobytes(), digest_size=8).digest(), dtype=np.uint64)[0]
+
+    return aabb, kinetic + potential, h
+
+
+def record_trace(device, scenario: dict) -> dict:
+    """Rejoue le scénario et retourne la trace + le débit (steps/s)."""
+    sim = make_simulation(device, scenario)
+    frames = int(scenario["frames"])
+    q = device.queue
+
+    aabb = np.zeros((frames, 6), dtype=np.float32)
+    energy = np.zeros(frames, dtype=np.float64)
+    hashes = np.zeros(frames, dtype=np.uint64)
+
+    step_time = 0.0
+    for k in range(frames):
+        t0 = time.perf_counter()
+        sim.step()
+        wait_gpu_idle(device)
+        step_time += time.perf_counter() - t0
+
+        pos = np.frombuffer(q.read_buffer(sim.current_pos_buffer), dtype=np.float32).reshape(-1, 4)
+        vel = np.frombuffer(q.read_buffer(sim.current_vel_buffer), dtype=np.float32).reshape(-1, 4)
+        aabb[k], energy[k], hashes[k] = frame_record(sim, pos, vel)
+
+    return {
+        "aabb": aabb,
+        "energy": energy,
+        "hashes": hashes,
+        "steps_per_sec": frames / step_time if step_time > 0 else float("inf"),
+        "substeps_per_sec": frames * sim.SUBSTEPS / step_time if step_time > 0 else float("inf"),
+        "adapter": device.adapter.info.get("device", ""),
+    }
+
+
+def save_trace(path: str, trace: dict, scenario: dict):
+    np.savez_compressed(
+        path,
+        aabb=trace["aabb"],
+        energy=trace["energy"],
+        hashes=trace["hashes"],
+        scenario=np.frombuffer(json.dumps(scenario).encode("utf-8"), dtype=np.uint8),
+        adapter=np.frombuffer(trace["adapter"].encode("utf-8"), dtype=np.uint8),
+    )
+
+
+def load_trace(path: str) -> dict:
+    with np.load(path) as z:
+        return {
+            "aabb": z["aabb"],
+            "energy": z["energy"],
+            "hashes": z["hashes"],
+            "scenario": json.loads(z["scenario"].tobytes().decode("utf-8")),
+            "adapter": z["adapter"].tobytes().decode("utf-8"),
+        }
+
+
+def compare_traces(ref: dict, new: dict) -> dict:
+    """Dérive de `new` par rapport à la référence `ref`."""
+    n = min(len(ref["hashes"]), len(new["hashes"]))
+
+    aabb_drift = np.abs(ref["aabb"][:n] - new["aabb"][:n]).max(axis=1)
+    e_ref = ref["energy"][:n]
+    energy_drift = np.abs(new["energy"][:n] - e_ref) / np.maximum(np.abs(e_ref), 1e-9)
+
+    mismatch = np.nonzero(ref["hashes"][:n] != new["hashes"][:n])[0]
+
+    return {
+        "frames": n,
+        "frame_count_match": len(ref["hashes"]) == len(new["hashes"]),
+        "max_aabb_drift": float(aabb_drift.max()) if n else 0.0,
+        "max_energy_drift": float(energy_drift.max()) if n else 0.0,
+        "hash_mismatches": int(mismatch.size),
+        "first_mismatch": int(mismatch[0]) if mismatch.size else None,
+    }
@@ -1,5 +1,4 @@
 import numpy as np
-import inspect
 import wgpu
 
 from src.camera import look_at, perspective
@@ -14,20 +13,43 @@ from src.renders.cloth_renderer import ClothRenderer
 from src.renders.cloth_renderer_lit import ClothRendererLit
 from src.renders.sphere_renderer import SphereRenderer
 from src.renders.sphere_renderer_lit import SphereRendererLit
+from src.renders.sphere_impostor_renderer import SphereImpostorRenderer
+from src.renders.frame_uniform import FrameUniform
 
 """
 Gestion de la scène visible :
-- rendu du tissu (surface + wireframe)
-- rendu de la sphère (surface + wireframe)
-- gestion de la caméra et du MVP
+- rendu du tissu (surface + wireframe), indexé ou procédural
+  (procedural_grid : aucun index buffer, sommets déduits de vertex_index)
+- rendu de la sphère (surface + wireframe), maillage UV ou imposteurs
+  (sphere_impostors : un quad instancié par sphère, lancer de rayon)
+- lot de tissus (ClothBatch, show_batch) : B tissus et leurs sphères en un
+  draw instancié par renderer
+- gestion de la caméra et du MVP (uniform de frame partagé, réécrit une
+  fois par frame si la caméra a changé)
+
+Tout est dessiné dans une seule render pass (un clear, un store du color,
+depth jeté en fin de passe) qui exécute un render bundle. Les bundles sont
+en cache par (objets visibles, buffers) : reconstruits seulement quand un
+toggle ou un buffer change (au plus 2 variantes avec le ping-pong).
 """
 
+# Nb max de render bundles gardés en cache
+_MAX_BUNDLES = 8
 
 
 class Scene:
-    def __init__(self, canvas, device):
+    def __init__(self, texture_format, device, W: int = 22, H: int = 22, vertex_normals: bool = False,
+                 procedural_grid: bool = False, sphere_impostors: bool = False):
         self.device = device
-        self.canvas = canvas
+        # format de la cible couleur (swapchain ou OffscreenTarget)
+        self.texture_format = texture_format
+        self.W, self.H = int(W), int(H)  # taille de grille du tissu (= simulation)
+        # normales du tissu calculées dans le vertex shader (normal_buf non lu)
+        self.vertex_normals = bool(vertex_normals)
+        # tissu dessiné sans index buffers (sommets déduits de vertex_index)
+        self.procedural_grid = bool(procedural_grid)
+        # sphères en imposteurs (buffer storage de (cx, cy, cz, r)) au lieu des maillages UV
+        self.sphere_impostors = bool(sphere_impostors)
 
         # FLAGS DE RENDU (toggles clavier)
         self.show_cloth_surface = True
@@ -35,6 +57,28 @@ class Scene:
         self.show_sphere_surface = True
         self.show_sphere_wire = True
 
+        # RELECTURE : si défini (TrajectoryPlayer), le tissu affiché vient
+        # de l'enregistrement et non de la simulation
+        self.playback = None
+        # Source optionnelle du tissu affiché (current_pos_buffer, normal_buf) :
+        # FrameInterpolator (pas fixe interpolé) ou SimulationThread (dernier
+        # état publié par le thread de simulation)
+        self.cloth_source = None
+        # LOT : si défini (ClothBatch, voir show_batch), B tissus côte à côte
+        # remplacent le tissu et la sphère de la simulation
+        self.batch = None
+        self._batch_renderers = None
+
+        # GpuProfiler optionnel (timestamps par passe de rendu)
+        self.profiler = None
+        # FrameTimer optionnel (temps CPU d'encodage / soumission)
+        self.frame_timer = None
+
+        # Render bundles en cache (clé : renderers visibles + buffers)
+        self._bundles = {}
+        # Dernière sphère envoyée aux renderers (réécrite seulement si elle change)
+        self._sphere_state = None
+
         # CAMERA ORBIT
         self._init_camera()
         self.camera = self # pour compatibilité avec InputController
@@ -42,7 +86,7 @@ class Scene:
         # GEOMETRIE & RENDERERS
         self._init_cloth_geometry()
         self._init_sphere_geometry()
-        self._init_renderers(canvas, device)
+        self._init_renderers(texture_format, device)
 
 
     # CAMERA
@@ -62,9 +106,18 @@ class Scene:
         self.DIST_MIN = 1.5
         self.DIST_MAX = 10.0
 
+        self.FAR = 50.0
+
         self.ROT_SPEED = 0.006
         self.ZOOM_SPEED = 0.15
 
+        # Direction vers la lumière (commune au tissu et à la sphère)
+        light = np.array([0.3, 1.0, 0.4], dtype=np.float32)
+        self.light_dir = light / np.linalg.norm(light)
+
+        # Uniform de frame à réécrire (caméra modifiée depuis la dernière frame)
+        self.camera_dirty = True
+
     def clamp(self, v, a, b):
         return a if v < a else b if v > b else v
 
@@ -81,23 +134,41 @@ class Scene:
         eye = self.target + self.cam_dist * np.array([dir_x, dir_y, dir_z], dtype=np.float32)
         return tuple(eye.tolist())
 
-    def update_mvp(self):
+    def set_viewport(self, width: int, height: int):
+        """Taille de la cible de rendu (ratio de la projection)."""
+        aspect = width / max(height, 1)
+        if aspect != self.aspect:
+            self.aspect = aspect
+            self.invalidate_camera()
+
+    def invalidate_camera(self):
+        """À appeler quand yaw / pitch / dist / aspect changent (événements d'entrée)."""
+        self.camera_dirty = True
+
+    def update_frame_uniform(self):
+        """Réécrit l'uniform de frame si la caméra a changé (une fois par frame)."""
+        if not self.camera_dirty:
+            return
         eye = self.compute_eye()
         view = look_at(eye, tuple(self.target), (0.0, 1.0, 0.0))
-        proj = perspective(70.0, self.aspect, 0.05, 50.0)
+        proj = perspective(70.0, self.aspect, 0.05, self.FAR)
         mvp = proj @ view @ self.model
-        mvp_bytes = mvp.T.astype(np.float32).tobytes()
 
-        # Envoi aux renderers
-        self.renderer_lit.set_mvp(mvp_bytes)
-        self.renderer_wire.set_mvp(mvp_bytes)
-        self.sphere_renderer.set_mvp(mvp_bytes)
-        self.sphere_renderer_lit.set_mvp(mvp_bytes)
+        self.frame.write(view, proj, mvp, eye, self.light_dir)
+        self.camera_dirty = False
 
 
     # GEOMETRIE
     def _init_cloth_geometry(self):
-        W, H = 22, 22  # doit correspondre à simulation.py sinon ça bug
+        W, H = self.W, self.H
+        if self.procedural_grid:
+            # pas d'index : mêmes nombres de vertex que make_grid_indices /
+            # make_grid_line_indices(diagonals=True)
+            self.tri_index_count = 6 * (W - 1) * (H - 1)
+            self.line_index_count = 2 * (H * (W - 1) + (H - 1) * W + (W - 1) * (H - 1))
+            self.idx_buf = self.tri_idx_buf = None
+            return
+
         self.idx_np = np.asarray(make_grid_line_indices(W, H, diagonals=True), np.uint32)
         self.tri_idx_np = np.asarray(make_grid_indices(W, H), np.uint32)
 
@@ -109,8 +180,16 @@ class Scene:
             data=self.tri_idx_np.tobytes(),
             usage=wgpu.BufferUsage.INDEX,
         )
+        self.tri_index_count = self.tri_idx_np.size
+        self.line_index_count = self.idx_np.size
 
     def _init_sphere_geometry(self):
+        if self.sphere_impostors:
+            self.sphere_buf = None
+            self.sphere_capacity = 0
+            self.sphere_count = 0
+            return
+
         pos, idx = make_uv_sphere_wire(16, 32)
         self.sphere_pos_buf = self.device.create_buffer_with_data(
             data=np.asarray(pos, np.float32).tobytes(),
@@ -133,58 +212,197 @@ class Scene:
 
 
     # RENDERERS
-    def _init_renderers(self, canvas, device):
-        self.renderer_lit = ClothRendererLit(canvas, device, self.tri_idx_np.size)
-        self.renderer_wire = ClothRenderer(canvas, device, self.idx_np.size)
+    def _init_renderers(self, fmt, device):
+        self.frame = FrameUniform(device)
 
-        self.sphere_renderer = SphereRenderer(canvas, device, self.sphere_idx_buf.size // 4)
-        self.sphere_renderer_lit = SphereRendererLit(canvas, device, self.sphere_tri_idx_buf.size // 4)
+        grid = (self.W, self.H)
+        self.renderer_lit = ClothRendererLit(
+            fmt, device, self.tri_index_count, self.frame,
+            vertex_normals=self.vertex_normals, grid=grid, procedural=self.procedural_grid,
+        )
+        self.renderer_wire = ClothRenderer(
+            fmt, device, self.line_index_count, self.frame,
+            grid=grid, procedural=self.procedural_grid,
+        )
 
-        self.update_mvp()
+        if self.sphere_impostors:
+            self.sphere_renderer = SphereImpostorRenderer(fmt, device, self.frame, wire=True)
+            self.sphere_renderer_lit = SphereImpostorRenderer(fmt, device, self.frame)
+        else:
+            self.sphere_renderer = SphereRenderer(fmt, device, self.sphere_idx_buf.size // 4, self.frame)
+            self.sphere_renderer_lit = SphereRendererLit(fmt, device, self.sphere_tri_idx_buf.size // 4, self.frame)
+
+    def show_batch(self, batch):
+        """Affiche un ClothBatch (None : retour à la simulation) et recadre la caméra."""
+        if batch is not None and (batch.W, batch.H) != (self.W, self.H):
+            raise ValueError(f"lot {batch.W}x{batch.H} pour une scène {self.W}x{self.H}")
+        self.batch = batch
+        if batch is None:
+            return
+        if self._batch_renderers is None:
+            # renderers instanciés, créés au premier lot (sphères : imposteurs)
+            fmt, device, grid = self.texture_format, self.device, (self.W, self.H)
+            lit = ClothRendererLit(
+                fmt, device, self.tri_index_count, self.frame,
+                grid=grid, procedural=self.procedural_grid, instanced=True,
+            )
+            wire = ClothRenderer(
+                fmt, device, self.line_index_count, self.frame,
+                grid=grid, procedural=self.procedural_grid, instanced=True,
+            )
+            if self.sphere_impostors:
+                spheres = (self.sphere_renderer_lit, self.sphere_renderer)
+            else:
+                spheres = (
+                    SphereImpostorRenderer(fmt, device, self.frame),
+                    SphereImpostorRenderer(fmt, device, self.frame, wire=True),
+                )
+            self._batch_renderers = (lit, wire) + spheres
+        extent = batch.extent
+        self.target = np.array([0.0, 1.0, 0.0], dtype=np.float32)
+        self.DIST_MAX = max(self.DIST_MAX, 2.0 * extent)
+        self.FAR = max(self.FAR, 4.0 * extent)
+        self.cam_dist = self.clamp(0.9 * extent, self.DIST_MIN, self.DIST_MAX)
+        self.cam_pitch = 0.6
+        self.invalidate_camera()
+
+    def set_spheres(self, spheres):
+        """Imposteurs : sphères à dessiner, [(cx, cy, cz, r), ...] (buffer agrandi si besoin)."""
+        data = np.asarray(spheres, dtype=np.float32).reshape(-1, 4)
+        n = len(data)
+        if n > self.sphere_capacity:
+            self.sphere_capacity = max(1, 1 << (n - 1).bit_length())
+            self.sphere_buf = self.device.create_buffer(
+                size=self.sphere_capacity * 16,
+                usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST,
+            )
+        if n:
+            self.device.queue.write_buffer(self.sphere_buf, 0, data)
+        self.sphere_count = n
+
+
+    def view_key(self, sim):
+        """
+        Ce qui change l'image en dehors du tissu et de la caméra (camera_dirty) :
+        toggles, lot, frame relue, sphère. Comparé d'une frame à l'autre pour
+        ne pas redessiner une image identique (pause).
+        """
+        return (
+            self.show_cloth_surface, self.show_cloth_wire,
+            self.show_sphere_surface, self.show_sphere_wire,
+            self.batch,
+            self.playback.frame if self.playback is not None else None,
+            (sim.sphere_cx, sim.sphere_cy, sim.sphere_cz, sim.SPHERE_R),
+        )
 
 
     # DRAW
-    def _call_encode(self, renderer, *args, depth_view=None, clear=False):
-        sig = inspect.signature(renderer.encode)
-        if "depth_view" in sig.parameters:
-            return renderer.encode(*args, depth_view, clear=clear)
-        return renderer.encode(*args, clear=clear)
-
-    def draw(self, device, view_tex, depth_view, sim):
-        enc = device.create_command_encoder()
-
-        self.sphere_renderer.set_sphere((sim.sphere_cx, sim.sphere_cy, sim.sphere_cz), sim.SPHERE_R)
-        self.sphere_renderer_lit.set_sphere((sim.sphere_cx, sim.sphere_cy, sim.sphere_cz), sim.SPHERE_R)
-
-        cleared = False
-
+    def _lap(self, phase):
+        if self.frame_timer is not None:
+            self.frame_timer.lap(phase)
+
+    def _draw_list(self, cloth):
+        """
+        [(renderer, buffers)] visibles, dans l'ordre de dessin : surfaces
+        (écrivent le depth) puis wireframes (depth en lecture seule).
+        """
+        if self.batch is not None:
+            return self._batch_draw_list()
+
+        if self.sphere_impostors:
+            sphere_surface = sphere_wire = (self.sphere_buf, self.sphere_count) if self.sphere_count else None
+        else:
+            sphere_surface = (self.sphere_tri_pos_buf, self.sphere_tri_idx_buf)
+            sphere_wire = (self.sphere_pos_buf, self.sphere_idx_buf)
+
+        items = []
         if self.show_cloth_surface:
-            self._call_encode(
-                self.renderer_lit,
-                enc, view_tex, sim.current_pos_buffer, sim.normal_buf, self.tri_idx_buf,
-                depth_view=depth_view, clear=True
-            )
-            cleared = True
-
+            items.append((self.renderer_lit, (cloth.current_pos_buffer, cloth.normal_buf, self.tri_idx_buf)))
+        if self.show_sphere_surface and sphere_surface:
+            items.append((self.sphere_renderer_lit, sphere_surface))
+        if self.show_cloth_wire:
+            items.append((self.renderer_wire, (cloth.current_pos_buffer, self.idx_buf)))
+        if self.show_sphere_wire and sphere_wire:
+            items.append((self.sphere_renderer, sphere_wire))
+        return items
+
+    def _batch_draw_list(self):
+        """Comme _draw_list, un draw instancié (B instances) par renderer."""
+        b = self.batch
+        lit, wire, sphere_lit, sphere_wire = self._batch_renderers
+        items = []
+        if self.show_cloth_surface:
+            items.append((lit, (b.pos_buf, b.normal_buf, self.tri_idx_buf, b.instance_buf, b.count)))
         if self.show_sphere_surface:
-            self._call_encode(
-                self.sphere_renderer_lit,
-                enc, view_tex, self.sphere_tri_pos_buf, self.sphere_tri_idx_buf,
-                depth_view=depth_view, clear=not cleared
-            )
-
+            items.append((sphere_lit, (b.sphere_buf, b.count)))
         if self.show_cloth_wire:
-            self._call_encode(
-                self.renderer_wire,
-                enc, view_tex, sim.current_pos_buffer, self.idx_buf,
-                depth_view=depth_view, clear=False
-            )
-
+            items.append((wire, (b.pos_buf, self.idx_buf, b.instance_buf, b.count)))
         if self.show_sphere_wire:
-            self._call_encode(
-                self.sphere_renderer,
-                enc, view_tex, self.sphere_pos_buf, self.sphere_idx_buf,
-                depth_view=depth_view, clear=False
+            items.append((sphere_wire, (b.sphere_buf, b.count)))
+        return items
+
+    def _bundle(self, items):
+        """Render bundle des items (en cache tant que visibilité et buffers ne changent pas)."""
+        # les objets eux-mêmes dans la clé (pas id()) : pas de réutilisation d'identifiant
+        key = tuple((renderer,) + buffers for renderer, buffers in items)
+        bundle = self._bundles.get(key)
+        if bundle is None:
+            if len(self._bundles) >= _MAX_BUNDLES:
+                self._bundles.clear()
+            be = self.device.create_render_bundle_encoder(
+                color_formats=[self.texture_format],
+                depth_stencil_format=wgpu.TextureFormat.depth24plus,
             )
+            for renderer, buffers in items:
+                renderer.record(be, *buffers)
+            bundle = be.finish()
+            self._bundles[key] = bundle
+        return bundle
+
+    def _update_sphere(self, sim):
+        if self.batch is not None:
+            return  # sphères du lot (ClothBatch.sphere_buf)
+        sphere = (sim.sphere_cx, sim.sphere_cy, sim.sphere_cz, sim.SPHERE_R)
+        if sphere != self._sphere_state:
+            if self.sphere_impostors:
+                self.set_spheres([sphere])
+            else:
+                self.sphere_renderer.set_sphere(sphere[:3], sphere[3])
+                self.sphere_renderer_lit.set_sphere(sphere[:3], sphere[3])
+            self._sphere_state = sphere
+
+    def draw(self, device, view_tex, depth_view, sim):
+        self.update_frame_uniform()
+        self._update_sphere(sim)
 
-        device.queue.submit([enc.finish()])
\ No newline at end of file
+        # source des positions/normales du tissu
+        cloth = self.playback or self.cloth_source or sim
+        bundle = self._bundle(self._draw_list(cloth))
+
+        self._lap("scene_setup")
+
+        enc = device.create_command_encoder()
+        rp = enc.begin_render_pass(
+            color_attachments=[{
+                "view": view_tex,
+                "load_op": wgpu.LoadOp.clear,
+                "store_op": wgpu.StoreOp.store,
+                "clear_value": (0.1, 0.1, 0.1, 1.0),
+            }],
+            depth_stencil_attachment={
+                "view": depth_view,
+                "depth_load_op": wgpu.LoadOp.clear,
+                "depth_store_op": wgpu.StoreOp.discard,  # inutile après la passe
+                "depth_clear_value": 1.0,
+            },
+            timestamp_writes=self.profiler.timestamp_writes("render") if self.profiler is not None else None,
+        )
+        rp.execute_bundles([bundle])
+        rp.end()
+        self._lap("encode")
+
+        if self.profiler is not None:
+            self.profiler.submit(enc, "render")
+        else:
+            device.queue.submit([enc.finish()])
+        self._lap("submit")
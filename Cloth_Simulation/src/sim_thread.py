@@ -0,0 +1,185 @@
+import threading
+
+import wgpu
+
+from src.frame_scheduler import FrameScheduler
+from src.gpu_utils import wait_gpu_idle
+
+"""
+Simulation sur un thread dédié, découplée de la boucle de rendu.
+
+Le thread avance ClothSimulation (pas fixe, FrameScheduler) et, après chaque
+groupe de pas, publie l'état : normales calculées puis positions + normales
+copiées (GPU -> GPU) dans un slot d'un triple buffer. Scene.draw dessine le
+slot le plus récent ; le rendu ne bloque jamais sur la simulation (et
+inversement), il affiche simplement le dernier état terminé.
+
+Triple buffer : le producteur écrit dans `back`, la publication l'échange
+avec `middle` ; le consommateur échange `middle` avec `front` s'il est
+nouveau. Seul l'échange d'indices est protégé (CPython n'a pas d'échange
+atomique), aucun côté n'attend le travail GPU de l'autre. La file GPU
+étant ordonnée, un slot rendu puis réécrit l'est dans le bon ordre.
+"""
+
+
+class TripleBuffer:
+    def __init__(self, slots):
+        assert len(slots) == 3
+        self.slots = list(slots)
+        self._back, self._middle, self._front = 0, 1, 2
+        self._fresh = False
+        self._lock = threading.Lock()
+
+    @property
+    def back(self):
+        """Slot en cours d'écriture (producteur)."""
+        return self.slots[self._back]
+
+    @property
+    def front(self):
+        """Slot affiché (consommateur)."""
+        return self.slots[self._front]
+
+    def publish(self):
+        """Producteur : `back` est complet, il devient le plus récent."""
+        with self._lock:
+            self._back, self._middle = self._middle, self._back
+            self._fresh = True
+
+    def acquire(self) -> bool:
+        """Consommateur : passe au slot le plus récent ; False si rien de neuf."""
+        with self._lock:
+            if not self._fresh:
+                return False
+            self._front, self._middle = self._middle, self._front
+            self._fresh = False
+            return True
+
+
+class _Slot:
+    def __init__(self, device, nbytes: int):
+        # STORAGE : positions lues par le vertex shader (vertex_normals)
+        usage = wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST | wgpu.BufferUsage.COPY_SRC
+        self.pos_buf = device.create_buffer(size=nbytes, usage=usage)
+        self.normal_buf = device.create_buffer(size=nbytes, usage=usage)
+
+
+class SimulationThread:
+    """
+    - paused() -> bool : état de pause (lu à chaque tour)
+    - realtime : pas fixe au rythme du temps réel (sinon aussi vite que possible)
+    - on_step : appelés sous sim.lock après chaque step (timeline, enregistrement)
+    - on_publish : appelé après chaque publication (ex. canvas.request_draw)
+    - normals=False : seules les positions sont publiées (normales faites au rendu)
+    - normals_every = N : normales recalculées une publication sur N (sauf en pause)
+    """
+
+    def __init__(self, sim, paused=lambda: False, realtime: bool = True, max_steps: int = 4,
+                 on_step=(), on_publish=None, normals: bool = True):
+        self.sim = sim
+        self.device = sim.device
+        self.paused = paused
+        self.realtime = bool(realtime)
+        self.normals = bool(normals)
+        self.on_step = list(on_step)
+        self.on_publish = on_publish
+        self.normals_every = 1
+        self._normals_stale = False  # dernière publication sans normales recalculées
+
+        self.scheduler = FrameScheduler(sim.DT, max_steps)
+        self.nbytes = sim.N * 16
+        self.handoff = TripleBuffer([_Slot(self.device, self.nbytes) for _ in range(3)])
+
+        self.steps = 0
+        self.published = 0
+        self.error = None
+
+        self._stop = threading.Event()
+        self._thread = None
+
+        # les 3 slots partent de l'état courant
+        with sim.lock:
+            sim.compute_normals()
+            for slot in self.handoff.slots:
+                self._copy_to(slot)
+            self._published_version = sim.version
+
+    # THREAD
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                self._tick()
+        except Exception as e:  # relancée côté rendu par acquire()
+            self.error = e
+
+    def _tick(self):
+        sim = self.sim
+        if self.paused():
+            self.scheduler.reset()
+            steps = 0
+        elif self.realtime:
+            steps = self.scheduler.advance()
+        else:
+            steps = 1
+
+        with sim.lock:
+            for _ in range(steps):
+                sim.step()
+                for callback in self.on_step:
+                    callback()
+            self.steps += steps
+            # publication aussi en pause si l'état a changé (reset, retour arrière)
+            # ou si ses normales n'étaient pas à jour (normals_every > 1)
+            changed = sim.version != self._published_version or (self._normals_stale and self.paused())
+            if changed:
+                self._publish()
+
+        if not changed:
+            # rien à faire avant le prochain pas
+            self._stop.wait(self.scheduler.dt * (1.0 - self.scheduler.alpha))
+        elif not self.realtime:
+            # sans cadence, on ne prend pas plus d'une publication d'avance sur le GPU
+            wait_gpu_idle(self.device)
+
+    def _copy_to(self, slot):
+        enc = self.device.create_command_encoder()
+        enc.copy_buffer_to_buffer(self.sim.current_pos_buffer, 0, slot.pos_buf, 0, self.nbytes)
+        if self.normals:
+            enc.copy_buffer_to_buffer(self.sim.normal_buf, 0, slot.normal_buf, 0, self.nbytes)
+        self.device.queue.submit([enc.finish()])
+
+    def _publish(self):
+        self._normals_stale = self.published % self.normals_every != 0 and not self.paused()
+        if self.normals and not self._normals_stale:
+            self.sim.compute_normals()
+        self._copy_to(self.handoff.back)
+        self.handoff.publish()
+        self._published_version = self.sim.version
+        self.published += 1
+        if self.on_publish is not None:
+            self.on_publish()
+
+    # RENDU
+    def acquire(self) -> bool:
+        """À appeler une fois par frame avant Scene.draw ; True si un nouvel état est affiché."""
+        if self.error is not None:
+            raise RuntimeError("le thread de simulation s'est arrêté") from self.error
+        return self.handoff.acquire()
+
+    @property
+    def current_pos_buffer(self):
+        return self.handoff.front.pos_buf
+
+    @property
+    def normal_buf(self):
+        return self.handoff.front.normal_buf
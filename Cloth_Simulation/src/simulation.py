@@ -1,20 +1,81 @@
+import functools
+import threading
+
 import numpy as np
 import wgpu
 
-from src.data_init import make_grid_cloth
+from src.data_init import make_grid_cloth, make_grid_indices, make_vertex_triangle_csr
+from src import autotune, checkpoint
+from src.pipeline_cache import get_pipeline_cache
 
 """
 Simulation physique du tissu sur GPU (compute shaders).
 - ressorts (structural / shear / bend)
+- limitation d'allongement (strain limiting)
 - collisions sphère + sol (friction)
 - ping-pong buffers
 - calcul des normales
 """
 
 
+def _locked(method):
+    """Méthode exécutée sous sim.lock (la simulation peut tourner sur un autre thread)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class ClothSimulation:
-    def __init__(self, device):
+    # Paramètres sauvegardés dans les checkpoints (save_state / load_state)
+    PARAM_NAMES = (
+        "G", "K_STRUCT", "K_SHEAR", "K_BEND", "DAMPING",
+        "DT", "SUBSTEPS", "REST", "MASS",
+        "SPHERE_R", "MU", "EPS", "BOUNCE", "FLOOR_Y",
+        "sphere_cx", "sphere_cy", "sphere_cz",
+        "STRAIN_LIMIT", "STRAIN_EPS", "STRAIN_ITERS", "STRAIN_OMEGA",
+    )
+
+    # Paramètres qui fixent l'état initial (espacement, placement au-dessus
+    # de la sphère) : les changer demande rebuild_initial_state()
+    GEOMETRY_PARAMS = ("REST", "SPHERE_R", "sphere_cx", "sphere_cy", "sphere_cz")
+
+    # Kernels compute et leur fichier WGSL
+    KERNELS = {
+        "springs": "structural_shear_bend.wgsl",
+        "strain": "strain_limit.wgsl",
+        "collision": "collision_friction.wgsl",
+        "normals": "compute_normals_grid.wgsl",
+    }
+    # Kernels qui acceptent des tuiles 2D (les autres restent en 1D)
+    TILED_KERNELS = ("springs", "strain", "normals")
+
+    # Variantes du kernel normales :
+    # - grid : différences centrales (4 voisins)
+    # - area : pondérées par l'aire des 6 triangles, tuiles en mémoire partagée
+    # - csr  : pondérées par l'aire, adjacence sommet -> triangles en CSR
+    #          (même kernel que pour un maillage quelconque)
+    NORMALS_KERNELS = {
+        "grid": "compute_normals_grid.wgsl",
+        "area": "compute_normals_area.wgsl",
+        "csr": "compute_normals_csr.wgsl",
+    }
+
+    def __init__(self, device, W: int = 22, H: int = 22, workgroup_size=None,
+                 specialize: bool = True, shader_defines=None, normals_mode: str = "grid"):
         self.device = device
+        self.cache = get_pipeline_cache(device)
+        self.W, self.H = int(W), int(H)
+
+        if normals_mode not in self.NORMALS_KERNELS:
+            raise ValueError(f"normals_mode inconnu : {normals_mode!r} ({', '.join(self.NORMALS_KERNELS)})")
+        self.normals_mode = normals_mode
+        self.kernel_files = dict(self.KERNELS, normals=self.NORMALS_KERNELS[normals_mode])
+        # csr : une invocation par sommet, pas de tuile 2D
+        self.tiled_kernels = tuple(
+            name for name in self.TILED_KERNELS if not (name == "normals" and normals_mode == "csr")
+        )
 
         # PARAMÈTRES PHYSIQUES
         self.G = -9.81  
@@ -30,15 +91,50 @@ class ClothSimulation:
         self.REST = 0.10 
         self.MASS = 0.1
 
-        self.WORKGROUP_SIZE = 64 
+        # TAILLES DE WORKGROUP par kernel, (x, y) avec y = 1 en 1D.
+        # workgroup_size=None : valeurs de l'autotune pour cet adapter si
+        # disponibles (voir src/autotune.py), sinon 64 en 1D.
+        self.WORKGROUP_SIZE = int(workgroup_size or 64)
+        self.kernel_tiles = {name: (self.WORKGROUP_SIZE, 1) for name in self.KERNELS}
+        if workgroup_size is None:
+            tuned = autotune.load_tuning(device, self.W, self.H, normals_mode)
+            self.kernel_tiles.update({
+                name: tile for name, tile in tuned.items()
+                if name in self.kernel_tiles and (tile[1] == 1 or name in self.tiled_kernels)
+            })
+
+        # VARIANTES DE KERNELS : W / H en constantes override (pipeline propre à
+        # la résolution), defines du préprocesseur WGSL (ex. {"STICK_K": "3.0"})
+        self.specialize = bool(specialize)
+        self.shader_defines = dict(shader_defines or {})
+
+        # GpuProfiler optionnel (timestamps par passe)
+        self.profiler = None
+
+        # Compteur de modifications de l'état GPU (step, reset, load_state,
+        # retour arrière) : permet de ne recalculer les normales qu'au besoin
+        self.version = 0
+        # Verrou de l'état GPU : step / reset / normales / checkpoints, et
+        # copies faites par d'autres objets (timeline, thread de simulation)
+        self.lock = threading.RLock()
 
 
         self.SPHERE_R = 0.8
+        self.sphere_cx, self.sphere_cy, self.sphere_cz = 0.35, 1.0, 0.0
         self.MU = 0.5
         self.EPS = 0.05
         self.BOUNCE = 0
         self.FLOOR_Y = -2.0
 
+        # STRAIN LIMITING : arêtes structurelles gardées dans [1-eps, 1+eps] * REST
+        # permet de baisser K_STRUCT / SUBSTEPS sans que le tissu s'allonge ;
+        # désactivé par défaut : une passe de plus par substep, à compenser
+        # en baissant SUBSTEPS quand on l'active
+        self.STRAIN_LIMIT = False
+        self.STRAIN_EPS = 0.10
+        self.STRAIN_ITERS = 1
+        self.STRAIN_OMEGA = 1.0
+
         # INIT MESH + BUFFERS + PIPELINES
         self._init_mesh()
         self._init_buffers()
@@ -46,10 +142,7 @@ class ClothSimulation:
 
     # init CPU tissu
     def _init_mesh(self):
-        self.W, self.H = 22 , 22 
-
-        self.sphere_cx, self.sphere_cy, self.sphere_cz = 0.35, 1.0, 0.0
-
+        # grille d'espacement REST, au-dessus de la sphère (voir GEOMETRY_PARAMS)
         cloth_y0 = self.sphere_cy + self.SPHERE_R + 0.50
 
         pos, vel = make_grid_cloth(
@@ -69,128 +162,173 @@ class ClothSimulation:
 
         self.N = int(self.positions_np.shape[0])
 
-        # Dispatch compute
-        self.dispatch_x = (self.N + self.WORKGROUP_SIZE - 1) // self.WORKGROUP_SIZE 
-
 
     # BUFFERS GPU
     def _init_buffers(self):
         d = self.device
 
-        # Positions ping-pong (STORAGE + VERTEX)
+        # Positions ping-pong (STORAGE + VERTEX), COPY_SRC pour les checkpoints
         self.pos_a = d.create_buffer_with_data(
             data=self.positions_np.tobytes(),
-            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST,
+            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST | wgpu.BufferUsage.COPY_SRC,
         )
         self.pos_b = d.create_buffer(
             size=self.positions_np.nbytes,
-            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST,
+            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST | wgpu.BufferUsage.COPY_SRC,
         )
 
         # Vitesses ping-pong (STORAGE)
         self.vel_a = d.create_buffer_with_data(
             data=self.velocities_np.tobytes(),
-            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST,
+            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST | wgpu.BufferUsage.COPY_SRC,
         )
         self.vel_b = d.create_buffer(
             size=self.velocities_np.nbytes,
-            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST,
+            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST | wgpu.BufferUsage.COPY_SRC,
         )
 
-        # Normales, STORAGE + VERTEX
+        # États initiaux intacts : reset() = copie GPU -> GPU, sans re-upload CPU
+        # (COPY_DST : réécrits par rebuild_initial_state)
+        self.pos_init_buf = d.create_buffer_with_data(
+            data=self.positions_init.tobytes(),
+            usage=wgpu.BufferUsage.COPY_SRC | wgpu.BufferUsage.COPY_DST,
+        )
+        self.vel_init_buf = d.create_buffer_with_data(
+            data=self.velocities_init.tobytes(),
+            usage=wgpu.BufferUsage.COPY_SRC | wgpu.BufferUsage.COPY_DST,
+        )
+
+        # Normales, STORAGE + VERTEX (COPY_SRC pour l'enregistrement)
         self.normal_buf = d.create_buffer(
             size=self.positions_np.nbytes,
-            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST,
+            usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.COPY_DST | wgpu.BufferUsage.COPY_SRC,
         )
 
+        if self.normals_mode == "csr":
+            # triangles de la grille en ordre inversé : cross(b - a, c - a)
+            # orientée comme les normales de grille
+            tris = make_grid_indices(self.W, self.H).reshape(-1, 3)[:, [0, 2, 1]]
+            offsets, tri_ids = make_vertex_triangle_csr(tris, self.N)
+            self.csr_buffers = [
+                d.create_buffer_with_data(data=np.ascontiguousarray(a).tobytes(), usage=wgpu.BufferUsage.STORAGE)
+                for a in (offsets, tri_ids, tris)
+            ]
+
         # Ping = True  "A est courant"
         self.ping = True
 
  
-    # PIPELINES COMPUTE
-    def _init_pipelines(self):
+    def _kernel(self, name: str):
+        """
+        Lance la création du pipeline compute `name` pour cette configuration :
+        constantes override WG / WG_Y (taille de workgroup) et, si `specialize`,
+        GRID_W / GRID_H (variante propre à la résolution, mise en cache).
+        """
+        wx, wy = self.kernel_tiles[name]
+        constants = {"WG": wx}
+        if name in self.tiled_kernels:
+            constants["WG_Y"] = wy
+        if self.specialize:
+            constants.update(GRID_W=self.W, GRID_H=self.H)
+        module = self.cache.shader_module_file(self.kernel_files[name], self.shader_defines)
+        return self.cache.compute_pipeline_async(self._layouts[name], module, constants=constants)
+
+    def _dispatch_size(self, name: str):
+        wx, wy = self.kernel_tiles[name]
+        # area : tuiles de grille même en (x, 1) (une ligne par workgroup)
+        if wy == 1 and not (name == "normals" and self.normals_mode == "area"):
+            return ((self.N + wx - 1) // wx, 1)
+        return ((self.W + wx - 1) // wx, (self.H + wy - 1) // wy)
+
+    def set_kernel_tile(self, name: str, tile):
+        """Change la taille de workgroup (x, y) d'un kernel (recrée / reprend le pipeline en cache)."""
+        wx, wy = int(tile[0]), int(tile[1])
+        if name not in self.tiled_kernels and wy != 1:
+            raise ValueError(f"le kernel {name} n'accepte que des workgroups 1D")
+        self.kernel_tiles[name] = (wx, wy)
+        self.pipelines[name] = self.cache.resolve(self._kernel(name))
+        self.dispatch[name] = self._dispatch_size(name)
+
+    def _pingpong_bind_groups(self, bgl, params_buf):
+        """[A -> B, B -> A] pour une passe (pos_in, vel_in, pos_out, vel_out, params)."""
         d = self.device
-
-        #  SPRINGS struct + shear + bend
-        self.params_springs = d.create_buffer(
-            size=48, 
-            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
-        )
-
-        springs_code = open("shaders/structural_shear_bend.wgsl", encoding="utf-8").read()
-        springs_mod = d.create_shader_module(code=springs_code)
-
-        springs_bgl = d.create_bind_group_layout(entries=[
-            {"binding": 0, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},
-            {"binding": 1, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},
-            {"binding": 2, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "storage"}},
-            {"binding": 3, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "storage"}},
-            {"binding": 4, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "uniform"}},
-        ])
-
-        
-        self.bg_springs = [
-            d.create_bind_group(layout=springs_bgl, entries=[
+        return [
+            d.create_bind_group(layout=bgl, entries=[
                 {"binding": 0, "resource": {"buffer": self.pos_a}},
                 {"binding": 1, "resource": {"buffer": self.vel_a}},
                 {"binding": 2, "resource": {"buffer": self.pos_b}},
                 {"binding": 3, "resource": {"buffer": self.vel_b}},
-                {"binding": 4, "resource": {"buffer": self.params_springs}},
+                {"binding": 4, "resource": {"buffer": params_buf}},
             ]),
-            d.create_bind_group(layout=springs_bgl, entries=[
+            d.create_bind_group(layout=bgl, entries=[
                 {"binding": 0, "resource": {"buffer": self.pos_b}},
                 {"binding": 1, "resource": {"buffer": self.vel_b}},
                 {"binding": 2, "resource": {"buffer": self.pos_a}},
                 {"binding": 3, "resource": {"buffer": self.vel_a}},
-                {"binding": 4, "resource": {"buffer": self.params_springs}},
+                {"binding": 4, "resource": {"buffer": params_buf}},
             ]),
         ]
 
-        self.pipeline_springs = d.create_compute_pipeline(
-            layout=d.create_pipeline_layout(bind_group_layouts=[springs_bgl]),
-            compute={"module": springs_mod, "entry_point": "main"},
-        )
-
-        
-        # collision sphère friction sol
-        self.params_collision = d.create_buffer(
-            size=64, 
-            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
-        )
-
-        collision_code = open("shaders/collision_friction.wgsl", encoding="utf-8").read()
-        collision_mod = d.create_shader_module(code=collision_code)
+    # PIPELINES COMPUTE
+    def _init_pipelines(self):
+        d = self.device
+        cache = self.cache
 
-        collision_bgl = d.create_bind_group_layout(entries=[
+        # Layout commun aux passes ping-pong (springs, strain, collision)
+        pingpong_bgl = cache.bind_group_layout([
             {"binding": 0, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},
             {"binding": 1, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},
             {"binding": 2, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "storage"}},
             {"binding": 3, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "storage"}},
             {"binding": 4, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "uniform"}},
         ])
+        pingpong_layout = cache.pipeline_layout([pingpong_bgl])
 
-        self.bg_collision = [
-            d.create_bind_group(layout=collision_bgl, entries=[
-                {"binding": 0, "resource": {"buffer": self.pos_a}},
-                {"binding": 1, "resource": {"buffer": self.vel_a}},
-                {"binding": 2, "resource": {"buffer": self.pos_b}},
-                {"binding": 3, "resource": {"buffer": self.vel_b}},
-                {"binding": 4, "resource": {"buffer": self.params_collision}},
-            ]),
-            d.create_bind_group(layout=collision_bgl, entries=[
-                {"binding": 0, "resource": {"buffer": self.pos_b}},
-                {"binding": 1, "resource": {"buffer": self.vel_b}},
-                {"binding": 2, "resource": {"buffer": self.pos_a}},
-                {"binding": 3, "resource": {"buffer": self.vel_a}},
-                {"binding": 4, "resource": {"buffer": self.params_collision}},
-            ]),
+        normals_entries = [
+            {"binding": 0, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},
+            {"binding": 1, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "storage"}},
+            {"binding": 2, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "uniform"}},
         ]
+        if self.normals_mode == "csr":
+            # offsets, tri_ids, triangles
+            normals_entries += [
+                {"binding": b, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}}
+                for b in (3, 4, 5)
+            ]
+        normals_bgl = cache.bind_group_layout(normals_entries)
+        normals_layout = cache.pipeline_layout([normals_bgl])
+
+        self._normals_bgl = normals_bgl
+        self._layouts = {
+            "springs": pingpong_layout,
+            "strain": pingpong_layout,
+            "collision": pingpong_layout,
+            "normals": normals_layout,
+        }
+
+        # Les 4 pipelines sont lancés en asynchrone puis attendus ensemble
+        keys = {name: self._kernel(name) for name in self.KERNELS}
+
+        #  SPRINGS struct + shear + bend
+        self.params_springs = d.create_buffer(
+            size=48, 
+            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
+        )
+        self.bg_springs = self._pingpong_bind_groups(pingpong_bgl, self.params_springs)
 
-        self.pipeline_collision = d.create_compute_pipeline(
-            layout=d.create_pipeline_layout(bind_group_layouts=[collision_bgl]),
-            compute={"module": collision_mod, "entry_point": "main"},
+        # STRAIN LIMITING (après les ressorts, avant la collision)
+        self.params_strain = d.create_buffer(
+            size=32,
+            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
         )
+        self.bg_strain = self._pingpong_bind_groups(pingpong_bgl, self.params_strain)
 
+        # collision sphère friction sol
+        self.params_collision = d.create_buffer(
+            size=64, 
+            usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
+        )
+        self.bg_collision = self._pingpong_bind_groups(pingpong_bgl, self.params_collision)
 
         # NORMALES sur grille
         self.params_normals = d.create_buffer(
@@ -198,120 +336,179 @@ class ClothSimulation:
             usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST,
         )
 
-        normals_code = open("shaders/compute_normals_grid.wgsl", encoding="utf-8").read()
-        normals_mod = d.create_shader_module(code=normals_code)
-
-        normals_bgl = d.create_bind_group_layout(entries=[
-            {"binding": 0, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},
-            {"binding": 1, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "storage"}},
-            {"binding": 2, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "uniform"}},
-        ])
-
-        self.bg_normals = [
-            d.create_bind_group(layout=normals_bgl, entries=[
-                {"binding": 0, "resource": {"buffer": self.pos_a}},
-                {"binding": 1, "resource": {"buffer": self.normal_buf}},
-                {"binding": 2, "resource": {"buffer": self.params_normals}},
-            ]),
-            d.create_bind_group(layout=normals_bgl, entries=[
-                {"binding": 0, "resource": {"buffer": self.pos_b}},
-                {"binding": 1, "resource": {"buffer": self.normal_buf}},
-                {"binding": 2, "resource": {"buffer": self.params_normals}},
-            ]),
-        ]
+        self.bg_normals = [self.normals_bind_group(self.pos_a), self.normals_bind_group(self.pos_b)]
 
-        self.pipeline_normals = d.create_compute_pipeline(
-            layout=d.create_pipeline_layout(bind_group_layouts=[normals_bgl]),
-            compute={"module": normals_mod, "entry_point": "main"},
-        )
+        self.pipelines = {name: cache.resolve(key) for name, key in keys.items()}
+        self.dispatch = {name: self._dispatch_size(name) for name in self.KERNELS}
 
    
     # API PUBLIQUE
+    @_locked
     def reset(self):
-        """Réinitialise le tissu à l'état initial."""
-        q = self.device.queue
-        q.write_buffer(self.pos_a, 0, self.positions_init.tobytes())
-        q.write_buffer(self.vel_a, 0, self.velocities_init.tobytes())
-        q.write_buffer(self.pos_b, 0, self.positions_init.tobytes())
-        q.write_buffer(self.vel_b, 0, self.velocities_init.tobytes())
+        """Réinitialise le tissu à l'état initial (copies GPU -> GPU)."""
+        size = self.positions_init.nbytes
+        enc = self.device.create_command_encoder()
+        enc.copy_buffer_to_buffer(self.pos_init_buf, 0, self.pos_a, 0, size)
+        enc.copy_buffer_to_buffer(self.vel_init_buf, 0, self.vel_a, 0, size)
+        enc.copy_buffer_to_buffer(self.pos_init_buf, 0, self.pos_b, 0, size)
+        enc.copy_buffer_to_buffer(self.vel_init_buf, 0, self.vel_b, 0, size)
+        self.device.queue.submit([enc.finish()])
         self.ping = True
+        self.version += 1
 
+    @_locked
+    def rebuild_initial_state(self, reset: bool = True):
+        """
+        Recalcule l'état initial à partir des GEOMETRY_PARAMS courants (après
+        un changement de REST, SPHERE_R ou du centre de la sphère), puis reset()
+        (sauf reset=False : l'état courant est gardé, ex. checkpoint rechargé).
+        """
+        self._init_mesh()
+        q = self.device.queue
+        q.write_buffer(self.pos_init_buf, 0, self.positions_init)
+        q.write_buffer(self.vel_init_buf, 0, self.velocities_init)
+        if reset:
+            self.reset()
+
+    @_locked
+    def save_state(self, path: str):
+        """Sauvegarde positions, vitesses, ping et paramètres (voir checkpoint.py)."""
+        checkpoint.save_state(self, path)
+
+    @_locked
+    def load_state(self, path: str):
+        """Recharge un état sauvegardé par save_state (fichier mappé en mémoire)."""
+        checkpoint.load_state(self, path)
+        self.version += 1
+
+    def passes_per_step(self) -> int:
+        """Passes compute soumises par step() (dimensionne GpuProfiler.max_passes)."""
+        return self.SUBSTEPS * (2 + (self.STRAIN_ITERS if self.STRAIN_LIMIT else 0))
+
+    def _timestamps(self, name: str):
+        return self.profiler.timestamp_writes(name) if self.profiler is not None else None
+
+    def _submit(self, enc, name: str):
+        if self.profiler is not None:
+            self.profiler.submit(enc, name)
+        else:
+            self.device.queue.submit([enc.finish()])
+
+    def _run(self, name: str, bg):
+        """Une passe compute du kernel `name` (un encoder, une soumission)."""
+        enc = self.device.create_command_encoder()
+        cp = enc.begin_compute_pass(timestamp_writes=self._timestamps(name))
+        cp.set_pipeline(self.pipelines[name])
+        cp.set_bind_group(0, bg)
+        cp.dispatch_workgroups(*self.dispatch[name])
+        cp.end()
+        self._submit(enc, name)
+
+    def write_params(self):
+        """
+        Écrit les uniforms des kernels (springs, strain, collision, normales)
+        à partir des paramètres courants ; appelé par step(), et avant tout
+        dispatch hors step (autotune).
+        """
+        dt_sub = np.float32(self.DT / self.SUBSTEPS) # sous-steps par frame
+        q = self.device.queue
+
+        q.write_buffer(self.params_springs, 0, b"".join([
+            np.array([dt_sub, self.G, self.REST, self.MASS], dtype=np.float32).tobytes(),
+            np.array([self.K_STRUCT, self.K_SHEAR, self.K_BEND, self.DAMPING], dtype=np.float32).tobytes(),
+            np.array([self.W, self.H, self.N, 0], dtype=np.uint32).tobytes(),
+        ]))
+        q.write_buffer(self.params_strain, 0, b"".join([
+            np.array([dt_sub, self.REST, self.STRAIN_EPS, self.STRAIN_OMEGA], dtype=np.float32).tobytes(),
+            np.array([self.W, self.H, self.N, 0], dtype=np.uint32).tobytes(),
+        ]))
+        q.write_buffer(self.params_collision, 0, b"".join([
+            np.array([
+                dt_sub,
+                self.sphere_cx, self.sphere_cy, self.sphere_cz,
+                self.SPHERE_R, self.BOUNCE, self.MU, self.EPS,
+                self.FLOOR_Y, 0.0, 0.0, 0.0
+            ], dtype=np.float32).tobytes(),
+            np.array([self.N, 0, 0, 0], dtype=np.uint32).tobytes(),
+        ]))
+        q.write_buffer(self.params_normals, 0, np.array([self.W, self.H, self.N, 0], dtype=np.uint32).tobytes())
+
+    @_locked
     def step(self):
         """
         Avance la simulation d'une frame.
         IMPORTANT : on reproduit exactement la logique du brouillon :
         - springs (ping)
+        - strain limiting (ping, STRAIN_ITERS fois, si activé)
         - collision (ping)
         pour chaque substep
         """
-        dt_sub = np.float32(self.DT / self.SUBSTEPS) # sous-steps par frame
+        # paramètres constants sur la frame
+        self.write_params()
 
         for _ in range(self.SUBSTEPS):
 
-
             # SPRINGS
-            springs_params = b"".join([
-                np.array([dt_sub, self.G, self.REST, self.MASS], dtype=np.float32).tobytes(),
-                np.array([self.K_STRUCT, self.K_SHEAR, self.K_BEND, self.DAMPING], dtype=np.float32).tobytes(),
-                np.array([self.W, self.H, self.N, 0], dtype=np.uint32).tobytes(),
-            ])
-            self.device.queue.write_buffer(self.params_springs, 0, springs_params)
-
             bg = self.bg_springs[0 if self.ping else 1]
 
-            enc = self.device.create_command_encoder()
-            cp = enc.begin_compute_pass()
-            cp.set_pipeline(self.pipeline_springs)
-            cp.set_bind_group(0, bg)
-            cp.dispatch_workgroups(self.dispatch_x)
-            cp.end()
-            self.device.queue.submit([enc.finish()])
+            self._run("springs", bg)
 
             self.ping = not self.ping
 
-            # collision sphère + friction + sol
-            collision_params = b"".join([
-                np.array([
-                    dt_sub,
-                    self.sphere_cx, self.sphere_cy, self.sphere_cz,
-                    self.SPHERE_R, self.BOUNCE, self.MU, self.EPS,
-                    self.FLOOR_Y, 0.0, 0.0, 0.0
-                ], dtype=np.float32).tobytes(),
-                np.array([self.N, 0, 0, 0], dtype=np.uint32).tobytes(),
-            ])
-            self.device.queue.write_buffer(self.params_collision, 0, collision_params)
+            # STRAIN LIMITING (Jacobi moyenné, une passe par itération)
+            if self.STRAIN_LIMIT:
+                for _ in range(self.STRAIN_ITERS):
+                    bg = self.bg_strain[0 if self.ping else 1]
 
+                    self._run("strain", bg)
+
+                    self.ping = not self.ping
+
+            # collision sphère + friction + sol
             bg = self.bg_collision[0 if self.ping else 1]
 
-            enc = self.device.create_command_encoder()
-            cp = enc.begin_compute_pass()
-            cp.set_pipeline(self.pipeline_collision)
-            cp.set_bind_group(0, bg)
-            cp.dispatch_workgroups(self.dispatch_x)
-            cp.end()
-            self.device.queue.submit([enc.finish()])
+            self._run("collision", bg)
 
             self.ping = not self.ping
 
-    def compute_normals(self):
-        """Recalcule les normales (à appeler chaque frame, même en pause)."""
+        self.version += 1
+
+    def normals_bind_group(self, pos_buffer):
+        """Bind group du kernel normales pour un buffer de positions (-> normal_buf)."""
+        entries = [
+            {"binding": 0, "resource": {"buffer": pos_buffer}},
+            {"binding": 1, "resource": {"buffer": self.normal_buf}},
+            {"binding": 2, "resource": {"buffer": self.params_normals}},
+        ]
+        if self.normals_mode == "csr":
+            entries += [
+                {"binding": b, "resource": {"buffer": buf}}
+                for b, buf in zip((3, 4, 5), self.csr_buffers)
+            ]
+        return self.device.create_bind_group(layout=self._normals_bgl, entries=entries)
+
+    @_locked
+    def compute_normals(self, bind_group=None):
+        """
+        Recalcule les normales de l'état courant (ou des positions de
+        `bind_group`, voir normals_bind_group).
+        """
         self.device.queue.write_buffer(
             self.params_normals,
             0,
-            np.array([self.W, self.H, 0, 0], dtype=np.uint32).tobytes()
+            np.array([self.W, self.H, self.N, 0], dtype=np.uint32).tobytes()
         )
 
-        bg = self.bg_normals[0 if self.ping else 1]
+        bg = bind_group if bind_group is not None else self.bg_normals[0 if self.ping else 1]
 
-        enc = self.device.create_command_encoder()
-        cp = enc.begin_compute_pass()
-        cp.set_pipeline(self.pipeline_normals)
-        cp.set_bind_group(0, bg)
-        cp.dispatch_workgroups(self.dispatch_x)
-        cp.end()
-        self.device.queue.submit([enc.finish()])
+        self._run("normals", bg)
 
     @property
     def current_pos_buffer(self):
         """Buffer position courant après ping-pong."""
         return self.pos_a if self.ping else self.pos_b
+
+    @property
+    def current_vel_buffer(self):
+        """Buffer vitesse courant après ping-pong."""
+        return self.vel_a if self.ping else self.vel_b
@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+Démarrage de l'application et temps jusqu'aux premières frames.
+
+- mode synchrone : build() est appelé tout de suite (comportement historique)
+- mode arrière-plan : build() tourne sur un thread (maillages CPU, buffers,
+  pipelines en parallèle via le cache) ; la boucle draw affiche des frames
+  d'attente et récupère le résultat avec poll() dès qu'il est prêt
+
+Dans les deux cas : temps jusqu'à la première frame affichée et jusqu'à la
+première frame simulée (depuis la création de l'objet).
+"""
+
+
+class Startup:
+    def __init__(self, build, background: bool = False):
+        self.t0 = time.perf_counter()
+        self.background = bool(background)
+
+        self.ready_ms = None
+        self.first_frame_ms = None
+        self.first_sim_frame_ms = None
+
+        self._result = None
+        self._future = None
+        self._pool = None
+
+        if self.background:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup")
+            self._future = self._pool.submit(build)
+        else:
+            self._set_result(build())
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1e3
+
+    def _set_result(self, result):
+        self._result = result
+        self.ready_ms = self._elapsed_ms()
+
+    def poll(self):
+        """Résultat de build() s'il est prêt, sinon None (ne bloque pas)."""
+        if self._result is None and self._future is not None and self._future.done():
+            self._set_result(self._future.result())  # relance l'exception éventuelle
+            self._pool.shutdown(wait=False)
+            self._future = None
+        return self._result
+
+    def wait(self):
+        """Résultat de build() (bloque si besoin)."""
+        if self._result is None and self._future is not None:
+            self._future.result()
+        return self.poll()
+
+    # JALONS
+    def frame_presented(self):
+        if self.first_frame_ms is None:
+            self.first_frame_ms = self._elapsed_ms()
+            self._maybe_report()
+
+    def sim_frame(self):
+        if self.first_sim_frame_ms is None:
+            self.first_sim_frame_ms = self._elapsed_ms()
+            self._maybe_report()
+
+    def _maybe_report(self):
+        # une seule fois, quand les deux jalons sont connus
+        if self.first_frame_ms is not None and self.first_sim_frame_ms is not None:
+            print(self.report())
+
+    def report(self) -> str:
+        def ms(v):
+            return f"{v:.0f} ms" if v is not None else "-"
+        mode = "arrière-plan" if self.background else "synchrone"
+        return (
+            f"🚀 Démarrage ({mode}) : première frame {ms(self.first_frame_ms)}, "
+            f"scène prête {ms(self.ready_ms)}, première frame simulée {ms(self.first_sim_frame_ms)}"
+        )
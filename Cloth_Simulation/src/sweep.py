@@ -0,0 +1,70 @@
+import itertools
+import json
+import time
+
+from src.cloth_batch import ClothBatch
+from src.replay import make_simulation
+
+"""
+Balayage de paramètres : un scénario (voir replay.py) rejoué pour chaque
+combinaison des valeurs données, état final de chaque run capturé dans un
+ClothBatch (affiché côte à côte par Scene, un draw instancié).
+
+    python main.py --sweep scenarios/drape_default.json --vary K_BEND=1,10,100 --vary MU=0.1,0.5
+
+Une seule simulation est réutilisée (paramètres réécrits puis reset entre
+deux runs, état initial recalculé si REST / SPHERE_R / centre de la sphère
+varient) : pas de pipelines ni de buffers recréés par combinaison.
+"""
+
+
+def parse_vary(specs) -> dict:
+    """["NOM=v1,v2,...", ...] -> {NOM: [v1, v2, ...]} (valeurs JSON : nombres, true/false)."""
+    vary = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise ValueError(f"--vary attend NOM=v1,v2,... : {spec!r}")
+        vary[name.strip()] = [json.loads(v) for v in values.split(",")]
+    return vary
+
+
+def combinations(vary: dict) -> list:
+    """Produit cartésien des valeurs : [{NOM: valeur, ...}, ...]."""
+    names = list(vary)
+    return [dict(zip(names, values)) for values in itertools.product(*(vary[n] for n in names))]
+
+
+def run_sweep(device, scenario: dict, vary: dict, frames: int = None, columns: int = None) -> ClothBatch:
+    """Rejoue `scenario` pour chaque combinaison de `vary` ; états finaux dans un ClothBatch."""
+    sim = make_simulation(device, scenario)
+    for name in vary:
+        if name not in sim.PARAM_NAMES:
+            raise ValueError(f"paramètre inconnu : {name}")
+    frames = int(frames if frames is not None else scenario.get("frames", 240))
+    combos = combinations(vary)
+
+    # écart entre tissus : plus grande emprise (tissu ou sphère) sur tout le balayage
+    base = {name: getattr(sim, name) for name in ("REST", "SPHERE_R")}
+    size = max(
+        max((max(sim.W, sim.H) - 1) * c.get("REST", base["REST"]), 2.0 * c.get("SPHERE_R", base["SPHERE_R"]))
+        for c in combos
+    )
+    batch = ClothBatch(device, sim.W, sim.H, len(combos), spacing=1.4 * size, columns=columns)
+
+    # REST / SPHERE_R / centre de la sphère : état initial recalculé par run
+    geometry = any(name in sim.GEOMETRY_PARAMS for name in vary)
+
+    t0 = time.perf_counter()
+    for b, combo in enumerate(combos):
+        for name, value in combo.items():
+            setattr(sim, name, value)
+        if geometry:
+            sim.rebuild_initial_state()
+        else:
+            sim.reset()
+        for _ in range(frames):
+            sim.step()
+        batch.capture(b, sim, label=combo)
+    print(f"🧪 Balayage : {len(combos)} runs x {frames} frames en {time.perf_counter() - t0:.1f} s")
+    return batch
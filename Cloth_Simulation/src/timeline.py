@@ -0,0 +1,94 @@
+import wgpu
+
+"""
+Timeline de retour arrière (rewind) résidente sur GPU.
+
+- anneau de K snapshots (positions + vitesses) en mémoire GPU
+- rempli toutes les M frames par copy_buffer_to_buffer
+- revenir en arrière recopie un slot dans les buffers courants :
+  aucun transfert CPU <-> GPU
+"""
+
+
+class GpuTimeline:
+    def __init__(self, sim, slots: int = 120, interval: int = 6):
+        self.sim = sim
+        self.device = sim.device
+        self.slots = int(slots)
+        self.interval = max(1, int(interval))
+
+        self.slot_bytes = sim.N * 16
+
+        # un seul gros buffer par attribut, slot k à l'offset k * slot_bytes
+        usage = wgpu.BufferUsage.COPY_SRC | wgpu.BufferUsage.COPY_DST
+        self.pos_slots = self.device.create_buffer(size=self.slots * self.slot_bytes, usage=usage)
+        self.vel_slots = self.device.create_buffer(size=self.slots * self.slot_bytes, usage=usage)
+
+        self.clear()
+
+    def clear(self):
+        self.head = 0       # prochain slot écrit
+        self.count = 0      # snapshots valides
+        self.cursor = None  # âge du snapshot affiché (0 = le plus récent), None = live
+        self.frame = 0
+
+    def _slot(self, age: int) -> int:
+        return (self.head - 1 - age) % self.slots
+
+    # ENREGISTREMENT
+    def capture(self):
+        """À appeler après chaque sim.step()."""
+        if self.cursor is not None:
+            # on repart d'un point du passé : le futur enregistré est abandonné
+            self.head = (self._slot(self.cursor) + 1) % self.slots
+            self.count -= self.cursor
+            self.cursor = None
+
+        self.frame += 1
+        if self.frame % self.interval != 0:
+            return
+
+        off = self.head * self.slot_bytes
+        with self.sim.lock:
+            enc = self.device.create_command_encoder()
+            enc.copy_buffer_to_buffer(self.sim.current_pos_buffer, 0, self.pos_slots, off, self.slot_bytes)
+            enc.copy_buffer_to_buffer(self.sim.current_vel_buffer, 0, self.vel_slots, off, self.slot_bytes)
+            self.device.queue.submit([enc.finish()])
+
+        self.head = (self.head + 1) % self.slots
+        self.count = min(self.count + 1, self.slots)
+
+    # NAVIGATION
+    def scrub(self, delta: int) -> bool:
+        """
+        Se déplace de `delta` snapshots (négatif = passé) et restaure l'état.
+        Retourne False s'il n'y a rien à restaurer (ou vers l'avant en live).
+        """
+        if self.count == 0:
+            return False
+
+        if self.cursor is None:
+            # live : rien dans le futur ; un pas en arrière = le plus récent (âge 0)
+            if delta >= 0:
+                return False
+            age = -delta - 1
+        else:
+            age = self.cursor - delta
+        age = max(0, min(age, self.count - 1))
+        self.cursor = age
+
+        off = self._slot(age) * self.slot_bytes
+        with self.sim.lock:
+            enc = self.device.create_command_encoder()
+            enc.copy_buffer_to_buffer(self.pos_slots, off, self.sim.current_pos_buffer, 0, self.slot_bytes)
+            enc.copy_buffer_to_buffer(self.vel_slots, off, self.sim.current_vel_buffer, 0, self.slot_bytes)
+            self.device.queue.submit([enc.finish()])
+            self.sim.version += 1
+        return True
+
+    @property
+    def seconds_back(self) -> float:
+        """Distance (en secondes simulées) du snapshot affiché."""
+        if self.cursor is None:
+            return 0.0
+        return (self.frame % self.interval + self.cursor * self.interval) * self.sim.DT
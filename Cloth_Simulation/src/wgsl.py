@@ -0,0 +1,98 @@
+import os
+import re
+
+"""
+Préprocesseur WGSL minimal (avant create_shader_module).
+
+Directives (une par ligne, en début de ligne) :
+- #include "fichier.wgsl"   chemin relatif au fichier courant, puis à shaders/ ;
+                            chaque fichier n'est inclus qu'une seule fois
+- #define NOM valeur        substitution textuelle (mot entier) dans la suite
+- #ifdef NOM / #ifndef NOM / #else / #endif
+
+Les `defines` passés à preprocess() sont prioritaires sur les #define des
+fichiers (permet de changer une constante de compilation par variante).
+Les paramètres connus seulement à la création du pipeline (taille de
+workgroup, W, H) passent par des constantes `override`, pas par ici.
+"""
+
+_DIRECTIVE = re.compile(r"^\s*#(include|define|ifdef|ifndef|else|endif)\b\s*(.*?)\s*$")
+_WORD = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*\b")
+
+
+class WgslError(ValueError):
+    pass
+
+
+def preprocess(name: str, root: str, defines=None, read=None) -> str:
+    """
+    Code WGSL de root/name avec includes et defines résolus.
+    - read(chemin) -> texte (par défaut : lecture du fichier)
+    """
+    if read is None:
+        read = _read_file
+
+    macros = {k: str(v) for k, v in (defines or {}).items()}
+    fixed = set(macros)  # définis par l'appelant : non redéfinissables
+    included = set()
+    out = []
+
+    def expand(line):
+        if not macros:
+            return line
+        return _WORD.sub(lambda m: macros.get(m.group(0), m.group(0)), line)
+
+    def process(path):
+        path = os.path.normpath(path)
+        if path in included:
+            return
+        included.add(path)
+
+        stack = []  # (branche active, une branche déjà prise)
+        for lineno, line in enumerate(read(path).splitlines(), 1):
+            m = _DIRECTIVE.match(line)
+            active = all(a for a, _ in stack)
+
+            if m is None:
+                if active:
+                    out.append(expand(line))
+                continue
+
+            kind, arg = m.groups()
+            where = f"{os.path.relpath(path, root)}:{lineno}"
+
+            if kind in ("ifdef", "ifndef"):
+                cond = (arg in macros) == (kind == "ifdef")
+                stack.append((cond, cond))
+            elif kind == "else":
+                if not stack:
+                    raise WgslError(f"{where} : #else sans #ifdef")
+                _, taken = stack.pop()
+                stack.append((not taken, True))
+            elif kind == "endif":
+                if not stack:
+                    raise WgslError(f"{where} : #endif sans #ifdef")
+                stack.pop()
+            elif not active:
+                continue
+            elif kind == "define":
+                parts = arg.split(None, 1)
+                if not parts:
+                    raise WgslError(f"{where} : #define sans nom")
+                if parts[0] not in fixed:
+                    macros[parts[0]] = expand(parts[1]) if len(parts) > 1 else ""
+            else:  # include
+                target = arg.strip('"')
+                local = os.path.join(os.path.dirname(path), target)
+                process(local if os.path.exists(local) else os.path.join(root, target))
+
+        if stack:
+            raise WgslError(f"{os.path.relpath(path, root)} : #ifdef non fermé")
+
+    process(os.path.join(root, name))
+    return "\n".join(out) + "\n"
+
+
+def _read_file(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
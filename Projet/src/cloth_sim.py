@@ -2,6 +2,7 @@ import numpy as np
 import wgpu
 import struct
 from .gpu_utils import create_uniform_buffer
+from .pipeline_cache import get_pipeline_cache
 
 class ClothSimulation:
     """Gère la simulation physique du tissu sur GPU (compute shaders)."""
@@ -102,10 +103,10 @@ class ClothSimulation:
         
     def _create_compute_pipelines(self):
         """Crée tous les compute pipelines (1 par step physique)."""
-        from .gpu_utils import read_text
+        cache = get_pipeline_cache(self.device)
         
         # Layout commun (tous les shaders ont la même structure de bind group)
-        self.bind_group_layout = self.device.create_bind_group_layout(entries=[
+        self.bind_group_layout = cache.bind_group_layout([
             {"binding": 0, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},  # pos_in
             {"binding": 1, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "read-only-storage"}},  # vel_in
             {"binding": 2, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "storage"}},            # pos_out
@@ -113,26 +114,23 @@ class ClothSimulation:
             {"binding": 4, "visibility": wgpu.ShaderStage.COMPUTE, "buffer": {"type": "uniform"}},            # params
         ])
         
-        pipeline_layout = self.device.create_pipeline_layout(bind_group_layouts=[self.bind_group_layout])
+        pipeline_layout = cache.pipeline_layout([self.bind_group_layout])
         
         # Liste des shaders à charger (dans l'ordre d'exécution)
         shader_files = [
-            "shaders/step1_gravity.wgsl",
-            "shaders/step2_structural.wgsl",
-            "shaders/step3_collision_sphere.wgsl",
-            "shaders/step4_collision_friction.wgsl",
-            "shaders/step0_integrate.wgsl",
+            "step1_gravity.wgsl",
+            "step2_structural.wgsl",
+            "step3_collision_sphere.wgsl",
+            "step4_collision_friction.wgsl",
+            "step0_integrate.wgsl",
         ]
         
-        self.pipelines = []
-        for shader_path in shader_files:
-            shader_code = read_text(shader_path)
-            shader_module = self.device.create_shader_module(code=shader_code)
-            pipeline = self.device.create_compute_pipeline(
-                layout=pipeline_layout,
-                compute={"module": shader_module, "entry_point": "main"},
-            )
-            self.pipelines.append(pipeline)
+        # Création asynchrone (en parallèle), puis attente de tous les pipelines
+        keys = [
+            cache.compute_pipeline_async(pipeline_layout, cache.shader_module_file(name))
+            for name in shader_files
+        ]
+        self.pipelines = [cache.resolve(key) for key in keys]
             
     def _create_bind_group(self, pos_in, vel_in, pos_out, vel_out):
         """Crée un bind group avec les buffers actuels."""
@@ -0,0 +1,101 @@
+import hashlib
+import os
+import threading
+
+"""
+Cache (par device) des objets GPU immuables utilisés par ClothSimulation :
+- shader modules, clé = hash du source WGSL
+- bind group layouts / pipeline layouts, clé = descripteur
+- compute pipelines, clé = descripteur (objets GPU par identité)
+
+Sous-ensemble de Cloth_Simulation/src/pipeline_cache.py : les deux projets
+restent autonomes (chacun son paquet `src`), Projet n'a ni préprocesseur
+WGSL, ni render pipelines, ni compilation sur pool de threads.
+Les shaders sont lus par chemin absolu ; compute_pipeline_async() lance la
+création et retourne une clé, resolve(clé) attend le résultat.
+"""
+
+SHADER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shaders")
+
+_lock = threading.Lock()
+
+
+def get_pipeline_cache(device) -> "PipelineCache":
+    """
+    Cache associé à `device` (créé au premier appel). Rangé sur le device
+    lui-même : les objets en cache référencent le device, le cycle est libéré
+    avec lui (un registre global le garderait vivant).
+    """
+    with _lock:
+        cache = getattr(device, "_pipeline_cache", None)
+        if cache is None:
+            cache = PipelineCache(device)
+            device._pipeline_cache = cache
+        return cache
+
+
+def _freeze(obj):
+    """Descripteur -> clé hashable (dict triés, listes -> tuples, objets GPU par identité)."""
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    return ("gpu", id(obj))
+
+
+class PipelineCache:
+    def __init__(self, device):
+        self.device = device
+
+        self._modules = {}      # hash du code -> shader module
+        self._bgls = {}
+        self._layouts = {}
+        self._pipelines = {}
+        self._pending = {}      # clé -> promesse (création asynchrone en cours)
+
+    # SHADERS
+    def shader_module_file(self, name: str):
+        """Shader module de shaders/<name>."""
+        with open(os.path.join(SHADER_DIR, name), "r", encoding="utf-8") as f:
+            code = f.read()
+        key = hashlib.sha1(code.encode("utf-8")).hexdigest()
+        module = self._modules.get(key)
+        if module is None:
+            module = self.device.create_shader_module(code=code)
+            self._modules[key] = module
+        return module
+
+    # LAYOUTS
+    def bind_group_layout(self, entries):
+        key = _freeze(entries)
+        bgl = self._bgls.get(key)
+        if bgl is None:
+            bgl = self.device.create_bind_group_layout(entries=entries)
+            self._bgls[key] = bgl
+        return bgl
+
+    def pipeline_layout(self, bind_group_layouts):
+        key = _freeze(list(bind_group_layouts))
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self.device.create_pipeline_layout(bind_group_layouts=list(bind_group_layouts))
+            self._layouts[key] = layout
+        return layout
+
+    # PIPELINES
+    def compute_pipeline_async(self, layout, module, entry_point: str = "main"):
+        """Lance la création (si absente du cache) et retourne sa clé."""
+        stage = {"module": module, "entry_point": entry_point}
+        key = ("compute", _freeze(layout), _freeze(stage))
+        if key not in self._pipelines and key not in self._pending:
+            self._pending[key] = self.device.create_compute_pipeline_async(layout=layout, compute=stage)
+        return key
+
+    def resolve(self, key):
+        """Pipeline associé à la clé (attend la fin de la création si besoin)."""
+        promise = self._pending.pop(key, None)
+        if promise is not None:
+            self._pipelines[key] = promise.sync_wait()
+        return self._pipelines[key]